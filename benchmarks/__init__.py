@@ -0,0 +1,4 @@
+"""
+Benchmarks
+Reproducible turn-latency measurements (run with python -m benchmarks.run)
+"""
@@ -0,0 +1,188 @@
+"""
+Fake Ollama server
+Speaks enough of the Ollama HTTP API (/api/chat) for the assistant, with
+a configurable time to first token and token rate, so LLM timing is
+reproducible without a GPU or a model
+
+    python -m benchmarks.fake_ollama --port 11435 --tokens-per-second 30
+    OLLAMA_HOST=http://127.0.0.1:11435 python main.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Replies in the style of prompts/teacher.txt; the same message always gets the same reply
+REPLIES = (
+    "Quase! O certo é 'I went to the beach yesterday'. Tenta de novo!",
+    "Perfeito! Como se fala 'eu gosto de viajar'?",
+    "Muito bem! Agora tenta uma frase mais longa sobre o seu trabalho.",
+    "Quase! Falta 'to': 'I go to school every day'. Repete!",
+)
+SUMMARY = {"topics": ["daily life"], "mistakes": ["go school -> go to school"], "strengths": ["greetings"]}
+
+
+def tokenize(text):
+    """Split text into word-sized tokens, keeping the spaces"""
+    return re.findall(r"\S+\s*", text)
+
+
+class FakeOllama:
+    """
+    Threaded HTTP server answering like Ollama
+
+    Streaming chats wait `first_token_delay` seconds (prompt evaluation),
+    then send one token every 1 / tokens_per_second seconds.
+    """
+    def __init__(self, host="127.0.0.1", port=0, tokens_per_second=30.0, first_token_delay=0.25,
+                 replies=REPLIES):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port (0 = any free port)
+            tokens_per_second: Generation speed
+            first_token_delay: Seconds before the first token
+            replies: Teacher replies, picked by a hash of the student's message
+        """
+        self.tokens_per_second = tokens_per_second
+        self.first_token_delay = first_token_delay
+        self.replies = replies
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def do_GET(self):
+                if self.path == "/api/version":
+                    self._json({"version": "0.0.0-fake"})
+                elif self.path == "/api/tags":
+                    self._json({"models": []})
+                else:
+                    self._send(200, b"Ollama is running", "text/plain")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/api/chat":
+                    fake.chat(self, request)
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, data):
+                self._send(200, json.dumps(data).encode(), "application/json")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.host, self.port = self.server.server_address[:2]
+        self.url = f"http://{self.host}:{self.port}"
+        self._thread = None
+
+    def _message(self, request, content, done, **extra):
+        return {
+            "model": request.get("model", "fake"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+            **extra
+        }
+
+    def _final(self, request, eval_count, started):
+        prompt_tokens = sum(len(tokenize(m.get("content", ""))) for m in request.get("messages", []))
+        return {
+            "done_reason": "stop",
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(self.first_token_delay * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(eval_count / self.tokens_per_second * 1e9),
+        }
+
+    def chat(self, handler, request):
+        """Answer one /api/chat request"""
+        started = time.perf_counter()
+        with self._lock:
+            self.requests += 1
+        messages = request.get("messages") or [{}]
+        reply = self.replies[zlib.crc32(messages[-1].get("content", "").encode()) % len(self.replies)]
+
+        options = request.get("options") or {}
+        if request.get("format") == "json":
+            reply = json.dumps(SUMMARY)
+        tokens = tokenize(reply)[:options.get("num_predict") or None]
+
+        if not request.get("stream", True):
+            time.sleep(self.first_token_delay + len(tokens) / self.tokens_per_second)
+            body = self._message(request, "".join(tokens), True, **self._final(request, len(tokens), started))
+            handler._json(body)
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def send(data):
+            line = (json.dumps(data) + "\n").encode()
+            handler.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            handler.wfile.flush()
+
+        try:
+            time.sleep(self.first_token_delay)
+            for token in tokens:
+                send(self._message(request, token, False))
+                time.sleep(1 / self.tokens_per_second)
+            send(self._message(request, "", True, **self._final(request, len(tokens), started)))
+            handler.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client closed the stream early (e.g. barge-in)
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--tokens-per-second", type=float, default=30.0)
+    parser.add_argument("--first-token-delay", type=float, default=0.25)
+    args = parser.parse_args()
+
+    fake = FakeOllama(args.host, args.port, args.tokens_per_second, args.first_token_delay)
+    print(f"🤖 Fake Ollama on {fake.url} ({args.tokens_per_second:g} tokens/s, "
+          f"first token after {args.first_token_delay:g}s)")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
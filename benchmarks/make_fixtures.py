@@ -0,0 +1,107 @@
+"""
+Benchmark fixtures
+Short, medium and long answers in English, Portuguese and mixed, as
+16 kHz mono WAV files plus a manifest (benchmarks/fixtures/manifest.json)
+
+The answers are synthesized with one of the assistant's TTS engines, so
+the set can be rebuilt on any machine. Real recordings can be added by
+dropping the WAV next to them and listing it in the manifest.
+
+    python -m benchmarks.make_fixtures --engine google
+"""
+
+import argparse
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from modules.audio_io import resample
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_RATE = 16000
+
+ANSWERS = {
+    "short_en": ("en", "I like coffee."),
+    "medium_en": ("en", "Yesterday I went to the beach with my friends and we played volleyball."),
+    "long_en": ("en", "Last year I changed jobs. Now I work as a software developer in a small company, "
+                      "and every morning I take the bus to the office. I like my team, but the meetings "
+                      "are too long and sometimes I don't understand everything they say."),
+    "short_pt": ("pt", "Eu não sei."),
+    "medium_pt": ("pt", "Como se fala que eu trabalho em casa três dias por semana?"),
+    "long_pt": ("pt", "Hoje eu acordei cedo, tomei café e fui trabalhar. Depois do almoço tive uma reunião "
+                      "muito longa e no final do dia eu estava muito cansado, então fui para casa descansar."),
+    "short_mixed": ("mixed", "Como se fala 'I am tired'?"),
+    "medium_mixed": ("mixed", "Eu quero dizer 'I went to the supermarket' mas não sei se está certo."),
+    "long_mixed": ("mixed", "Professora, ontem eu tentei falar 'I have been working here for two years' "
+                            "com meu chefe, mas acho que errei. É 'I have been working' ou 'I am working'?"),
+}
+
+
+def to_samples(clip, sample_rate=None):
+    """
+    Convert TTS synthesize() output to float32 mono samples
+
+    Returns:
+        (samples, samplerate)
+    """
+    if isinstance(clip, bytes):
+        return np.frombuffer(clip, dtype=np.int16).astype(np.float32) / 32768.0, sample_rate
+    if isinstance(clip, tuple):
+        samples, samplerate = clip
+        return np.asarray(samples, dtype=np.float32).reshape(len(samples), -1).mean(axis=1), samplerate
+
+    # Google TTS: list of decoded segments (or MP3 bytes)
+    parts = []
+    samplerate = None
+    for segment in clip:
+        if isinstance(segment, bytes):
+            segment = sf.read(io.BytesIO(segment), dtype='float32')
+        samples, samplerate = to_samples(segment)
+        parts.append(resample(samples, samplerate, SAMPLE_RATE))
+    return np.concatenate(parts), SAMPLE_RATE
+
+
+def create_engine(name):
+    from modules.tts import GoogleTTS, SimpleTTS, TextToSpeech
+    if name == "google":
+        return GoogleTTS(workers=3)
+    if name == "piper":
+        return TextToSpeech()
+    return SimpleTTS()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the benchmark fixtures")
+    parser.add_argument("--engine", choices=("google", "piper", "espeak"), default="google")
+    args = parser.parse_args()
+
+    engine = create_engine(args.engine)
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for name, (lang, text) in ANSWERS.items():
+        clip = engine.synthesize(text)
+        if clip is None or isinstance(clip, str):
+            raise SystemExit(f"❌ {args.engine} could not synthesize audio")
+        samples, samplerate = to_samples(clip, getattr(engine, "sample_rate", None))
+        samples = resample(samples, samplerate, SAMPLE_RATE)
+
+        # Lead-in and trailing silence like a real answer
+        audio = np.concatenate((np.zeros(int(0.3 * SAMPLE_RATE), np.float32), samples,
+                                np.zeros(int(0.5 * SAMPLE_RATE), np.float32)))
+        path = FIXTURES_DIR / f"{name}.wav"
+        sf.write(path, audio, SAMPLE_RATE, subtype="PCM_16")
+        manifest.append({"name": name, "file": path.name, "lang": lang, "length": name.split("_")[0],
+                         "text": text, "seconds": round(len(audio) / SAMPLE_RATE, 2),
+                         "source": args.engine})
+        print(f"✅ {path.name} ({len(audio) / SAMPLE_RATE:.1f}s)")
+
+    with open(FIXTURES_DIR / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Turn latency benchmark
+Replays the fixtures through STT -> LLM -> TTS and reports p50/p95 per stage
+
+Fixtures and the baseline depend on the machine, so they are not in the
+repository. Build them once per machine:
+
+    python -m benchmarks.make_fixtures          # answers synthesized with gTTS (needs internet)
+    python -m benchmarks.make_fixtures --engine piper   # or offline
+    python -m benchmarks.run --update-baseline  # measure and store the reference numbers
+
+Then, after a change:
+
+    python -m benchmarks.run                    # fake Ollama, configured TTS engine
+    python -m benchmarks.run --tts null --runs 10
+    python -m benchmarks.run --ollama http://127.0.0.1:11434   # real Ollama
+
+Stages (seconds):
+    transcript      end of speech -> transcript
+    first_token     transcript -> first LLM token
+    first_audio     first token -> first sentence synthesized and handed to the sink
+    response        end of speech -> first audio (what the student waits)
+    turn            end of speech -> last sentence handed to the sink
+
+Exits with status 1 when a stage is slower than the baseline by more than
+the tolerance, or when there is no baseline to compare with.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from .fake_ollama import FakeOllama
+
+
+console = Console()
+BENCH_DIR = Path(__file__).parent
+STAGES = ("transcript", "first_token", "first_audio", "response", "turn")
+
+
+def load_fixtures(fixtures_dir):
+    """
+    Read the fixture manifest and audio
+
+    Returns:
+        List of (manifest entry, float32 16 kHz samples)
+    """
+    manifest_path = Path(fixtures_dir) / "manifest.json"
+    if not manifest_path.exists():
+        raise SystemExit(f"❌ No fixtures in {fixtures_dir} - build them with: python -m benchmarks.make_fixtures")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    fixtures = []
+    for entry in manifest:
+        audio, sample_rate = sf.read(Path(fixtures_dir) / entry["file"], dtype="float32")
+        if sample_rate != 16000:
+            raise SystemExit(f"❌ {entry['file']} must be 16 kHz (is {sample_rate})")
+        fixtures.append((entry, audio.reshape(len(audio), -1).mean(axis=1)))
+    return fixtures
+
+
+def run_turn(stt, teacher, tts, sink, audio):
+    """
+    One measured turn
+
+    Args:
+        tts: TTS engine playing into sink, or None to skip synthesis
+        sink: CaptureSink (records when each clip reaches the "speaker")
+
+    Returns:
+        Dict of stage -> seconds
+    """
+    from modules.llm import iter_sentences
+
+    sink.captured.clear()
+    first_token = None
+
+    def timed_tokens(tokens):
+        nonlocal first_token
+        try:
+            for token in tokens:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                yield token
+        finally:
+            tokens.close()
+
+    end_of_speech = time.perf_counter()
+    text = stt.transcribe(audio)
+    transcribed = time.perf_counter()
+
+    for sentence in iter_sentences(timed_tokens(teacher.chat_stream(text or "..."))):
+        if tts is None:
+            sink.play(np.zeros(160, dtype=np.float32), 16000)  # Nothing synthesized: 10 ms of silence marks the time
+        else:
+            tts.play(tts.synthesize(sentence))
+    finished = time.perf_counter()
+
+    first_audio = sink.captured[0][0] if sink.captured else finished
+    first_token = first_token or finished
+    return {
+        "transcript": transcribed - end_of_speech,
+        "first_token": first_token - transcribed,
+        "first_audio": first_audio - first_token,
+        "response": first_audio - end_of_speech,
+        "turn": finished - end_of_speech,
+    }
+
+
+def summarize(samples):
+    """p50/p95/mean per stage"""
+    return {
+        stage: {
+            "p50": round(float(np.percentile(values, 50)), 4),
+            "p95": round(float(np.percentile(values, 95)), 4),
+            "mean": round(float(np.mean(values)), 4),
+        }
+        for stage, values in samples.items()
+    }
+
+
+def compare(current, baseline, tolerance, slack):
+    """
+    Stages slower than the baseline
+
+    Returns:
+        List of (stage, statistic, baseline, current)
+    """
+    regressions = []
+    for stage, stats in current.items():
+        for statistic in ("p50", "p95"):
+            reference = baseline.get(stage, {}).get(statistic)
+            if reference is not None and stats[statistic] > reference * (1 + tolerance) + slack:
+                regressions.append((stage, statistic, reference, stats[statistic]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end turn latency benchmark")
+    parser.add_argument("--config", default="config/settings.yaml")
+    parser.add_argument("--fixtures", default=str(BENCH_DIR / "fixtures"))
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs per fixture")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs first")
+    parser.add_argument("--model", help="Whisper model (default: stt.model from the config)")
+    parser.add_argument("--tts", choices=("config", "null"), default="config",
+                        help="config = the engine main.py would pick, null = no synthesis")
+    parser.add_argument("--ollama", help="Use this Ollama server instead of the fake one")
+    parser.add_argument("--tokens-per-second", type=float, default=30.0, help="Fake Ollama speed")
+    parser.add_argument("--first-token-delay", type=float, default=0.25, help="Fake Ollama prompt time")
+    parser.add_argument("--baseline", default=str(BENCH_DIR / "baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these numbers as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--slack", type=float, default=0.02, help="Allowed absolute slowdown in seconds")
+    parser.add_argument("--output", default=str(BENCH_DIR / "results" / "latest.json"))
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+
+    fake = None
+    if args.ollama:
+        os.environ["OLLAMA_HOST"] = args.ollama
+    else:
+        fake = FakeOllama(tokens_per_second=args.tokens_per_second,
+                          first_token_delay=args.first_token_delay).start()
+        os.environ["OLLAMA_HOST"] = fake.url  # Read by ollama at import
+
+    # Imported after OLLAMA_HOST is set
+    from modules.audio_io import CaptureSink
+    from modules.llm import EnglishTeacher
+    from modules.stt import SpeechToText
+    from modules.tts import create_tts
+
+    fixtures = load_fixtures(args.fixtures)
+    stt_config = config['stt']
+    llm_config = config['llm']
+    model_size = args.model or stt_config['model']
+
+    console.print("[yellow]Loading models...[/yellow]")
+    with contextlib.redirect_stdout(io.StringIO()):
+        stt = SpeechToText(model_size=model_size, device=stt_config['device'], language=stt_config['language'])
+        stt.warmup()
+        teacher = EnglishTeacher(model=llm_config['model'], temperature=llm_config['temperature'],
+                                 context_turns=llm_config.get('context_turns', 6),
+                                 context_tokens=llm_config.get('context_tokens', 1500),
+                                 keep_alive=llm_config.get('keep_alive'))
+        teacher.warmup()
+        # Synthesis is real, playback is skipped
+        sink = CaptureSink()
+        tts = None if args.tts == "null" else create_tts(config['tts'], sink=sink)
+
+    settings = {
+        "whisper": model_size,
+        "tts": args.tts if args.tts == "null" else type(tts).__name__,
+        "ollama": "real" if args.ollama else f"fake {args.tokens_per_second:g} tok/s, "
+                                             f"{args.first_token_delay:g}s first token",
+        "machine": f"{platform.node()} ({os.cpu_count()} cores)",
+    }
+    console.print(f"[cyan]⏱️  {len(fixtures)} fixtures × {args.runs} runs[/cyan] [dim]{settings}[/dim]")
+
+    samples = {stage: [] for stage in STAGES}
+    by_length = {}
+    for run in range(args.warmup + args.runs):
+        for entry, audio in fixtures:
+            # Same prompt size every run
+            with contextlib.redirect_stdout(io.StringIO()):
+                teacher.reset_conversation()
+                result = run_turn(stt, teacher, tts, sink, audio)
+            if run < args.warmup:
+                continue
+            for stage, seconds in result.items():
+                samples[stage].append(seconds)
+                by_length.setdefault(entry.get("length", entry["name"]), {}).setdefault(stage, []).append(seconds)
+
+    teacher.close()
+    if fake:
+        fake.stop()
+
+    results = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "settings": settings,
+        "runs": args.runs,
+        "stages": summarize(samples),
+        "by_length": {length: summarize(values) for length, values in by_length.items()},
+    }
+
+    table = Table(title="📊 Turn latency (seconds)")
+    table.add_column("Stage")
+    for column in ("p50", "p95", "mean"):
+        table.add_column(column, justify="right")
+    for length, stats in [("all", results["stages"])] + sorted(results["by_length"].items()):
+        for stage in STAGES:
+            label = stage if length == "all" else f"[dim]{length}[/dim] {stage}"
+            table.add_row(label, *(f"{stats[stage][column]:.3f}" for column in ("p50", "p95", "mean")))
+        table.add_section()
+    console.print(table)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"[green]💾 Baseline saved to {baseline_path}[/green]")
+        return
+
+    if not baseline_path.exists():
+        # A gate that passes without a reference would never catch anything
+        console.print(f"[bold red]❌ No baseline at {baseline_path} - measure one with --update-baseline[/bold red]")
+        sys.exit(1)
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        console.print(f"[yellow]⚠️  Baseline was measured with different settings: {baseline.get('settings')}[/yellow]")
+
+    regressions = compare(results["stages"], baseline["stages"], args.tolerance, args.slack)
+    if regressions:
+        for stage, statistic, reference, current in regressions:
+            console.print(f"[bold red]❌ REGRESSION {stage} {statistic}: {reference:.3f}s → {current:.3f}s "
+                          f"(+{(current / reference - 1) * 100 if reference else float('inf'):.0f}%)[/bold red]")
+        sys.exit(1)
+    console.print(f"[green]✅ Within {args.tolerance:.0%} of the baseline ({baseline['date']})[/green]")
+
+
+if __name__ == "__main__":
+    main()
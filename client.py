@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+English Training Client
+Talks to server.py: streams the microphone in, plays the teacher back
+
+    python client.py ws://lab-server:8765
+"""
+
+import asyncio
+import io
+import json
+import sys
+
+import numpy as np
+import soundfile as sf
+import sounddevice as sd
+from rich.console import Console
+from websockets.asyncio.client import connect
+
+
+console = Console()
+SAMPLE_RATE = 16000
+
+
+async def play(header, payload):
+    """Play one audio message from the server (in a thread, so receiving continues)"""
+    if header["format"] == "mp3":
+        samples, sample_rate = sf.read(io.BytesIO(payload), dtype='float32')
+    else:
+        samples = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+        sample_rate = header["sample_rate"]
+
+    def blocking_play():
+        sd.play(samples, sample_rate)
+        sd.wait()
+
+    await asyncio.to_thread(blocking_play)
+
+
+async def receive(websocket):
+    """Show and play what the server sends"""
+    header = None
+    async for message in websocket:
+        if isinstance(message, bytes):
+            if header is not None:
+                await play(header, message)
+            header = None
+            continue
+
+        event = json.loads(message)
+        kind = event["type"]
+        if kind == "audio":
+            header = event
+        elif kind == "transcript":
+            console.print(f"[green]👤 You:[/green] {event['text']}")
+            console.print("[blue]🤖 Teacher:[/blue] ", end="")
+        elif kind == "sentence":
+            console.print(event["text"], end=" ")
+        elif kind == "turn":
+            console.print("\n\n[dim]Press Enter to talk[/dim]")
+        elif kind == "error":
+            console.print(f"[red]⚠️  {event['message']}[/red]")
+
+
+async def talk(websocket):
+    """Press Enter to start and stop each answer; the microphone streams meanwhile"""
+    loop = asyncio.get_running_loop()
+    blocks = asyncio.Queue()
+    recording = False
+
+    def callback(indata, frames, time, status):
+        if recording:
+            pcm = (np.clip(indata[:, 0], -1.0, 1.0) * 32767).astype("<i2").tobytes()
+            loop.call_soon_threadsafe(blocks.put_nowait, pcm)
+
+    async def send_blocks():
+        while True:
+            await websocket.send(await blocks.get())
+
+    sender = asyncio.create_task(send_blocks())  # Keep a reference while talking
+    with sd.InputStream(callback=callback, channels=1, samplerate=SAMPLE_RATE,
+                        dtype='float32', blocksize=320):
+        console.print("[dim]Press Enter to talk[/dim]")
+        while True:
+            await asyncio.to_thread(input)
+            recording = True
+            console.print("[red]🎤 Recording... press Enter to stop[/red]")
+            await asyncio.to_thread(input)
+            recording = False
+            while not blocks.empty():
+                await asyncio.sleep(0.01)
+            await websocket.send(json.dumps({"type": "end"}))
+
+
+async def main(url):
+    async with connect(url, max_size=2 ** 22) as websocket:
+        await websocket.send(json.dumps({"type": "hello", "mode": "manual"}))
+        await asyncio.gather(receive(websocket), talk(websocket))
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "ws://127.0.0.1:8765"))
+    except KeyboardInterrupt:
+        console.print("\n[cyan]Bye! 👋[/cyan]")
@@ -4,85 +4,213 @@ English Training Voice Assistant
 Main application - Talk with AI to practice English
 """
 
+import argparse
 import yaml
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
-from rich.prompt import Prompt
-from datetime import datetime
-import json
+from rich.prompt import Confirm, Prompt
+from rich.table import Table
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
 
 from modules.stt import SpeechToText
-from modules.llm import EnglishTeacher
-from modules.tts import TextToSpeech, SimpleTTS, GoogleTTS
+from modules.audio_io import CaptureSink, FileSource, NullSink, SpeakerSink, TeeSink
+from modules.audio_archive import AudioArchive
+from modules.batch import AUDIO_EXTENSIONS, collect_files
+from modules.llm import EnglishTeacher, iter_sentences
+from modules.tts import create_tts, speak_stream
+from modules.tts_cache import AudioCache
+from modules.response_cache import ResponseCache
+from modules.pipeline import TurnPipeline
+from modules.bargein import BargeInMonitor
+from modules.journal import JournalLock, SessionJournal, compact_journal, find_interrupted, read_journal
+from modules.session_index import SessionIndex
+from modules.tracing import summarize, tracer
 
 
 console = Console()
 
 
 class EnglishAssistant:
-    def __init__(self, config_path="config/settings.yaml"):
-        """Initialize the English training assistant"""
+    def __init__(self, config_path="config/settings.yaml", source=None, sink=None):
+        """
+        Initialize the English training assistant
+
+        Args:
+            config_path: Settings file
+            source: Audio source instead of the microphone (e.g. a FileSource
+                for a scripted session, which then runs without any key presses)
+            sink: Audio sink instead of the speakers (e.g. a NullSink)
+        """
 
         # Load configuration
         with open(config_path) as f:
             self.config = yaml.safe_load(f)
 
-        # Initialize modules
+        self.source = source
+        self.sink = sink
+        self.scripted = source is not None
+
+        # Archiving audio: the teacher's clips are collected on their way to the speakers
+        history_config = self.config['history']
+        self.save_audio = history_config['save_conversations'] and history_config.get('save_audio', False)
+        self._teacher_clips = []
+        if self.save_audio:
+            self.sink = TeeSink(sink or SpeakerSink(), self.keep_teacher_audio)
+
+        tracing_config = self.config.get('tracing', {})
+        tracer.enabled = tracing_config.get('enabled', False)
+        self.latency_footer = tracer.enabled and tracing_config.get('footer', True)
+
+        # Initialize modules (independent, so they load in parallel)
         console.print("[yellow]Loading AI modules...[/yellow]")
+        startup_begin = time.perf_counter()
+        self.startup_times = {}
+        self._startup_lock = threading.Lock()  # The Whisper warmup thread adds its time later
+
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup") as pool:
+            futures = {
+                "Speech-to-Text": pool.submit(self._timed, self._init_stt),
+                "LLM teacher": pool.submit(self._timed, self._init_teacher),
+                "Text-to-Speech": pool.submit(self._timed, self._init_tts),
+            }
+            for name, future in futures.items():
+                self.startup_times[name] = future.result()
+
+        self.startup_times["Total"] = time.perf_counter() - startup_begin
+
+        # Warm Whisper's kernels while the greeting plays
+        self.stt_warmup = threading.Thread(target=self._warmup_stt, daemon=True)
+        self.stt_warmup.start()
+
+        self.show_startup_times()
+
+        # Session data
+        self.journal = self.open_journal()
+        self.audio_archive = self.open_audio_archive()
+        self._barge_in = {}  # Where the student's interruption is: start= (shared buffer) or preroll= (audio)
 
-        # Speech-to-Text
+        console.print("[green]✅ All systems ready![/green]\n")
+
+    def _timed(self, func):
+        """Run func and return how long it took in seconds"""
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def _init_stt(self):
+        """Speech-to-Text"""
         stt_config = self.config['stt']
+        audio_config = self.config['audio']
         self.stt = SpeechToText(
             model_size=stt_config['model'],
             device=stt_config['device'],
-            language=stt_config['language']
+            language=stt_config['language'],
+            debug_dump_dir=stt_config.get('debug_dump_dir'),
+            vad_config=self.vad_config(),
+            blocksize=audio_config.get('blocksize', 1024),
+            latency=audio_config.get('latency'),
+            preroll=audio_config.get('preroll', 0.3),
+            source=self.source
         )
 
-        # LLM Teacher
+        if audio_config.get('persistent_stream', False):
+            # One microphone stream for the whole session (no device open per turn)
+            try:
+                latency = self.stt.open_stream(
+                    buffer_seconds=2 * audio_config['max_recording_time'] + 10
+                )
+                console.print(f"[dim]🎙️  Microphone open in {latency['open'] * 1000:.0f} ms, "
+                              f"input latency {latency['input'] * 1000:.0f} ms[/dim]")
+            except Exception as e:
+                console.print(f"[dim]Persistent microphone stream not available: {e}[/dim]")
+
+        if self.recording_mode() == 'auto':
+            # Measure background noise so endpointing adapts to the room
+            try:
+                floor = self.stt.calibrate()
+                console.print(f"[dim]🎚️  Noise floor: {floor:.0f} dB[/dim]")
+            except Exception as e:
+                console.print(f"[dim]Noise calibration skipped: {e}[/dim]")
+
+    def recording_mode(self):
+        """auto or manual (scripted sessions always endpoint automatically)"""
+        if self.scripted:
+            return 'auto'
+        return self.config['audio'].get('recording_mode', 'auto')
+
+    def vad_config(self):
+        """Endpointing settings from the audio section of the config"""
+        audio_config = self.config['audio']
+        vad_config = {
+            'silence_threshold': audio_config.get('silence_threshold', 0.003),
+            'hangover': audio_config.get('max_silence_duration', 0.8),
+        }
+        vad_config.update(audio_config.get('endpoint', {}))
+        return vad_config
+
+    def _warmup_stt(self):
+        """Whisper dummy inference in the background"""
+        seconds = self._timed(self.stt.warmup)
+        with self._startup_lock:
+            self.startup_times["Whisper warmup"] = seconds
+
+    def _init_teacher(self):
+        """LLM Teacher"""
         llm_config = self.config['llm']
+
+        # Replies to repeated utterances (opt-in)
+        cache_config = llm_config.get('response_cache', {})
+        self.response_cache = None
+        if cache_config.get('enabled', False):
+            self.response_cache = ResponseCache(
+                max_items=cache_config.get('max_items', 256),
+                ttl=cache_config.get('ttl', 3600),
+                similarity=cache_config.get('similarity', 0.92),
+                embed_model=cache_config.get('embed_model'),
+                embed_timeout=cache_config.get('embed_timeout', 0.15)
+            )
+
         self.teacher = EnglishTeacher(
             model=llm_config['model'],
-            temperature=llm_config['temperature']
+            temperature=llm_config['temperature'],
+            context_turns=llm_config.get('context_turns', 6),
+            context_tokens=llm_config.get('context_tokens', 1500),
+            keep_alive=llm_config.get('keep_alive'),
+            response_cache=self.response_cache
         )
+        if llm_config.get('warmup', True):
+            self.teacher.warmup()
 
-        # Text-to-Speech (Priority: GoogleTTS > Piper > SimpleTTS)
+    def _init_tts(self):
+        """Text-to-Speech (Priority: GoogleTTS > Piper > SimpleTTS), later engines only probed if needed"""
         tts_config = self.config['tts']
-        tts_initialized = False
-
-        # Try GoogleTTS first (best quality)
-        try:
-            self.tts = GoogleTTS(lang='en', slow=False)
-            if self.tts.enabled:
-                tts_initialized = True
-        except Exception as e:
-            console.print(f"[dim]GoogleTTS not available: {e}[/dim]")
-
-        # Try Piper if GoogleTTS failed
-        if not tts_initialized:
-            try:
-                self.tts = TextToSpeech(
-                    voice=tts_config['voice'],
-                    speed=tts_config['speed']
-                )
-                if self.tts.enabled:
-                    tts_initialized = True
-            except Exception as e:
-                console.print(f"[dim]Piper not available: {e}[/dim]")
 
-        # Fallback to SimpleTTS (espeak)
-        if not tts_initialized:
-            console.print("[yellow]Using espeak fallback (basic quality)[/yellow]")
-            self.tts = SimpleTTS()
+        # Audio cache shared by whichever engine is chosen
+        cache_config = tts_config.get('cache', {})
+        self.tts_cache = AudioCache(
+            cache_dir=cache_config.get('dir', 'cache/tts'),
+            memory_items=cache_config.get('memory_items', 64),
+            disk_max_mb=cache_config.get('disk_max_mb', 200),
+            enabled=cache_config.get('enabled', True)
+        )
 
-        if hasattr(self.tts, 'set_enabled'):
-            self.tts.set_enabled(tts_config['enabled'])
+        self.tts = create_tts(tts_config, cache=self.tts_cache, sink=self.sink)
 
-        # Session data
-        self.session_start = datetime.now()
-        self.conversation_log = []
+    def show_startup_times(self):
+        """Print how long each subsystem took to load"""
+        with self._startup_lock:
+            startup_times = dict(self.startup_times)
 
-        console.print("[green]✅ All systems ready![/green]\n")
+        table = Table(title="⏱️  Startup", show_header=False, box=None)
+        for name, seconds in startup_times.items():
+            table.add_row(f"[bold]{name}[/bold]" if name == "Total" else name, f"{seconds:.2f}s")
+        if "Whisper warmup" not in startup_times:
+            table.add_row("Whisper warmup", "[dim]running in background[/dim]")
+        console.print(table)
 
     def display_welcome(self):
         """Show welcome message"""
@@ -102,107 +230,425 @@ Focus: [yellow]{', '.join(self.config['student']['focus_areas'])}[/yellow]
         """
         console.print(Panel(welcome, border_style="cyan"))
 
+    def show_partial_transcript(self, event):
+        """Show the live transcript while the student is still speaking"""
+        if event.kind == "partial":
+            console.print(f"[dim]📝 {event.text}[/dim]", end="\r")
+
+    def open_journal(self):
+        """
+        Start the session journal, offering to resume an interrupted session
+
+        Returns:
+            SessionJournal, or None if conversations aren't saved
+        """
+        history_config = self.config['history']
+        if not history_config['save_conversations']:
+            return None
+
+        resume_path = None
+        for path in find_interrupted():
+            # Claim it, in case another assistant is starting up at the same time
+            lock = JournalLock(path)
+            if not lock.acquire():
+                continue
+            try:
+                if not path.exists():
+                    continue  # Already saved by the other assistant
+                _, turns, ended = read_journal(path)
+                if (resume_path is None and not ended and turns and not self.scripted
+                        and Confirm.ask(f"Resume the interrupted session {path.stem} ({len(turns)} turns)?")):
+                    resume_path = path
+                    self.teacher.restore(turns)
+                else:
+                    # Keep it as a normal saved session
+                    self.index_session(compact_journal(path))
+            finally:
+                lock.release(remove=path != resume_path)
+
+        return SessionJournal(
+            max_sessions=history_config.get('max_sessions', 100),
+            fsync_interval=history_config.get('fsync_interval', 1.0),
+            student_level=self.config['student']['level'],
+            resume_path=resume_path
+        )
+
+    def open_audio_archive(self):
+        """
+        Start saving each turn's audio next to the journal (if history.save_audio is on)
+
+        Returns:
+            AudioArchive, or None
+        """
+        if not self.save_audio or self.journal is None:
+            return None
+        history_config = self.config['history']
+        self.stt.keep_recordings = True
+        return AudioArchive(
+            self.journal.path.with_suffix(""),
+            audio_format=history_config.get('audio_format', 'flac'),
+            queue_size=history_config.get('audio_queue', 16)
+        )
+
     def save_session(self):
-        """Save conversation history"""
-        if not self.config['history']['save_conversations']:
+        """Close the journal: compact it to session_*.json and drop the oldest sessions"""
+        if self.audio_archive is not None:
+            self.audio_archive.close()
+            archive = self.audio_archive
+            dropped = f", {archive.dropped} dropped (disk too slow)" if archive.dropped else ""
+            console.print(f"[dim]🎧 {archive.written} audio file(s) saved to {archive.directory}{dropped}[/dim]")
+
+        if self.journal is None:
             return
 
-        history_dir = Path("history")
-        history_dir.mkdir(exist_ok=True)
+        session_file = self.journal.close()
+        console.print(f"[dim]💾 Session saved to {session_file}[/dim]")
+        self.index_session(session_file)
 
-        session_file = history_dir / f"session_{self.session_start.strftime('%Y%m%d_%H%M%S')}.json"
+    def index_session(self, session_file):
+        """Add a saved session to the SQLite index used by report.py"""
+        history_config = self.config['history']
+        if not history_config.get('index', True):
+            return
+        try:
+            index = SessionIndex(history_config.get('index_path', 'history/sessions.db'))
+            try:
+                index.add_session(session_file)
+            finally:
+                index.close()
+        except Exception as e:
+            console.print(f"[dim]Session index not updated: {e}[/dim]")
 
-        session_data = {
-            "start_time": self.session_start.isoformat(),
-            "end_time": datetime.now().isoformat(),
-            "student_level": self.config['student']['level'],
-            "conversation": self.conversation_log
-        }
+    def handle_command(self, student_text):
+        """
+        Check a transcript before it goes to the teacher
 
-        with open(session_file, 'w') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        Returns:
+            None to answer it, "skip" to ignore it, "stop" to end the session
+        """
+        if not student_text or len(student_text.strip()) < 3:
+            console.print("[yellow]⚠️  I didn't catch that. Please try again.[/yellow]\n")
+            return "skip"
 
-        console.print(f"[dim]💾 Session saved to {session_file}[/dim]")
+        console.print(f"\n[green]👤 You:[/green] {student_text}\n")
 
-    def run(self):
-        """Main conversation loop"""
+        # Check for commands
+        if student_text.lower() in ['exit', 'quit', 'bye', 'goodbye']:
+            farewell = "Goodbye! Great practice today. Keep up the good work!"
+            console.print(f"[blue]🤖 Teacher:[/blue] {farewell}\n")
+            self.tts.speak(farewell)
+            return "stop"
+
+        if student_text.lower() == 'summary':
+            summary = self.teacher.get_conversation_summary()
+            console.print(Panel(summary, title="📊 Session Summary", border_style="blue"))
+            return "skip"
+
+        return None
+
+    def log_turn(self, student_text, teacher_response):
+        """Log conversation (appended to the journal right away, with the turn's timings)"""
+        spans = tracer.end_turn()
+        if spans and self.latency_footer:
+            self.show_latency(spans)
+        if self.journal is None:
+            return
+
+        extra = {"spans": spans} if spans else {}
+        if self.audio_archive is not None:
+            # Queued for the archive's writer thread; the turn doesn't wait for the disk
+            turn = f"turn_{self.journal.turns + 1:03d}"
+            files = {
+                "student": self.audio_archive.add(f"{turn}_student",
+                                                  [(self.stt.last_recording, self.stt.sample_rate)]),
+                "teacher": self.audio_archive.add(f"{turn}_teacher", self._teacher_clips),
+            }
+            files = {role: path for role, path in files.items() if path}
+            if files:
+                extra["audio"] = files
+        self.journal.log_turn(student_text, teacher_response, **extra)
+
+    def show_latency(self, spans):
+        """One-line footer with where the turn's time went"""
+        labels = {"prompt_eval": "prompt", "generation": "generate", "synthesis": "synth", "playback": "play"}
+        parts = []
+        for name, stage in summarize(spans).items():
+            part = f"{labels.get(name, name)} {stage['seconds']:.2f}s"
+            if stage.get("tokens_per_second"):
+                part += f" ({stage['tokens_per_second']:.0f} tok/s)"
+            elif name == "prompt_eval" and stage.get("tokens"):
+                part += f" ({stage['tokens']} tok)"
+            parts.append(part)
+        console.print(f"[dim]⏱️  {' · '.join(parts)}[/dim]")
+
+    def start_turn(self):
+        """The student is about to speak: timings and teacher audio start over"""
+        tracer.start_turn()
+        self._teacher_clips = []
+
+    def keep_teacher_audio(self, samples, sample_rate):
+        """Collect what the teacher says this turn (called from the TTS engine)"""
+        self._teacher_clips.append((samples, sample_rate))
+
+    def greet(self):
+        """Welcome panel and initial greeting in Portuguese"""
         self.display_welcome()
 
-        # Initial greeting in Portuguese
         greeting = "Olá! Sou a Sarah, sua professora de inglês. Vamos praticar! Tente Responder somente em ingles. "
         console.print(f"\n[blue]🤖 Teacher:[/blue] {greeting}\n")
         self.tts.speak(greeting)
 
+    def run(self):
+        """Main conversation loop"""
+        if self.config.get('pipeline', {}).get('async', False):
+            return self.run_pipeline()
+
+        self.greet()
+
         try:
             while True:
                 # Check recording mode
-                recording_mode = self.config['audio'].get('recording_mode', 'auto')
-
-                if recording_mode == 'manual':
+                recording_mode = self.recording_mode()
+
+                # If the student interrupted the teacher, continue from what they already said
+                barge_in, self._barge_in = self._barge_in, {}
+                self.start_turn()
+
+                if recording_mode == 'manual' and self.config['stt'].get('streaming', False):
+                    # MANUAL MODE + STREAMING: transcribe while the student speaks
+                    student_text = self.stt.listen_and_transcribe_streaming(
+                        max_duration=self.config['audio']['max_recording_time'],
+                        step=self.config['stt'].get('streaming_step', 0.5),
+                        on_event=self.show_partial_transcript,
+                        **barge_in
+                    )
+                elif recording_mode == 'manual':
                     # MANUAL MODE: Always listening, press Enter to stop
                     student_text = self.stt.listen_and_transcribe_manual(
-                        max_duration=self.config['audio']['max_recording_time']
+                        max_duration=self.config['audio']['max_recording_time'],
+                        **barge_in
                     )
                 else:
                     # AUTO MODE: Automatic silence detection
-                    input()  # Wait for Enter
+                    if not barge_in and not self.scripted:
+                        input()  # Wait for Enter
+                        self.start_turn()
 
                     student_text = self.stt.listen_and_transcribe(
-                        duration=self.config['audio']['max_recording_time']
+                        duration=self.config['audio']['max_recording_time'],
+                        **barge_in
                     )
 
-                if not student_text or len(student_text.strip()) < 3:
-                    console.print("[yellow]⚠️  I didn't catch that. Please try again.[/yellow]\n")
-                    continue
-
-                console.print(f"\n[green]👤 You:[/green] {student_text}\n")
-
-                # Check for commands
-                if student_text.lower() in ['exit', 'quit', 'bye', 'goodbye']:
-                    farewell = "Goodbye! Great practice today. Keep up the good work!"
-                    console.print(f"[blue]🤖 Teacher:[/blue] {farewell}\n")
-                    self.tts.speak(farewell)
+                action = self.handle_command(student_text)
+                if action == "stop":
                     break
-
-                if student_text.lower() == 'summary':
-                    summary = self.teacher.get_conversation_summary()
-                    console.print(Panel(summary, title="📊 Session Summary", border_style="blue"))
+                if action == "skip":
                     continue
 
-                # Get teacher response
-                teacher_response = self.teacher.chat(student_text)
-                console.print(f"[blue]🤖 Teacher:[/blue] {teacher_response}\n")
+                # Stream teacher response, speaking each sentence as it is ready
+                interrupted = threading.Event()
+                tokens = self.teacher.chat_stream(student_text, cancel_event=interrupted)
+                console.print("[blue]🤖 Teacher:[/blue] ", end="")
+                monitor = self.start_barge_in(interrupted.set)
+                try:
+                    teacher_response = speak_stream(
+                        self.tts,
+                        iter_sentences(tokens),
+                        on_chunk=lambda sentence: console.print(sentence, end=" "),
+                        stop_event=interrupted
+                    )
+                finally:
+                    self.stop_barge_in(monitor)
+                console.print("\n")
 
-                # Speak response
-                self.tts.speak(teacher_response)
+                if interrupted.is_set():
+                    # Keep only what the student actually heard
+                    self.teacher.truncate_last_reply(teacher_response)
+                    console.print("[dim]✋ Interrupted - go ahead![/dim]")
+                console.print(f"[dim]🧮 Prompt: {self.teacher.last_prompt_tokens} tokens[/dim]")
 
-                # Log conversation
-                self.conversation_log.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "student": student_text,
-                    "teacher": teacher_response
-                })
+                self.log_turn(student_text, teacher_response)
 
         except KeyboardInterrupt:
             console.print("\n\n[yellow]Session interrupted[/yellow]")
 
+        except EOFError:
+            console.print("\n[yellow]📼 No more input - ending the session[/yellow]")
+
         finally:
-            # Session summary
-            console.print("\n" + "="*50)
-            summary = self.teacher.get_conversation_summary()
-            console.print(Panel(summary, title="📊 Session Summary", border_style="green"))
+            self.end_session()
 
-            # Save session
-            self.save_session()
+    def start_barge_in(self, on_interrupt):
+        """
+        Watch the microphone while the teacher speaks (if audio.barge_in is enabled)
 
-            console.print("\n[cyan]Thanks for practicing! See you next time! 👋[/cyan]\n")
+        Args:
+            on_interrupt: Called when the student starts talking
+
+        Returns:
+            The running BargeInMonitor, or None
+        """
+        barge_in_config = self.config['audio'].get('barge_in', {})
+        if not barge_in_config.get('enabled', False):
+            return None
+
+        def interrupt():
+            on_interrupt()
+            if hasattr(self.tts, 'stop'):
+                self.tts.stop()
+
+        monitor = BargeInMonitor(
+            sample_rate=self.stt.sample_rate,
+            threshold=barge_in_config.get('threshold', 0.02),
+            min_speech=barge_in_config.get('min_speech', 0.3),
+            preroll=barge_in_config.get('preroll', 0.5),
+            on_speech=interrupt,
+            buffer=self.stt.stream_buffer,
+            source=self.stt.source
+        )
+        try:
+            monitor.start()
+        except Exception as e:
+            console.print(f"[dim]Barge-in not available: {e}[/dim]")
+            return None
+        return monitor
+
+    def stop_barge_in(self, monitor):
+        """Stop watching; keep the student's speech for the next recording"""
+        if monitor is None:
+            return
+        interruption = monitor.stop()
+        if interruption is not None:
+            # A position on the session stream: the next recording reads on from there, nothing is lost
+            self._barge_in = {"start": interruption} if monitor.shared else {"preroll": interruption}
+
+    def capture_utterance(self):
+        """Record one utterance for the async pipeline (blocking)"""
+        max_time = self.config['audio']['max_recording_time']
+        barge_in, self._barge_in = self._barge_in, {}
+        self.start_turn()
+        if self.recording_mode() == 'manual':
+            return self.stt.record_audio_manual(max_duration=max_time, **barge_in)
+
+        if not barge_in and not self.scripted:
+            input()  # Wait for Enter
+            self.start_turn()
+        return self.stt.record_audio(duration=max_time, **barge_in)
+
+    def on_pipeline_event(self, kind, data):
+        """Show what the async pipeline is doing"""
+        if kind == "sentence":
+            if not self._reply_started:
+                console.print("[blue]🤖 Teacher:[/blue] ", end="")
+                self._reply_started = True
+                self._monitor = self.start_barge_in(self.pipeline.cancel_turn)
+            console.print(data, end=" ")
+        elif kind == "turn":
+            self.stop_barge_in(self._monitor)
+            self._monitor = None
+            if self._reply_started:
+                console.print("\n")
+            self._reply_started = False
+            if data["interrupted"]:
+                # Keep only what the student actually heard
+                self.teacher.truncate_last_reply(data["teacher"])
+                console.print("[dim]✋ Interrupted - go ahead![/dim]")
+            if data["teacher"]:
+                console.print(f"[dim]🧮 Prompt: {self.teacher.last_prompt_tokens} tokens[/dim]")
+                self.log_turn(data["student"], data["teacher"])
+        elif kind == "empty":
+            console.print("[yellow]⚠️  I didn't catch that. Please try again.[/yellow]\n")
+        elif kind == "error":
+            console.print(f"[red]⚠️  {data}[/red]")
+
+    def run_pipeline(self):
+        """Conversation loop on the asyncio pipeline (stages overlap)"""
+        self.greet()
+
+        pipeline_config = self.config.get('pipeline', {})
+        self._reply_started = False
+        self._monitor = None
+        self.pipeline = TurnPipeline(
+            self.stt,
+            self.teacher,
+            self.tts,
+            capture=self.capture_utterance,
+            queue_size=pipeline_config.get('queue_size', 2),
+            handle_transcript=self.handle_command,
+            on_event=self.on_pipeline_event
+        )
+
+        try:
+            asyncio.run(self.pipeline.run())
+        except KeyboardInterrupt:
+            console.print("\n\n[yellow]Session interrupted[/yellow]")
+        finally:
+            self.end_session()
+
+    def end_session(self):
+        """Show the summary, save the session and say goodbye"""
+        # Session summary
+        console.print("\n" + "="*50)
+        summary = self.teacher.get_conversation_summary()
+        console.print(Panel(summary, title="📊 Session Summary", border_style="green"))
+
+        # Save session
+        self.save_session()
+
+        cache_stats = self.tts_cache.stats()
+        if cache_stats['hits'] or cache_stats['misses']:
+            console.print(f"[dim]🗂️  TTS cache: {cache_stats['hits']} hits, "
+                          f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})[/dim]")
+        if self.response_cache is not None:
+            reply_stats = self.response_cache.stats()
+            console.print(f"[dim]⚡ Reply cache: {reply_stats['hits']} hits "
+                          f"({reply_stats['near_hits']} near-identical), {reply_stats['misses']} misses "
+                          f"({reply_stats['hit_rate']:.0%})[/dim]")
+            if reply_stats['slow_embeddings']:
+                console.print(f"[dim]   {reply_stats['slow_embeddings']} lookup(s) didn't wait for a slow "
+                              f"embedding (llm.response_cache.embed_timeout)[/dim]")
+
+        self.stt.close_stream()
+
+        console.print("\n[cyan]Thanks for practicing! See you next time! 👋[/cyan]\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="English teacher voice assistant")
+    parser.add_argument("--config", default="config/settings.yaml")
+    parser.add_argument("--replay", help="Scripted session: play these recordings instead of using the "
+                                         "microphone (audio file, directory or manifest)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (2 = twice as fast)")
+    parser.add_argument("--loop", action="store_true", help="Replay the recordings forever (soak test)")
+    parser.add_argument("--sink", choices=("speaker", "null"), default="speaker",
+                        help="null = no sound (headless machines)")
+    parser.add_argument("--capture", help="Save everything the teacher said to this audio file (no sound)")
+    return parser.parse_args()
 
 
 def main():
     """Entry point"""
+    args = parse_args()
+
+    source = sink = None
+    if args.replay:
+        if Path(args.replay).suffix.lower() in AUDIO_EXTENSIONS:
+            files = [args.replay]
+        else:
+            files = collect_files(args.replay)
+        source = FileSource(files, speed=args.speed, loop=args.loop)
+        console.print(f"[cyan]📼 Replaying {len(files)} recording(s) at {args.speed:g}x[/cyan]")
+    if args.capture:
+        sink = CaptureSink(realtime=True, speed=args.speed)
+    elif args.sink == "null":
+        sink = NullSink(realtime=True, speed=args.speed)
+
     try:
-        assistant = EnglishAssistant()
+        assistant = EnglishAssistant(args.config, source=source, sink=sink)
         assistant.run()
+        if args.capture:
+            seconds = sink.save(args.capture)
+            console.print(f"[green]💾 Teacher audio ({seconds:.0f}s) saved to {args.capture}[/green]")
     except FileNotFoundError as e:
         console.print(f"[red]Error: {e}[/red]")
         console.print("[yellow]Make sure config/settings.yaml exists[/yellow]")
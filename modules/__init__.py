@@ -1,9 +1,29 @@
 """
 English Training Voice Assistant - Modules
+
+Engines are imported lazily, so loading one doesn't pull in the
+dependencies of the others (faster_whisper, ollama, sounddevice, gtts).
 """
 
-from .stt import SpeechToText
-from .llm import EnglishTeacher
-from .tts import TextToSpeech, SimpleTTS, GoogleTTS
+import importlib
+
+_EXPORTS = {
+    'SpeechToText': '.stt',
+    'EnglishTeacher': '.llm',
+    'TextToSpeech': '.tts',
+    'SimpleTTS': '.tts',
+    'GoogleTTS': '.tts',
+    'AudioCache': '.tts_cache',
+    'BatchTranscriber': '.batch',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['SpeechToText', 'EnglishTeacher', 'TextToSpeech', 'SimpleTTS', 'GoogleTTS']
\ No newline at end of file
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
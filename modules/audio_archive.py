@@ -0,0 +1,104 @@
+"""
+Audio archive
+Keeps the audio of every turn (student take and teacher reply) next to the
+session journal, compressed, without slowing the conversation down
+"""
+
+import queue
+import threading
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from .audio_io import resample
+
+
+class AudioArchive:
+    """
+    Compressed per-turn audio for one session
+
+    add() never blocks: clips go to a bounded queue and a background thread
+    encodes and writes them. If the disk or the encoder falls behind and
+    the queue is full, the clip is dropped (and counted) instead of
+    delaying the turn.
+    """
+    # format name -> (soundfile format, subtype, extension)
+    FORMATS = {
+        "flac": ("FLAC", "PCM_16", ".flac"),
+        "opus": ("OGG", "OPUS", ".ogg"),
+    }
+    OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+    def __init__(self, directory, audio_format="flac", queue_size=16):
+        """
+        Args:
+            directory: Folder for this session's audio (created on first write)
+            audio_format: flac (lossless) or opus (much smaller)
+            queue_size: Clips waiting to be written before new ones are dropped
+        """
+        if audio_format not in self.FORMATS:
+            raise ValueError(f"Unknown audio format {audio_format!r} (use {', '.join(self.FORMATS)})")
+        self.directory = Path(directory)
+        self.audio_format = audio_format
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self._clips = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(target=self._run, daemon=True)
+        self._writer.start()
+
+    def add(self, name, clips):
+        """
+        Queue audio for writing (returns immediately)
+
+        Args:
+            name: File name without extension (e.g. "turn_003_student")
+            clips: List of (float32 samples, sample rate), joined in order;
+                the arrays must not change afterwards (pass copies of views)
+
+        Returns:
+            Path of the file relative to the history folder, or None if
+            there was no audio or the queue was full
+        """
+        clips = [(samples, rate) for samples, rate in clips if samples is not None and len(samples)]
+        if not clips:
+            return None
+        filename = name + self.FORMATS[self.audio_format][2]
+        try:
+            self._clips.put_nowait((filename, clips))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return f"{self.directory.name}/{filename}"
+
+    def _run(self):
+        while True:
+            item = self._clips.get()
+            if item is None:
+                break
+            filename, clips = item
+            try:
+                self._write(filename, clips)
+                self.written += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️  Could not save {filename}: {e}")
+
+    def _write(self, filename, clips):
+        sample_rate = clips[0][1]
+        if self.audio_format == "opus" and sample_rate not in self.OPUS_RATES:
+            sample_rate = min(rate for rate in self.OPUS_RATES if rate >= min(sample_rate, 48000))
+        parts = [resample(np.asarray(samples, dtype=np.float32).reshape(len(samples), -1).mean(axis=1),
+                          rate, sample_rate)
+                 for samples, rate in clips]
+
+        file_format, subtype, _ = self.FORMATS[self.audio_format]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sf.write(self.directory / filename, np.concatenate(parts), sample_rate,
+                 format=file_format, subtype=subtype)
+
+    def close(self):
+        """Write what is still queued and stop the writer"""
+        self._clips.put(None)
+        self._writer.join()
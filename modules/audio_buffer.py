@@ -0,0 +1,87 @@
+"""
+Preallocated audio buffers for real-time capture
+Keeps allocations (and GC pauses) out of the PortAudio callback
+"""
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size float32 ring buffer for one writer and one reader
+
+    The audio callback only copies samples into preallocated memory and then
+    advances `written`, so no locks or allocations happen on the audio
+    thread. Positions are absolute sample counts since the last reset();
+    only the most recent `capacity` samples can be read back.
+    """
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity: Number of samples kept
+        """
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0  # Total samples written (published after the copy)
+
+    def reset(self):
+        """Start over at position 0 (previous views become invalid)"""
+        self.written = 0
+
+    def write(self, block):
+        """
+        Append samples (called from the audio callback)
+
+        Args:
+            block: Samples, shape (N,) or (N, 1)
+        """
+        block = block.reshape(-1)
+        n = len(block)
+        if n >= self.capacity:
+            block = block[-self.capacity:]
+            start = (self.written + n - self.capacity) % self.capacity
+            count = self.capacity
+        else:
+            start = self.written % self.capacity
+            count = n
+
+        end = start + count
+        if end <= self.capacity:
+            self._data[start:end] = block
+        else:
+            first = self.capacity - start
+            self._data[start:] = block[:first]
+            self._data[:count - first] = block[first:]
+
+        self.written += n
+
+    @property
+    def oldest(self):
+        """Oldest position still in the buffer"""
+        return max(0, self.written - self.capacity)
+
+    def read(self, start=None, end=None):
+        """
+        Read samples between two absolute positions
+
+        Returns a view into the buffer when the range doesn't wrap around
+        (no copy); it is only valid until those samples are overwritten.
+
+        Args:
+            start: First position (default: oldest available)
+            end: Position after the last sample (default: everything written)
+
+        Returns:
+            float32 numpy array
+        """
+        written = self.written
+        end = written if end is None else min(end, written)
+        start = self.oldest if start is None else max(start, written - self.capacity, 0)
+        if start >= end:
+            return self._data[:0]
+
+        first = start % self.capacity
+        last = first + (end - start)
+        if last <= self.capacity:
+            return self._data[first:last]
+        return np.concatenate((self._data[first:], self._data[:last - self.capacity]))
@@ -0,0 +1,371 @@
+"""
+Audio sources and sinks
+Where recordings come from and where the teacher's voice goes, so the
+assistant also runs without sound hardware (file replay, CI, soak tests)
+
+Sources open streams that call back with float32 blocks, exactly like a
+sounddevice InputStream. Sinks play float32 clips or raw int16 streams.
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import soundfile as sf
+
+
+def resample(samples, source_rate, target_rate):
+    """Linear resampling (plenty for speech going into Whisper)"""
+    if source_rate == target_rate:
+        return samples
+    duration = len(samples) / source_rate
+    positions = np.arange(int(duration * target_rate)) / target_rate
+    return np.interp(positions, np.arange(len(samples)) / source_rate, samples).astype(np.float32)
+
+
+def load_mono(path, sample_rate):
+    """Read an audio file as float32 mono at sample_rate"""
+    samples, file_rate = sf.read(str(path), dtype="float32", always_2d=True)
+    return resample(samples.mean(axis=1), file_rate, sample_rate)
+
+
+# ---- sources -------------------------------------------------------------
+
+class MicrophoneSource:
+    """Live microphone (sounddevice)"""
+    def __init__(self, latency=None):
+        """
+        Args:
+            latency: PortAudio latency hint ("low", "high" or seconds; None = default)
+        """
+        self.latency = latency
+
+    def open(self, sample_rate, blocksize, callback):
+        """
+        Open an input stream (not started yet)
+
+        Args:
+            sample_rate: Samples per second
+            blocksize: Samples per callback
+            callback: sounddevice-style callback(indata, frames, time, status)
+
+        Returns:
+            sounddevice.InputStream
+        """
+        import sounddevice as sd
+
+        extra = {} if self.latency is None else {"latency": self.latency}
+        return sd.InputStream(callback=callback, channels=1, samplerate=sample_rate,
+                              dtype='float32', blocksize=blocksize, **extra)
+
+    def cue(self):
+        """A recording is starting (the microphone is always live)"""
+
+
+class _Status:
+    """Stand-in for sounddevice's CallbackFlags"""
+    input_overflow = False
+
+
+class _FileStream:
+    """Feeds a FileSource's audio to a callback from a thread, block by block"""
+    latency = 0.0
+
+    def __init__(self, source, sample_rate, blocksize, callback):
+        self.source = source
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.callback = callback
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        block_seconds = self.blocksize / self.sample_rate / self.source.speed
+        status = _Status()
+        deadline = time.perf_counter()
+        while not self._stopped.is_set():
+            block = self.source._next_block(self.blocksize)
+            self.callback(block.reshape(-1, 1), self.blocksize, None, status)
+            # Sleep to the next deadline, not a fixed time, so replay doesn't drift
+            deadline += block_seconds
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                self._stopped.wait(delay)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class FileSource:
+    """
+    Replays WAV/FLAC files as if the student said them into the microphone
+
+    Between recordings the "room" is quiet (low noise, so endpointing and
+    calibration behave like with a real microphone). Each recording cues
+    the next file: `lead` seconds of room noise, the file, then `tail`
+    seconds of room noise so the endpointer ends the recording.
+    When every file has been played, cue() raises EOFError.
+    """
+    def __init__(self, files, sample_rate=16000, speed=1.0, lead=0.3, tail=1.5, noise=0.001,
+                 loop=False):
+        """
+        Args:
+            files: Audio file paths, in the order they are "spoken"
+            sample_rate: Rate the files are resampled to
+            speed: 1.0 = real time, 2.0 = twice as fast (must be > 0)
+            lead: Seconds of room noise before each file
+            tail: Seconds of room noise after each file (longer than the hangover)
+            noise: Room noise amplitude (RMS)
+            loop: Start over after the last file instead of raising EOFError
+        """
+        if speed <= 0:
+            raise ValueError("speed must be > 0")
+        self.files = [str(path) for path in files]
+        self.sample_rate = sample_rate
+        self.speed = speed
+        self.lead = lead
+        self.tail = tail
+        self.noise = noise
+        self.loop = loop
+        self.played = 0  # Files cued so far
+        self._queue = deque()  # Cued audio not fed yet
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(0)
+        self._feed_rng = np.random.default_rng(1)  # Generators aren't thread-safe: one per thread
+
+    def open(self, sample_rate, blocksize, callback):
+        """Open a stream that feeds the files in real time (or `speed` times faster)"""
+        if sample_rate != self.sample_rate:
+            raise ValueError(f"FileSource was set up for {self.sample_rate} Hz, not {sample_rate} Hz")
+        return _FileStream(self, sample_rate, blocksize, callback)
+
+    def _room(self, seconds):
+        return (self._rng.standard_normal(int(seconds * self.sample_rate)) * self.noise).astype(np.float32)
+
+    def cue(self):
+        """
+        Queue the next file (a recording is starting)
+
+        Raises:
+            EOFError: No files left
+        """
+        if self.played >= len(self.files):
+            if not self.loop or not self.files:
+                raise EOFError("No more audio files to replay")
+            self.played = 0
+        path = self.files[self.played]
+        self.played += 1
+        audio = np.concatenate((self._room(self.lead), load_mono(path, self.sample_rate), self._room(self.tail)))
+        with self._lock:
+            self._queue.append(audio)
+        return path
+
+    def _next_block(self, size):
+        """Next `size` samples: cued audio, padded with room noise"""
+        block = (self._feed_rng.standard_normal(size) * self.noise).astype(np.float32)
+        filled = 0
+        with self._lock:
+            while filled < size and self._queue:
+                audio = self._queue[0]
+                take = min(size - filled, len(audio))
+                block[filled:filled + take] = audio[:take]
+                filled += take
+                if take == len(audio):
+                    self._queue.popleft()
+                else:
+                    self._queue[0] = audio[take:]
+        return block
+
+
+# ---- sinks ---------------------------------------------------------------
+
+class SpeakerSink:
+    """Sound card (sounddevice); external players (mpg123, say) are allowed too"""
+    external = True
+
+    def play(self, samples, sample_rate):
+        """Play float32 samples (blocks until done or stop())"""
+        import sounddevice as sd
+        sd.play(samples, sample_rate)
+        sd.wait()
+
+    def open_stream(self, sample_rate):
+        """Raw int16 mono output stream (write bytes as they are synthesized)"""
+        import sounddevice as sd
+        return sd.RawOutputStream(samplerate=sample_rate, channels=1, dtype='int16')
+
+    def stop(self):
+        """Stop what play() is playing"""
+        import sounddevice as sd
+        sd.stop()
+
+
+class _TeeStream:
+    """Raw stream that also collects what is written, for TeeSink"""
+    def __init__(self, tee, stream, sample_rate):
+        self.tee = tee
+        self.stream = stream
+        self.sample_rate = sample_rate
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.stream.write(data)
+
+    def abort(self):
+        self.stream.abort()
+
+    def __enter__(self):
+        self.stream.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if self.parts:
+            samples = np.frombuffer(b"".join(self.parts), dtype=np.int16).astype(np.float32) / 32768.0
+            self.tee.listener(samples, self.sample_rate)
+        return self.stream.__exit__(*exc)
+
+
+class TeeSink:
+    """
+    Plays through another sink and hands every clip to a listener too
+    (e.g. to archive what the teacher said)
+
+    Audio played by external players (raw MP3, macOS say) bypasses sinks
+    and is not seen.
+    """
+    def __init__(self, sink, listener):
+        """
+        Args:
+            sink: Sink that actually plays the audio
+            listener: Called with (float32 samples, sample rate) for each clip
+        """
+        self.sink = sink
+        self.listener = listener
+        self.external = sink.external
+
+    def play(self, samples, sample_rate):
+        self.listener(samples, sample_rate)
+        self.sink.play(samples, sample_rate)
+
+    def open_stream(self, sample_rate):
+        return _TeeStream(self, self.sink.open_stream(sample_rate), sample_rate)
+
+    def stop(self):
+        self.sink.stop()
+
+
+class _SinkStream:
+    """Raw int16 stream into a NullSink"""
+    def __init__(self, sink, sample_rate):
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.parts = []
+        self.started = None
+
+    def write(self, data):
+        if self.started is None:
+            self.started = time.perf_counter()
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        self.parts.append(samples)
+        self.sink._wait(len(samples) / self.sample_rate)
+
+    def abort(self):
+        pass
+
+    def __enter__(self):
+        self.sink._stop_requested.clear()
+        return self
+
+    def __exit__(self, *exc):
+        if self.parts:
+            self.sink._keep(np.concatenate(self.parts), self.sample_rate, self.started)
+        return False
+
+
+class NullSink:
+    """
+    Discards the audio
+
+    With realtime=True, playing takes as long as the audio lasts (divided
+    by `speed`), so turn timing and barge-in windows stay realistic.
+    """
+    external = False
+
+    def __init__(self, realtime=False, speed=1.0):
+        """
+        Args:
+            realtime: Take as long as the audio would to play
+            speed: Faster than real time (with realtime=True)
+        """
+        self.realtime = realtime
+        self.speed = speed
+        self.clips = 0
+        self.seconds = 0.0  # Audio "played" so far
+        self._stop_requested = threading.Event()
+
+    def play(self, samples, sample_rate):
+        """Play float32 samples (returns early on stop())"""
+        self._stop_requested.clear()
+        samples = np.asarray(samples, dtype=np.float32)
+        self._keep(samples, sample_rate)
+        self._wait(len(samples) / sample_rate)
+
+    def open_stream(self, sample_rate):
+        """Raw int16 output stream, like SpeakerSink.open_stream"""
+        return _SinkStream(self, sample_rate)
+
+    def stop(self):
+        self._stop_requested.set()
+
+    def _wait(self, seconds):
+        if self.realtime:
+            self._stop_requested.wait(seconds / self.speed)
+
+    def _keep(self, samples, sample_rate, started=None):
+        self.clips += 1
+        self.seconds += len(samples) / sample_rate
+
+
+class CaptureSink(NullSink):
+    """NullSink that also keeps every clip, with the time it started playing"""
+    def __init__(self, realtime=False, speed=1.0):
+        super().__init__(realtime, speed)
+        self.captured = []  # (perf_counter time, float32 samples, sample rate)
+
+    def _keep(self, samples, sample_rate, started=None):
+        super()._keep(samples, sample_rate)
+        self.captured.append((started or time.perf_counter(), samples.reshape(len(samples), -1).mean(axis=1),
+                              sample_rate))
+
+    def save(self, path, sample_rate=22050):
+        """
+        Write everything that was played to one audio file
+
+        Returns:
+            Seconds of audio written
+        """
+        parts = [resample(samples, rate, sample_rate) for _, samples, rate in self.captured]
+        audio = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        sf.write(str(path), audio, sample_rate)
+        return len(audio) / sample_rate
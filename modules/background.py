@@ -0,0 +1,70 @@
+"""
+Background model work
+Summaries run on the same Ollama model as the teacher, so they give way to
+live turns instead of competing with them
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class BackgroundGate:
+    """
+    Shared by everything that calls the model in the background
+    (SessionSummary, ConversationContext)
+
+    While a live turn holds paused(), background requests don't start, and
+    one already streaming is abandoned and retried once the turn is over.
+    """
+    def __init__(self):
+        self._idle = threading.Event()
+        self._idle.set()
+        self._live = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def paused(self):
+        """Hold background requests while a live turn is using the model"""
+        with self._lock:
+            self._live += 1
+            self._idle.clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._live -= 1
+                if not self._live:
+                    self._idle.set()
+
+    def wait(self):
+        """Block until no live turn is running"""
+        self._idle.wait()
+
+    def chat(self, **kwargs):
+        """
+        ollama.chat for background work that yields to live turns
+
+        The request is streamed so it can be dropped as soon as a live turn
+        starts; it runs again from the start when the turn is over.
+
+        Returns:
+            Response dict like ollama.chat (only message.content is filled in)
+        """
+        import ollama
+
+        while True:
+            self.wait()
+            stream = ollama.chat(stream=True, **kwargs)
+            parts = []
+            try:
+                for chunk in stream:
+                    if not self._idle.is_set():
+                        break  # A live turn started: give it the model
+                    parts.append(chunk['message']['content'])
+                else:
+                    return {"message": {"role": "assistant", "content": "".join(parts)}}
+            finally:
+                # Closing the stream aborts the Ollama request
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
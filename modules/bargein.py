@@ -0,0 +1,145 @@
+"""
+Barge-in detection
+Listens to the microphone while the teacher is speaking so the student can interrupt
+"""
+
+import threading
+
+import numpy as np
+
+from .audio_buffer import RingBuffer
+from .audio_io import MicrophoneSource
+
+
+class BargeInMonitor:
+    """
+    Lightweight energy VAD running during playback
+
+    When the student talks for `min_speech` seconds above `threshold`, the
+    on_speech callback fires from the VAD thread; the audio callback only
+    writes into a preallocated ring buffer. Audio from `preroll` seconds
+    before the trigger onwards is kept, so the start of what the student
+    said can go straight to STT.
+
+    Use headphones or a low speaker volume: loud playback picked up by the
+    microphone looks like speech too.
+
+    When the microphone is already open for the session, pass its ring
+    buffer and the monitor reads from it instead of opening a second stream.
+    stop() then returns a position on that buffer, so the next recording
+    reads the interruption and what follows it as one continuous range.
+    """
+    def __init__(self, sample_rate=16000, threshold=0.02, min_speech=0.3, preroll=0.5,
+                 on_speech=None, buffer=None, source=None):
+        """
+        Args:
+            sample_rate: Microphone sample rate
+            threshold: RMS level counted as speech
+            min_speech: Seconds of continuous speech needed to trigger
+            preroll: Seconds of audio kept from before the trigger
+            on_speech: Callback run once when speech is detected
+            buffer: Shared RingBuffer fed by an open input stream (optional)
+            source: Audio source to open without a shared buffer (default: microphone)
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.min_speech = min_speech
+        self.preroll = preroll
+        self.on_speech = on_speech
+        self.source = source or MicrophoneSource()
+
+        self.blocksize = int(sample_rate * 0.02)  # 20 ms frames
+        self._shared = buffer is not None
+        # Pre-roll plus up to a minute of the student's speech, allocated once
+        self._buffer = buffer if self._shared else RingBuffer(int((preroll + min_speech + 60) * sample_rate))
+        self._start = 0
+        self._stream = None
+        self._watcher = None
+        self._triggered = threading.Event()
+        self._closed = threading.Event()
+        self._speech_start = None
+
+    @property
+    def shared(self):
+        """True when reading the session's ring buffer (stop() returns a position)"""
+        return self._shared
+
+    @property
+    def triggered(self):
+        """True once the student started talking"""
+        return self._triggered.is_set()
+
+    def _callback(self, indata, frames, time, status):
+        self._buffer.write(indata)
+
+    def _watch(self):
+        """Run the VAD on new audio every frame (off the audio thread)"""
+        processed = self._start
+        speech_samples = 0
+        needed = self.min_speech * self.sample_rate
+
+        while not self._closed.wait(0.02):
+            written = self._buffer.written
+            frames = (written - processed) // self.blocksize
+            if frames == 0:
+                continue
+
+            audio = self._buffer.read(processed, processed + frames * self.blocksize)
+            rms = np.sqrt(np.mean(audio.reshape(frames, self.blocksize) ** 2, axis=1))
+
+            for index, level in enumerate(rms):
+                if level > self.threshold:
+                    speech_samples += self.blocksize
+                else:
+                    speech_samples = 0
+                if speech_samples >= needed:
+                    end = processed + (index + 1) * self.blocksize
+                    self._speech_start = end - speech_samples
+                    self._triggered.set()
+                    if self.on_speech:
+                        self.on_speech()
+                    return
+
+            processed += frames * self.blocksize
+
+    def start(self):
+        """Start listening (call when playback starts)"""
+        self._triggered.clear()
+        self._closed.clear()
+        self._speech_start = None
+
+        if self._shared:
+            self._start = self._buffer.written
+        else:
+            self._buffer.reset()
+            self._start = 0
+            self._stream = self.source.open(self.sample_rate, self.blocksize, self._callback)
+            self._stream.start()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """
+        Stop listening (call when playback ends)
+
+        Returns:
+            None if nobody spoke. Otherwise where the student started
+            (pre-roll included): a position on the shared buffer, or a copy
+            of the audio captured from there when the monitor had its own stream
+        """
+        self._closed.set()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+        if not self._triggered.is_set():
+            return None
+        start = max(self._start, self._speech_start - int(self.preroll * self.sample_rate))
+        if self._shared:
+            return start
+        # Own buffer: reset by the next start(), so hand over a copy
+        return self._buffer.read(start).copy()
@@ -0,0 +1,205 @@
+"""
+Batch transcription
+Transcribes directories (or manifests) of recorded answers offline
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .stt import SpeechToText
+
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".ogg", ".m4a", ".webm", ".opus")
+
+
+def collect_files(source, extensions=AUDIO_EXTENSIONS):
+    """
+    List the audio files to transcribe
+
+    Args:
+        source: Directory (searched recursively), or a manifest file with one
+            path per line (.txt) or one {"path": ...} object per line (.jsonl);
+            relative manifest paths are relative to the manifest
+        extensions: File extensions picked up from directories
+
+    Returns:
+        List of file paths (strings), sorted for directories
+    """
+    source = Path(source)
+    if source.is_dir():
+        return sorted(str(path) for path in source.rglob("*")
+                      if path.suffix.lower() in extensions and path.is_file())
+
+    files = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if source.suffix == ".jsonl":
+                line = json.loads(line)["path"]
+            path = Path(line)
+            if not path.is_absolute():
+                path = source.parent / path
+            files.append(str(path))
+    return files
+
+
+def load_done(output_path):
+    """
+    Files already transcribed successfully in an earlier run
+
+    A line cut short by a crash is ignored, so that file is simply redone.
+
+    Returns:
+        Set of paths
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "error" not in record:
+                done.add(record["path"])
+    return done
+
+
+class BatchTranscriber:
+    """
+    Transcribe many files with all CPU cores busy
+
+    A pool of `workers` threads shares one Whisper model loaded with as many
+    CTranslate2 workers, so transcriptions really run in parallel (the
+    decoder releases the GIL). The cores are split between them. With
+    `batch_size` > 1 each file's speech segments are also decoded in batches
+    (faster-whisper's BatchedInferencePipeline, when installed).
+    """
+    def __init__(self, model_size="base", device="cpu", language=None, workers=None,
+                 batch_size=8, cpu_threads=None):
+        """
+        Args:
+            model_size: Whisper model
+            device: cpu or cuda
+            language: Language code, or None to auto-detect per file
+            workers: Files transcribed at the same time (default: cores / 4)
+            batch_size: Segments decoded together per file (1 = no batching)
+            cpu_threads: Threads per worker (default: cores / workers)
+        """
+        cores = os.cpu_count() or 1
+        self.workers = workers or max(1, cores // 4)
+        self.cpu_threads = cpu_threads or max(1, cores // self.workers)
+        self.batch_size = batch_size
+        self.language = language
+
+        self.stt = SpeechToText(model_size=model_size, device=device, language=language,
+                                cpu_threads=self.cpu_threads, num_workers=self.workers)
+        self.model = self.stt.model
+
+        self.pipeline = None
+        if batch_size > 1:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+                self.pipeline = BatchedInferencePipeline(model=self.model)
+            except ImportError:
+                print("⚠️  Batched inference needs faster-whisper>=1.1 - decoding segments one at a time")
+
+    def transcribe_file(self, path):
+        """
+        Transcribe one file
+
+        Returns:
+            JSON-ready record with the text, segments and timing
+        """
+        start = time.perf_counter()
+        if self.pipeline is not None:
+            segments, info = self.pipeline.transcribe(path, language=self.language,
+                                                      batch_size=self.batch_size)
+        else:
+            segments, info = self.model.transcribe(path, language=self.language, vad_filter=True)
+
+        # Segments are lazy - decoding happens while iterating
+        segments = [
+            {"start": round(segment.start, 2), "end": round(segment.end, 2), "text": segment.text.strip()}
+            for segment in segments
+        ]
+        seconds = time.perf_counter() - start
+
+        duration = getattr(info, "duration", 0.0) or 0.0
+        return {
+            "path": path,
+            "text": " ".join(segment["text"] for segment in segments),
+            "language": getattr(info, "language", self.language),
+            "duration": round(duration, 2),
+            "seconds": round(seconds, 3),
+            "rtf": round(seconds / duration, 3) if duration else None,
+            "segments": segments,
+        }
+
+    def run(self, files, output_path, resume=True, on_result=None):
+        """
+        Transcribe files into a JSONL file (one record per line)
+
+        Each line is flushed as soon as its file is done, so an interrupted
+        run can resume where it stopped.
+
+        Args:
+            files: Audio file paths
+            output_path: JSONL output file (appended to)
+            resume: Skip files already transcribed in output_path
+            on_result: Optional callback receiving each record
+
+        Returns:
+            Stats dict: files, skipped, errors, audio_seconds, wall_seconds, files_per_hour
+        """
+        done = load_done(output_path) if resume else set()
+        todo = [path for path in files if path not in done]
+
+        stats = {"files": 0, "skipped": len(files) - len(todo), "errors": 0, "audio_seconds": 0.0}
+        begin = time.perf_counter()
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as out:
+            if out.tell() and not _ends_with_newline(output_path):
+                out.write("\n")  # Don't glue onto a line cut short by a crash
+
+            pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch")
+            futures = {pool.submit(self.transcribe_file, path): path for path in todo}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        record = {"path": futures[future], "error": str(e)}
+
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    if "error" in record:
+                        stats["errors"] += 1
+                    else:
+                        stats["files"] += 1
+                        stats["audio_seconds"] += record["duration"]
+
+                    if on_result:
+                        on_result(record)
+            finally:
+                # On Ctrl+C, drop the files not started yet (resume picks them up)
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        wall = time.perf_counter() - begin
+        stats["wall_seconds"] = round(wall, 2)
+        stats["audio_seconds"] = round(stats["audio_seconds"], 2)
+        stats["files_per_hour"] = round(stats["files"] / wall * 3600, 1) if wall > 0 else 0.0
+        return stats
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
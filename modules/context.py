@@ -0,0 +1,174 @@
+"""
+Conversation context management for the LLM
+Keeps the prompt size bounded however long the session gets
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .background import BackgroundGate
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for PT/EN text)"""
+    return max(1, len(text) // 4)
+
+
+class ConversationContext:
+    """
+    Token-budgeted view of the conversation
+
+    The last `max_turns` turns are sent verbatim. Older turns are removed
+    from the history and folded into a short running summary by a
+    background job, so no turn waits on summarization (and the job gives
+    way to live turns, see BackgroundGate).
+    """
+    def __init__(self, model, max_turns=6, token_budget=1500, summary_tokens=150, keep_alive=None,
+                 gate=None):
+        """
+        Args:
+            model: Ollama model used to write the summary
+            max_turns: Student/teacher exchanges kept verbatim
+            token_budget: Maximum estimated prompt tokens (system + summary + turns)
+            summary_tokens: Maximum length of the running summary
+            keep_alive: Ollama keep_alive for summary requests (None = server default)
+            gate: BackgroundGate paused during live turns (a private one if omitted)
+        """
+        self.model = model
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.keep_alive = keep_alive
+        self.gate = gate or BackgroundGate()
+
+        self.summary = ""
+        self._pending = []  # Turns removed from history but not yet in the summary
+        self._lock = threading.Lock()
+        # One worker: folds run in order, never concurrently
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context")
+
+        self.prompt_tokens = []  # Per-turn prompt token counts
+
+    def build_messages(self, system_prompt, history):
+        """
+        Build the message list sent to Ollama
+
+        Args:
+            system_prompt: Teacher system prompt
+            history: Recent conversation messages
+
+        Returns:
+            List of chat messages
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+
+        with self._lock:
+            summary = self.summary
+            pending = list(self._pending)
+
+        if summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {summary}"
+            })
+
+        # Turns still being folded are sent verbatim until the summary catches up
+        return messages + pending + list(history)
+
+    def estimate(self, messages):
+        """Estimated prompt tokens for a message list"""
+        return sum(estimate_tokens(message["content"]) for message in messages)
+
+    def record_usage(self, estimated, actual=None):
+        """
+        Record the prompt size of a turn
+
+        Args:
+            estimated: Estimated prompt tokens
+            actual: prompt_eval_count reported by Ollama, if any
+
+        Returns:
+            Token count recorded for the turn
+        """
+        tokens = actual if actual else estimated
+        self.prompt_tokens.append(tokens)
+        return tokens
+
+    def compact(self, history, system_prompt=""):
+        """
+        Trim history to the turn and token limits (in place)
+
+        Removed turns are folded into the summary in the background.
+
+        Args:
+            history: Conversation messages (modified in place)
+            system_prompt: Used to account for the fixed part of the prompt
+        """
+        fixed = estimate_tokens(system_prompt) if system_prompt else 0
+        if self.summary:
+            fixed += estimate_tokens(self.summary)
+        removed = []
+
+        def too_big():
+            turns = len(history) // 2
+            if turns > self.max_turns:
+                return True
+            return turns > 1 and fixed + self.estimate(history) > self.token_budget
+
+        while too_big():
+            # Drop one student/teacher exchange from the front
+            removed.extend(history[:2])
+            del history[:2]
+
+        if not removed:
+            return
+
+        with self._lock:
+            self._pending.extend(removed)
+        self._executor.submit(self._fold, removed)
+
+    def _fold(self, turns):
+        """Merge turns into the running summary (runs on the background worker)"""
+        transcript = "\n".join(
+            f"{'Student' if turn['role'] == 'user' else 'Teacher'}: {turn['content']}"
+            for turn in turns
+        )
+        prompt = (
+            f"Current summary:\n{self.summary or '(empty)'}\n\n"
+            f"New conversation:\n{transcript}\n\n"
+            "Update the summary in at most 3 short sentences: topics practiced, "
+            "the student's mistakes and what was corrected."
+        )
+
+        extra = {} if self.keep_alive is None else {"keep_alive": self.keep_alive}
+        try:
+            response = self.gate.chat(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You summarize English lessons concisely."},
+                    {"role": "user", "content": prompt}
+                ],
+                options={"temperature": 0.2, "num_predict": self.summary_tokens},
+                **extra
+            )
+            summary = response['message']['content'].strip()
+        except Exception as e:
+            print(f"⚠️  Context summary failed: {e}")
+            # Keep the gist rather than losing the turns entirely
+            summary = f"{self.summary} {transcript}".strip()[-self.summary_tokens * 4:]
+
+        with self._lock:
+            self.summary = summary
+            # Folds run in order, so these turns are at the front of _pending
+            del self._pending[:len(turns)]
+
+    def reset(self):
+        """Forget the summary and pending turns"""
+        with self._lock:
+            self.summary = ""
+            self._pending = []
+        self.prompt_tokens = []
+
+    def close(self):
+        """Stop the background worker (pending folds still finish)"""
+        self._executor.shutdown(wait=False)
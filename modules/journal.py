@@ -0,0 +1,307 @@
+"""
+Session journal
+Every turn is appended to disk as it happens, so a crash loses nothing
+"""
+
+import json
+import os
+import queue
+import secrets
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class JournalLock:
+    """
+    Exclusive lock on a journal while a session has it open
+
+    Held on a small session_*.lock file next to the journal. The OS
+    releases it if the process dies, so a journal whose lock can be taken
+    belongs to a session that is no longer running.
+    """
+    def __init__(self, journal_path):
+        self.path = Path(journal_path).with_suffix(".lock")
+        self._file = None
+
+    def acquire(self):
+        """
+        Take the lock without waiting
+
+        Returns:
+            True if taken, False if another session holds it
+        """
+        self._file = open(self.path, "a")
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self, remove=True):
+        """Drop the lock (and delete the lock file)"""
+        if self._file is None:
+            return
+        if remove:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+        self._file.close()  # Closing releases the lock
+        self._file = None
+
+
+def journal_in_use(path):
+    """True if a running session holds this journal open"""
+    lock = JournalLock(path)
+    if not lock.path.exists():
+        return False
+    if lock.acquire():
+        lock.release(remove=False)
+        return False
+    return True
+
+
+def read_journal(path):
+    """
+    Read a journal file
+
+    A last line cut short by a crash is skipped.
+
+    Returns:
+        (header dict, list of turn dicts, ended)
+    """
+    header = {}
+    turns = []
+    ended = False
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            kind = record.pop("type", None)
+            if kind == "start":
+                header = record
+            elif kind == "turn":
+                turns.append(record)
+            elif kind == "end":
+                header.update(record)
+                ended = True
+    return header, turns, ended
+
+
+class SessionJournal:
+    """
+    Append-only JSONL journal for one session
+
+    log_turn() only queues the record; a background writer appends it and
+    flushes to the OS right away (so killing the process loses nothing),
+    while fsync runs at most every `fsync_interval` seconds. close()
+    compacts the journal into the usual session_*.json file and removes the
+    oldest sessions beyond `max_sessions`.
+    """
+    def __init__(self, history_dir="history", max_sessions=100, fsync_interval=1.0,
+                 student_level=None, resume_path=None):
+        """
+        Args:
+            history_dir: Where sessions are kept
+            max_sessions: Sessions kept on disk (oldest are deleted; None = all)
+            fsync_interval: Seconds between fsyncs
+            student_level: Stored in the session header
+            resume_path: Journal of an interrupted session to continue
+        """
+        self.history_dir = Path(history_dir)
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        self.max_sessions = max_sessions
+        self.fsync_interval = fsync_interval
+
+        if resume_path is not None:
+            self.path = Path(resume_path)
+            self._lock = JournalLock(self.path)
+            if not self._lock.acquire():
+                raise RuntimeError(f"{self.path.name} is open in another session")
+            self.header, turns, _ = read_journal(self.path)
+            start_time = self.header.get("start_time")
+            self.start_time = datetime.fromisoformat(start_time) if start_time else datetime.now()
+            self.turns = len(turns)
+        else:
+            self.start_time = datetime.now()
+            self.path, self._lock = self._new_path()
+            self.header = {"start_time": self.start_time.isoformat(), "student_level": student_level}
+            self.turns = 0
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        if resume_path is None:
+            self._write({"type": "start", **self.header})
+        elif self._file.tell() and not self._ends_with_newline():
+            self._file.write("\n")  # Don't glue onto a line cut short by a crash
+
+        self._records = queue.Queue()
+        self._writer = threading.Thread(target=self._run, daemon=True)
+        self._writer.start()
+
+    def _new_path(self):
+        """
+        Pick and lock a journal name nobody else uses
+
+        Names start with the start time (so they sort by age) and end with
+        a random suffix, so sessions started in the same second don't clash.
+        """
+        while True:
+            path = self.history_dir / f"session_{self.start_time:%Y%m%d_%H%M%S}_{secrets.token_hex(2)}.jsonl"
+            lock = JournalLock(path)
+            if not lock.acquire():
+                continue
+            if path.exists():
+                lock.release(remove=False)
+                continue
+            return path, lock
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def _run(self):
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                record = self._records.get(timeout=self.fsync_interval if dirty else None)
+            except queue.Empty:
+                record = False  # Quiet period: time to sync
+
+            if record is None:
+                break
+            if record:
+                self._write(record)
+                dirty = True
+
+            if dirty and time.monotonic() - last_sync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                last_sync = time.monotonic()
+                dirty = False
+
+        os.fsync(self._file.fileno())
+
+    def log_turn(self, student, teacher, **extra):
+        """Append a turn (returns immediately)"""
+        self.turns += 1
+        self._records.put({
+            "type": "turn",
+            "timestamp": datetime.now().isoformat(),
+            "student": student,
+            "teacher": teacher,
+            **extra
+        })
+
+    def close(self, compact=True):
+        """
+        End the session: flush, compact to session_*.json and apply retention
+
+        Returns:
+            Path of the saved session
+        """
+        self._records.put({"type": "end", "end_time": datetime.now().isoformat()})
+        self._records.put(None)
+        self._writer.join()
+        self._file.close()
+
+        path = self.path
+        if compact:
+            path = compact_journal(self.path)
+        self._lock.release()
+        prune_sessions(self.history_dir, self.max_sessions)
+        return path
+
+
+def compact_journal(path):
+    """
+    Turn a journal into the session_*.json format and delete the journal
+
+    Returns:
+        Path of the JSON file
+    """
+    path = Path(path)
+    header, turns, _ = read_journal(path)
+    session_data = {
+        "start_time": header.get("start_time"),
+        "end_time": header.get("end_time") or (turns[-1]["timestamp"] if turns else header.get("start_time")),
+        "student_level": header.get("student_level"),
+        "conversation": turns
+    }
+
+    json_path = path.with_suffix(".json")
+    temp_path = path.with_suffix(".json.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(session_data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, json_path)
+    path.unlink()
+    return json_path
+
+
+def find_interrupted(history_dir="history"):
+    """
+    Journals left behind by sessions that never ended, newest first
+
+    Journals still held open by a running session (another assistant
+    window) are skipped.
+
+    Returns:
+        List of paths
+    """
+    history_dir = Path(history_dir)
+    if not history_dir.exists():
+        return []
+    with os.scandir(history_dir) as entries:
+        journals = sorted((entry.path for entry in entries
+                           if entry.name.startswith("session_") and entry.name.endswith(".jsonl")),
+                          reverse=True)
+    return [Path(path) for path in journals if not journal_in_use(path)]
+
+
+def prune_sessions(history_dir="history", max_sessions=100):
+    """
+    Delete the oldest saved sessions beyond max_sessions
+
+    Names carry the start time, so sorting them sorts by age. A session's
+    audio folder (see history.save_audio) goes with it. Journals of running
+    or interrupted sessions are never deleted.
+
+    Returns:
+        Number of sessions deleted
+    """
+    if not max_sessions:
+        return 0
+    with os.scandir(history_dir) as entries:
+        sessions = sorted(entry.path for entry in entries
+                          if entry.name.startswith("session_") and entry.name.endswith(".json"))
+
+    excess = sessions[:max(0, len(sessions) - max_sessions)]
+    for path in excess:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        shutil.rmtree(os.path.splitext(path)[0], ignore_errors=True)
+    return len(excess)
@@ -3,22 +3,116 @@ LLM module using Ollama
 Handles conversation and provides corrections
 """
 
-import ollama
+import re
+import time
 from pathlib import Path
 
+from .background import BackgroundGate
+from .context import ConversationContext
+from .summary import SessionSummary
+from .tracing import tracer
+
+
+# A sentence ends at . ! ? (optionally followed by closing quotes/brackets) plus whitespace
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+# A ' touching a letter is an apostrophe (don't, students', 'cause), and one right
+# after . ! ? , ; : closes a quoted sentence that SENTENCE_END already keeps whole
+QUOTE = re.compile(r"\"|(?<![A-Za-zÀ-ÿ.!?,;:])'(?![A-Za-zÀ-ÿ])")
+
+
+def _open_quote(text):
+    """
+    Position of a quote left open in text, or -1
+
+    Apostrophes next to a letter (don't, students', 'cause) are not counted as quotes
+    """
+    open_at = {}
+    for match in QUOTE.finditer(text):
+        mark = match.group()
+        if mark in open_at:
+            del open_at[mark]
+        else:
+            open_at[mark] = match.start()
+    return max(open_at.values(), default=-1)
+
+
+def iter_sentences(tokens, min_chars=8, max_chars=300):
+    """
+    Group a stream of tokens into sentences
+
+    Closing quotes stay with their sentence, so bilingual segments like
+    'I went.' reach GoogleTTS._split_mixed_text in one chunk, and a
+    boundary inside a "double-quoted" span opened in the same sentence is
+    skipped. Apostrophes (don't, the students' book, 'cause) never hold a
+    boundary back.
+
+    Args:
+        tokens: Iterable of text fragments (e.g. from EnglishTeacher.chat_stream)
+        min_chars: Don't emit sentences shorter than this (merged with the next one)
+        max_chars: Split at the next boundary past this length, quotes or not
+
+    Yields:
+        Complete sentences, then whatever is left when the stream ends
+    """
+    buffer = ""
+    try:
+        for token in tokens:
+            buffer += token
+            search_from = 0
+            while True:
+                match = SENTENCE_END.search(buffer, search_from)
+                if not match:
+                    break
+                sentence = buffer[:match.end()].strip()
+                quoted = _open_quote(buffer[:match.end()]) >= search_from
+                if len(sentence) >= min_chars and (not quoted or len(sentence) >= max_chars):
+                    yield sentence
+                    buffer = buffer[match.end():]
+                    search_from = 0
+                else:
+                    search_from = match.end()
+
+        if buffer.strip():
+            yield buffer.strip()
+    finally:
+        # Closing the sentences closes the token stream (aborting generation)
+        close = getattr(tokens, "close", None)
+        if close:
+            close()
+
 
 class EnglishTeacher:
-    def __init__(self, model="llama3", temperature=0.7):
+    def __init__(self, model="llama3", temperature=0.7, context_turns=6, context_tokens=1500,
+                 keep_alive=None, response_cache=None):
         """
         Initialize the English teacher LLM
 
         Args:
             model: Ollama model name (llama3, mistral, phi3, etc.)
             temperature: Creativity level (0.0-1.0)
+            context_turns: Recent exchanges sent verbatim (older ones are summarized)
+            context_tokens: Prompt token budget per turn
+            keep_alive: How long Ollama keeps the model loaded ("30m", -1 = forever,
+                None = server default)
+            response_cache: Optional ResponseCache; repeated utterances are
+                answered from it without calling the LLM
         """
         self.model = model
         self.temperature = temperature
+        self.keep_alive = keep_alive
         self.conversation_history = []
+        # Background summaries hold off while the teacher is answering
+        self.background = BackgroundGate()
+        self.context = ConversationContext(model, max_turns=context_turns, token_budget=context_tokens,
+                                           keep_alive=keep_alive, gate=self.background)
+        self.session_summary = SessionSummary(model, keep_alive=keep_alive, gate=self.background)
+        self.last_prompt_tokens = 0
+        self.warmed_up = False
+        self.last_first_token = None  # Seconds from request to first token
+        self.response_cache = response_cache
+        self.last_cached = False  # The last reply came from the response cache
 
         # Load system prompt
         prompt_path = Path("prompts/teacher.txt")
@@ -29,6 +123,99 @@ class EnglishTeacher:
 
         print(f"✅ English teacher ready (model: {model})")
 
+    def _request_args(self):
+        """Extra arguments sent with every Ollama request"""
+        if self.keep_alive is None:
+            return {}
+        return {"keep_alive": self.keep_alive}
+
+    def warmup(self):
+        """
+        Load the model and pre-evaluate the system prompt
+
+        Ollama reuses the cached prompt prefix, so the first real turn only
+        evaluates the student's message.
+
+        Returns:
+            Seconds the warmup took
+        """
+        import ollama
+
+        start = time.perf_counter()
+        try:
+            response = ollama.chat(
+                model=self.model,
+                messages=[{"role": "system", "content": self.system_prompt}],
+                options={
+                    "temperature": self.temperature,
+                    "num_predict": 1
+                },
+                **self._request_args()
+            )
+        except Exception as e:
+            print(f"⚠️  Teacher warmup failed: {e}")
+            return None
+
+        elapsed = time.perf_counter() - start
+        load = response.get('load_duration', 0) / 1e9
+        self.warmed_up = True
+        print(f"🔥 Teacher warmed up in {elapsed:.1f}s (model load {load:.1f}s)")
+        return elapsed
+
+    def _start_turn(self, user_message):
+        """Add the student's message to history and build the prompt"""
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        messages = self.context.build_messages(self.system_prompt, self.conversation_history)
+        return messages, self.context.estimate(messages)
+
+    def _cache_context(self):
+        """What a reply depends on besides the utterance: model, prompt and the last exchange"""
+        recent = [message["content"] for message in self.conversation_history[-2:]]
+        return [self.model, self.system_prompt] + recent
+
+    def _cached_reply(self, user_message):
+        """
+        Answer from the response cache, if it has this utterance in this context
+
+        The turn is added to history like a generated one.
+
+        Returns:
+            The reply, or None on a miss (or without a cache)
+        """
+        self.last_cached = False
+        if self.response_cache is None:
+            return None
+
+        start = time.perf_counter()
+        reply, similarity = self.response_cache.lookup(user_message, self._cache_context())
+        if reply is None:
+            return None
+
+        tracer.record("cache", start, time.perf_counter(), similarity=similarity)
+        print("⚡ Teacher already knows this one (cached reply)")
+        self.last_cached = True
+        self.conversation_history.append({"role": "user", "content": user_message})
+        self.session_summary.update(user_message, reply)
+        self.conversation_history.append({"role": "assistant", "content": reply})
+        self.last_prompt_tokens = 0  # Nothing was sent
+        self.context.compact(self.conversation_history, self.system_prompt)
+        return reply
+
+    def _finish_turn(self, teacher_response, estimated_tokens, prompt_eval_count=None):
+        """Add the teacher's reply to history, record prompt size and trim old turns"""
+        self.session_summary.update(self.conversation_history[-1]['content'], teacher_response)
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": teacher_response
+        })
+
+        self.last_prompt_tokens = self.context.record_usage(estimated_tokens, prompt_eval_count)
+        self.context.compact(self.conversation_history, self.system_prompt)
+
     def chat(self, user_message):
         """
         Send message to the teacher and get response
@@ -39,75 +226,190 @@ class EnglishTeacher:
         Returns:
             Teacher's response with corrections
         """
-        # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        import ollama
+
+        cached = self._cached_reply(user_message)
+        if cached is not None:
+            return cached
 
-        # Prepare messages for API
-        messages = [
-            {"role": "system", "content": self.system_prompt}
-        ] + self.conversation_history
+        cache_context = self._cache_context()
+        messages, estimated_tokens = self._start_turn(user_message)
 
         # Get response from Ollama
         print("🤔 Teacher is thinking...")
-        response = ollama.chat(
+        start = time.perf_counter()
+        with self.background.paused():
+            response = ollama.chat(
+                model=self.model,
+                messages=messages,
+                options={
+                    "temperature": self.temperature,
+                    "num_predict": 500
+                },
+                **self._request_args()
+            )
+
+        teacher_response = response['message']['content']
+        end = time.perf_counter()
+        # No token timestamps without streaming: split at Ollama's own eval time
+        self._trace(start, end - (response.get('eval_duration') or 0) / 1e9, end, response)
+        self._finish_turn(teacher_response, estimated_tokens, response.get('prompt_eval_count'))
+        if self.response_cache is not None:
+            self.response_cache.store(user_message, cache_context, teacher_response)
+
+        return teacher_response
+
+    def chat_stream(self, user_message, cancel_event=None):
+        """
+        Send message to the teacher and stream the response
+
+        The full reply is added to conversation_history once generation
+        finishes (or the stream is closed early).
+
+        Args:
+            user_message: What the student said
+            cancel_event: Optional threading.Event; generation is aborted
+                at the next token once it is set
+
+        Yields:
+            Response tokens as Ollama generates them
+        """
+        import ollama
+
+        cached = self._cached_reply(user_message)
+        if cached is not None:
+            yield cached
+            return
+
+        cache_context = self._cache_context()
+        messages, estimated_tokens = self._start_turn(user_message)
+
+        print("🤔 Teacher is thinking...")
+        start = time.perf_counter()
+        stream = ollama.chat(
             model=self.model,
             messages=messages,
+            stream=True,
             options={
                 "temperature": self.temperature,
                 "num_predict": 500
-            }
+            },
+            **self._request_args()
         )
 
-        teacher_response = response['message']['content']
+        parts = []
+        final = {}
+        first_token = None
+        self.last_first_token = None
+        try:
+            with self.background.paused():
+                for chunk in stream:
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    token = chunk['message']['content']
+                    if token:
+                        if first_token is None:
+                            first_token = time.perf_counter()
+                            self._log_first_token(first_token - start)
+                        parts.append(token)
+                        yield token
+                    if chunk.get('done'):
+                        final = chunk  # Carries Ollama's token counters
+        finally:
+            # Stopping early drops the HTTP stream, which makes Ollama abort the request
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            end = time.perf_counter()
+            self._trace(start, first_token or end, end, final, cancelled=not final)
+            self._finish_turn("".join(parts), estimated_tokens, final.get('prompt_eval_count'))
+            if final and self.response_cache is not None:
+                # Only complete replies are worth repeating
+                self.response_cache.store(user_message, cache_context, "".join(parts))
 
-        # Add to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": teacher_response
-        })
+    def _trace(self, start, first_token, end, counters, cancelled=False):
+        """
+        Record prompt evaluation and generation spans
 
-        return teacher_response
+        Args:
+            start: When the request was sent
+            first_token: When the first token arrived
+            end: When the reply was complete
+            counters: Ollama's final response (prompt_eval_count, eval_count, ...)
+            cancelled: The stream was stopped before Ollama finished
+        """
+        if not tracer.enabled:
+            return
+        eval_count = counters.get('eval_count')
+        eval_seconds = (counters.get('eval_duration') or 0) / 1e9
+        tracer.record("prompt_eval", start, first_token, tokens=counters.get('prompt_eval_count'))
+        attrs = {"tokens": eval_count}
+        if eval_count and eval_seconds:
+            attrs["tokens_per_second"] = round(eval_count / eval_seconds, 1)
+        if cancelled:
+            attrs["cancelled"] = True
+        tracer.record("generation", first_token, end, **attrs)
+
+    def truncate_last_reply(self, spoken_text):
+        """
+        Replace the last teacher reply with the part that was actually spoken
+
+        Used after a barge-in, so the history matches what the student heard.
+        """
+        for message in reversed(self.conversation_history):
+            if message["role"] == "assistant":
+                message["content"] = spoken_text
+                self.session_summary.amend(spoken_text)
+                return
+
+    def _log_first_token(self, seconds):
+        """Remember time to first token; the first turn is labelled cold or warm"""
+        first_turn = self.last_first_token is None and len(self.context.prompt_tokens) == 0
+        self.last_first_token = seconds
+        if first_turn:
+            state = "warm" if self.warmed_up else "cold"
+            print(f"⏱️  First token in {seconds:.2f}s ({state} start)")
 
     def reset_conversation(self):
         """Start a new conversation"""
         self.conversation_history = []
+        self.context.reset()
+        self.session_summary.reset()
         print("🔄 Conversation reset")
 
-    def get_conversation_summary(self):
+    def restore(self, turns):
         """
-        Get a summary of the conversation for review
+        Continue an earlier conversation (e.g. an interrupted session)
 
-        Returns:
-            Summary of what was practiced
+        Args:
+            turns: Dicts with "student" and "teacher" keys, oldest first
         """
-        if not self.conversation_history:
-            return "No conversation yet."
+        for turn in turns:
+            self.conversation_history.append({"role": "user", "content": turn["student"]})
+            self.conversation_history.append({"role": "assistant", "content": turn["teacher"]})
+            self.session_summary.update(turn["student"], turn["teacher"])
+        self.context.compact(self.conversation_history, self.system_prompt)
 
-        summary_prompt = """
-        Based on this conversation, provide a brief summary:
-        1. Main topics discussed
-        2. Common mistakes made
-        3. Areas for improvement
-        4. Positive points
+    def close(self):
+        """Stop the background summary workers (e.g. when a server session ends)"""
+        self.context.close()
+        self.session_summary.close()
 
-        Keep it concise and encouraging.
+    def get_conversation_summary(self):
         """
+        Get a summary of the conversation for review
 
-        messages = [
-            {"role": "system", "content": "You are an English teacher providing conversation feedback."}
-        ] + self.conversation_history + [
-            {"role": "user", "content": summary_prompt}
-        ]
+        The summary is kept up to date in the background after every turn,
+        so this returns immediately.
 
-        response = ollama.chat(
-            model=self.model,
-            messages=messages
-        )
+        Returns:
+            Summary of what was practiced
+        """
+        summary = self.session_summary
+        if not summary.turns and not summary.pending and not summary.failed:
+            return "No conversation yet."
 
-        return response['message']['content']
+        return summary.render()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,308 @@
+"""
+Asynchronous turn pipeline
+Capture, transcription, generation, synthesis and playback run as separate
+asyncio stages joined by bounded queues
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .llm import iter_sentences
+
+
+class EndOfTurn:
+    """Marker sent down the queues after the last sentence of a turn"""
+    def __init__(self, turn, student):
+        self.turn = turn
+        self.student = student
+
+
+class TurnPipeline:
+    """
+    One conversation as a chain of asyncio stages
+
+        capture -> transcribe -> generate -> synthesize -> playback
+
+    Every stage runs its blocking work (Whisper, Ollama, TTS, audio
+    output) on its own single-thread executor, and capture (microphone,
+    Enter key) on a daemon thread, so stages overlap:
+    sentence N+1 is generated and synthesized while sentence N plays.
+    Queues are bounded, so a slow stage applies backpressure upstream
+    instead of buffering without limit. Capture for the next turn starts
+    once the current reply has finished playing.
+    """
+    STAGES = ("transcribe", "generate", "synthesize", "playback")
+
+    def __init__(self, stt, teacher, tts, capture, queue_size=2,
+                 handle_transcript=None, on_event=None):
+        """
+        Args:
+            stt: SpeechToText (transcribe)
+            teacher: EnglishTeacher (chat_stream)
+            tts: TTS engine (synthesize/play, or just speak)
+            capture: Blocking callable returning the next utterance as audio
+            queue_size: Capacity of each inter-stage queue
+            handle_transcript: Optional callable(text) -> None to answer,
+                "skip" to ignore the utterance or "stop" to end the session
+            on_event: Optional callable(kind, data) for "transcript",
+                "sentence", "turn", "empty" and "error" events
+        """
+        self.stt = stt
+        self.teacher = teacher
+        self.tts = tts
+        self.capture = capture
+        self.queue_size = queue_size
+        self.handle_transcript = handle_transcript
+        self.on_event = on_event
+
+        self.loop = None
+        self._executors = {}
+        self._tasks = []
+        self._turn = 0
+        self._cancelled = set()
+        self._generation_cancel = threading.Event()
+        self._spoken = {}
+
+    # ---- lifecycle -------------------------------------------------------
+
+    async def run(self):
+        """Run the pipeline until stop() is called or a stage asks to stop"""
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._turn_idle = asyncio.Event()
+        self._turn_idle.set()
+
+        self.audio_queue = asyncio.Queue(self.queue_size)
+        self.text_queue = asyncio.Queue(self.queue_size)
+        self.sentence_queue = asyncio.Queue(self.queue_size)
+        self.clip_queue = asyncio.Queue(self.queue_size)
+
+        self._executors = {
+            stage: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pipeline-{stage}")
+            for stage in self.STAGES
+        }
+        self._tasks = [
+            asyncio.create_task(self._capture_stage(), name="capture"),
+            asyncio.create_task(self._transcribe_stage(), name="transcribe"),
+            asyncio.create_task(self._generate_stage(), name="generate"),
+            asyncio.create_task(self._synthesize_stage(), name="synthesize"),
+            asyncio.create_task(self._playback_stage(), name="playback"),
+        ]
+
+        try:
+            await self._stopped.wait()
+        finally:
+            self._generation_cancel.set()
+            self._stop_playback()
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            for executor in self._executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        """Stop the pipeline (safe to call from any thread)"""
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._stopped.set)
+
+    def cancel_turn(self):
+        """
+        Abandon the turn in flight (safe to call from any thread)
+
+        Generation is aborted, queued sentences are dropped and playback
+        stops; the turn still completes with the sentences already spoken.
+        """
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._cancel_current_turn)
+
+    def _cancel_current_turn(self):
+        self._cancelled.add(self._turn)
+        self._generation_cancel.set()
+        self._stop_playback()
+
+    # ---- helpers ---------------------------------------------------------
+
+    async def _run(self, stage, func, *args):
+        """Run blocking work on the stage's executor"""
+        return await self.loop.run_in_executor(self._executors[stage], func, *args)
+
+    async def _run_daemon(self, name, func, *args):
+        """
+        Run blocking work that may never return on a daemon thread
+
+        Executor threads are joined when the interpreter exits, so one stuck
+        in input() or a long recording would keep Ctrl+C from quitting.
+        A daemon thread is simply abandoned.
+        """
+        loop = self.loop
+        future = loop.create_future()
+
+        def deliver(result, error):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def target():
+            result, error = None, None
+            try:
+                result = func(*args)
+            except BaseException as e:
+                error = e
+            try:
+                loop.call_soon_threadsafe(deliver, result, error)
+            except RuntimeError:
+                pass  # The loop is already closed: nobody is waiting
+
+        threading.Thread(target=target, name=f"pipeline-{name}", daemon=True).start()
+        return await future
+
+    def _emit(self, kind, data=None):
+        if self.on_event:
+            self.on_event(kind, data)
+
+    def _stop_playback(self):
+        if hasattr(self.tts, "stop"):
+            self.tts.stop()
+
+    def _synthesize(self, sentence):
+        if hasattr(self.tts, "synthesize"):
+            return self.tts.synthesize(sentence)
+        return sentence
+
+    def _play(self, clip):
+        if hasattr(self.tts, "play"):
+            self.tts.play(clip)
+        else:
+            self.tts.speak(clip)
+
+    def _finish_turn(self, turn):
+        self._cancelled.discard(turn)
+        self._spoken.pop(turn, None)
+        self._turn_idle.set()
+
+    # ---- stages ----------------------------------------------------------
+
+    async def _capture_stage(self):
+        while True:
+            await self._turn_idle.wait()
+
+            try:
+                audio = await self._run_daemon("capture", self.capture)
+            except EOFError:
+                # The audio source ran out (e.g. replayed recordings): finish the turn, then stop
+                await self._turn_idle.wait()
+                self._stopped.set()
+                return
+            except Exception as e:
+                self._emit("error", e)
+                continue
+
+            if audio is None or len(audio) == 0:
+                self._emit("empty")
+                continue
+
+            self._turn += 1
+            self._turn_idle.clear()
+            await self.audio_queue.put((self._turn, audio))
+
+    async def _transcribe_stage(self):
+        while True:
+            turn, audio = await self.audio_queue.get()
+            try:
+                text = await self._run("transcribe", self.stt.transcribe, audio)
+            except Exception as e:
+                self._emit("error", e)
+                self._finish_turn(turn)
+                continue
+
+            self._emit("transcript", text)
+
+            action = None
+            if self.handle_transcript:
+                # May speak (e.g. the farewell), so it runs on the playback thread
+                action = await self._run("playback", self.handle_transcript, text)
+
+            if action == "stop":
+                self._stopped.set()
+                return
+            if action == "skip":
+                self._finish_turn(turn)
+                continue
+
+            await self.text_queue.put((turn, text))
+
+    async def _generate_stage(self):
+        while True:
+            turn, text = await self.text_queue.get()
+            self._generation_cancel.clear()
+            if turn in self._cancelled:
+                await self.sentence_queue.put(EndOfTurn(turn, text))
+                continue
+
+            cancel = self._generation_cancel
+            loop = self.loop
+
+            def produce():
+                tokens = self.teacher.chat_stream(text, cancel_event=cancel)
+                try:
+                    for sentence in iter_sentences(tokens):
+                        if cancel.is_set():
+                            break
+                        # Blocks while the queue is full (backpressure)
+                        asyncio.run_coroutine_threadsafe(
+                            self.sentence_queue.put((turn, sentence)), loop
+                        ).result()
+                finally:
+                    # Closing the stream aborts the Ollama request
+                    tokens.close()
+
+            try:
+                await self._run("generate", produce)
+            except Exception as e:
+                self._emit("error", e)
+            await self.sentence_queue.put(EndOfTurn(turn, text))
+
+    async def _synthesize_stage(self):
+        while True:
+            item = await self.sentence_queue.get()
+            if isinstance(item, EndOfTurn):
+                await self.clip_queue.put(item)
+                continue
+
+            turn, sentence = item
+            if turn in self._cancelled:
+                continue
+            try:
+                clip = await self._run("synthesize", self._synthesize, sentence)
+            except Exception as e:
+                self._emit("error", e)
+                continue
+            await self.clip_queue.put((turn, sentence, clip))
+
+    async def _playback_stage(self):
+        while True:
+            item = await self.clip_queue.get()
+            if isinstance(item, EndOfTurn):
+                self._emit("turn", {
+                    "student": item.student,
+                    "teacher": " ".join(self._spoken.get(item.turn, [])),
+                    "interrupted": item.turn in self._cancelled,
+                })
+                self._finish_turn(item.turn)
+                continue
+
+            turn, sentence, clip = item
+            if turn in self._cancelled:
+                continue
+            self._emit("sentence", sentence)
+            try:
+                await self._run("playback", self._play, clip)
+            except Exception as e:
+                self._emit("error", e)
+            if turn not in self._cancelled:
+                # Only sentences played to the end count as spoken
+                self._spoken.setdefault(turn, []).append(sentence)
@@ -0,0 +1,194 @@
+"""
+Response cache for the teacher
+Answers utterances the student keeps repeating ("hello", "I don't
+understand", the same drill sentence) without calling the LLM
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import numpy as np
+
+
+FILLERS = {"um", "uh", "uhm", "er", "erm", "ah", "hmm", "mm"}
+
+
+def normalize_utterance(text):
+    """
+    Normalize a transcript so trivially different takes share an entry
+
+    Case, punctuation, spacing and filler words ("um", "uh") are dropped.
+    """
+    text = unicodedata.normalize("NFKC", text).lower().replace("’", "'")
+    words = re.findall(r"[\w']+", text)
+    return " ".join(word for word in words if word not in FILLERS)
+
+
+class ResponseCache:
+    """
+    LRU cache of teacher replies with expiry
+
+    Keys are the normalized utterance plus a fingerprint of the context it
+    was said in (model, prompt and the last messages), so "can you repeat?"
+    only reuses a reply given after the same teacher question.
+
+    With an Ollama embedding model, a miss also looks for a near-duplicate
+    utterance in the same context (cosine similarity >= `similarity`).
+    The embedding is waited for at most `embed_timeout` seconds, so a slow
+    embedding model never delays the reply by more than that.
+    """
+    def __init__(self, max_items=256, ttl=3600, similarity=0.92, embed_model=None, enabled=True,
+                 embed_timeout=0.15):
+        """
+        Args:
+            max_items: Entries kept (least recently used are evicted)
+            ttl: Seconds an entry stays valid (None = forever)
+            similarity: Cosine similarity needed for a near-duplicate hit
+            embed_model: Ollama embedding model (e.g. "nomic-embed-text");
+                None = exact matches only
+            enabled: If False, every lookup misses and nothing is stored
+            embed_timeout: Seconds a lookup waits for the embedding before
+                giving up on near-duplicates (it still finishes in the
+                background and is stored with the reply)
+        """
+        self.enabled = enabled
+        self.max_items = max_items
+        self.ttl = ttl
+        self.similarity = similarity
+        self.embed_model = embed_model
+        self.embed_timeout = embed_timeout
+
+        self._entries = OrderedDict()  # (fingerprint, utterance) -> (reply, created, vector)
+        self._lock = threading.Lock()
+        self._vectors = {}  # utterance -> embedding, for the store() after a miss
+        self._embedder = ThreadPoolExecutor(max_workers=2, thread_name_prefix="embed")
+
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.slow_embeddings = 0  # Lookups that gave up waiting for the embedding
+
+    @staticmethod
+    def fingerprint(context):
+        """
+        Hash of the context a reply depends on
+
+        Args:
+            context: List of strings (model, system prompt, recent messages)
+        """
+        payload = json.dumps([normalize_utterance(part) for part in context], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _embed(self, utterance):
+        """Embedding of an utterance (unit length), None without a model or on error"""
+        if not self.embed_model or not utterance:
+            return None
+        vector = self._vectors.get(utterance)
+        if vector is not None:
+            return vector
+
+        import ollama
+        try:
+            if hasattr(ollama, "embed"):
+                values = ollama.embed(model=self.embed_model, input=utterance)["embeddings"][0]
+            else:
+                values = ollama.embeddings(model=self.embed_model, prompt=utterance)["embedding"]
+        except Exception as e:
+            print(f"⚠️  Embeddings unavailable ({e}) - exact matches only")
+            self.embed_model = None
+            return None
+
+        vector = np.asarray(values, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        if len(self._vectors) > self.max_items:
+            self._vectors.clear()
+        self._vectors[utterance] = vector
+        return vector
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def lookup(self, text, context):
+        """
+        Find a reply for this utterance in this context
+
+        Returns:
+            (reply, similarity) on a hit - similarity is 1.0 for exact
+            matches - or (None, None) on a miss
+        """
+        if not self.enabled:
+            return None, None
+
+        utterance = normalize_utterance(text)
+        if not utterance:
+            return None, None
+        fingerprint = self.fingerprint(context)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get((fingerprint, utterance))
+            if entry is not None and not self._expired(entry[1], now):
+                self._entries.move_to_end((fingerprint, utterance))
+                self.hits += 1
+                return entry[0], 1.0
+
+        # Near-duplicates (embedding computed outside the lock, time-boxed)
+        vector = None
+        if self.embed_model:
+            try:
+                vector = self._embedder.submit(self._embed, utterance).result(timeout=self.embed_timeout)
+            except FutureTimeout:
+                self.slow_embeddings += 1
+        best_key, best_score = None, self.similarity
+        with self._lock:
+            if vector is not None:
+                for key, (_, created, other) in self._entries.items():
+                    if key[0] != fingerprint or other is None or self._expired(created, now):
+                        continue
+                    score = float(np.dot(vector, other))
+                    if score >= best_score:
+                        best_key, best_score = key, score
+            if best_key is None:
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            self.near_hits += 1
+            return self._entries[best_key][0], round(best_score, 3)
+
+    def store(self, text, context, reply):
+        """Remember the reply the LLM gave to this utterance in this context"""
+        if not self.enabled or not reply:
+            return
+
+        utterance = normalize_utterance(text)
+        if not utterance:
+            return
+        key = (self.fingerprint(context), utterance)
+        vector = self._vectors.get(utterance) if self.embed_model else None
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (reply, now, vector)
+            self._entries.move_to_end(key)
+            for stale in [old for old, entry in self._entries.items() if self._expired(entry[1], now)]:
+                del self._entries[stale]
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "slow_embeddings": self.slow_embeddings,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "items": len(self._entries),
+        }
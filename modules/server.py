@@ -0,0 +1,367 @@
+"""
+Multi-session server
+Many students on one machine share one Whisper model, one TTS engine and
+one Ollama server; each session keeps its own teacher (history)
+
+Protocol (WebSocket, one connection per student):
+
+    client -> server
+        binary                      Microphone audio, int16 little-endian, 16 kHz mono
+        {"type": "hello", "mode": "manual" | "auto"}
+                                    auto = the server detects the end of each answer
+        {"type": "end"}             End of the answer (manual mode)
+        {"type": "cancel"}          Stop the current reply (barge-in)
+
+    server -> client
+        {"type": "ready", "session": id}
+        {"type": "transcript", "text": ...}
+        {"type": "sentence", "text": ...}
+        {"type": "audio", "format": "pcm_s16le" | "mp3", "sample_rate": n}
+                                    followed by one binary message with the audio
+        {"type": "turn", "student": ..., "teacher": ..., "interrupted": bool}
+        {"type": "error", "message": ...}
+
+GET /status returns the server stats as JSON.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http import HTTPStatus
+
+import numpy as np
+
+from .audio_buffer import RingBuffer
+from .llm import iter_sentences
+from .vad import Endpointer
+
+try:
+    from websockets.asyncio.server import serve
+except ImportError:
+    serve = None
+
+
+def encode_audio(clip, sample_rate=None):
+    """
+    Turn TTS synthesize() output into messages for the client
+
+    Args:
+        clip: Raw int16 PCM bytes (Piper), (samples, samplerate) tuples
+            (espeak, decoded Google TTS), a list of those or of MP3 bytes
+            (Google TTS), or text (macOS say - nothing to send)
+        sample_rate: Sample rate of raw PCM bytes
+
+    Returns:
+        List of (header dict, payload bytes)
+    """
+    if clip is None or isinstance(clip, str):
+        return []
+    if isinstance(clip, bytes):
+        return [({"format": "pcm_s16le", "sample_rate": sample_rate}, clip)] if clip else []
+    if isinstance(clip, tuple):
+        samples, samplerate = clip
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        return [({"format": "pcm_s16le", "sample_rate": samplerate}, pcm)]
+
+    messages = []
+    for segment in clip:
+        if isinstance(segment, bytes):
+            messages.append(({"format": "mp3", "sample_rate": None}, segment))
+        else:
+            messages.extend(encode_audio(segment))
+    return messages
+
+
+class SharedTranscriber:
+    """
+    One Whisper model behind a request queue
+
+    Requests wait in the executor's FIFO queue; `workers` of them run at
+    once (load the model with num_workers=workers so they really run in
+    parallel). Memory stays at one model however many sessions there are.
+    """
+    def __init__(self, stt, workers=2):
+        """
+        Args:
+            stt: SpeechToText whose model is shared
+            workers: Transcriptions running at the same time
+        """
+        self.stt = stt
+        self.workers = workers
+        self.pending = 0  # Requests queued or running (event loop thread only)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+
+    async def transcribe(self, audio):
+        """Transcribe float32 16 kHz audio (waits for a free worker)"""
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, self.stt.transcribe, audio
+            )
+        finally:
+            self.pending -= 1
+
+
+class Session:
+    """One connected student: own teacher, own audio buffer, own output stream"""
+    def __init__(self, server, websocket, session_id):
+        self.server = server
+        self.websocket = websocket
+        self.id = session_id
+        self.teacher = server.teacher_factory()
+        self.mode = "manual"
+        self.turns = 0
+
+        sample_rate = server.sample_rate
+        self.buffer = RingBuffer(int(server.max_recording * sample_rate))
+        self.endpointer = Endpointer(sample_rate, **server.vad_config)
+        self._processed = 0
+        self._cancel = threading.Event()
+        self._turn_task = None
+
+    async def send(self, kind, **data):
+        await self.websocket.send(json.dumps({"type": kind, **data}, ensure_ascii=False))
+
+    async def run(self):
+        """Handle messages until the client disconnects"""
+        await self.send("ready", session=self.id)
+        try:
+            async for message in self.websocket:
+                if isinstance(message, bytes):
+                    await self.on_audio(message)
+                else:
+                    await self.on_control(json.loads(message))
+        finally:
+            await self.cancel_turn()
+            self.teacher.close()
+
+    async def on_control(self, message):
+        kind = message.get("type")
+        if kind == "hello":
+            self.mode = message.get("mode", "manual")
+        elif kind == "end":
+            await self.end_of_answer()
+        elif kind == "cancel":
+            self._cancel.set()
+
+    async def on_audio(self, data):
+        samples = np.frombuffer(data[:len(data) - len(data) % 2], dtype="<i2")
+        self.buffer.write(samples.astype(np.float32) / 32768.0)
+        if self.mode != "auto":
+            return
+
+        # Server-side endpointing on whole frames
+        frame = self.endpointer.frame_size
+        usable = (self.buffer.written - self._processed) // frame * frame
+        if usable:
+            audio = self.buffer.read(self._processed, self._processed + usable)
+            self._processed += usable
+            if self.endpointer.process(audio):
+                await self.end_of_answer()
+
+    async def end_of_answer(self):
+        """Take the buffered answer and start a turn with it"""
+        end = self.buffer.written
+        if self.mode == "auto" and self.endpointer.speech_end is not None:
+            end = min(end, self.endpointer.speech_end + int(0.3 * self.server.sample_rate))
+        audio = self.buffer.read(self.buffer.oldest, end).copy()
+
+        self.buffer.reset()
+        self.endpointer.reset()
+        self._processed = 0
+        if len(audio) == 0:
+            return
+
+        # A new answer interrupts the reply still in progress
+        await self.cancel_turn()
+        self._cancel = threading.Event()
+        self._turn_task = asyncio.create_task(self.turn(audio, self._cancel))
+
+    async def cancel_turn(self):
+        if self._turn_task is not None and not self._turn_task.done():
+            self._cancel.set()
+            await asyncio.gather(self._turn_task, return_exceptions=True)
+        self._turn_task = None
+
+    async def turn(self, audio, cancel):
+        """Transcribe, generate and synthesize one exchange"""
+        server = self.server
+        loop = asyncio.get_running_loop()
+        begin = time.perf_counter()
+        try:
+            text = await server.transcriber.transcribe(audio)
+            await self.send("transcript", text=text)
+            if not text:
+                return
+
+            sentences = asyncio.Queue(2)
+
+            def put(item):
+                # Blocks while the queue is full (backpressure), but gives up
+                # once the turn is cancelled so the worker is never stuck here
+                future = asyncio.run_coroutine_threadsafe(sentences.put(item), loop)
+                while True:
+                    try:
+                        return future.result(timeout=0.1)
+                    except FutureTimeout:
+                        if cancel.is_set():
+                            future.cancel()
+                            return
+
+            def produce():
+                tokens = self.teacher.chat_stream(text, cancel_event=cancel)
+                try:
+                    for sentence in iter_sentences(tokens):
+                        if cancel.is_set():
+                            break
+                        put(sentence)
+                finally:
+                    tokens.close()
+                    put(None)
+
+            producer = loop.run_in_executor(server.llm_pool, produce)
+
+            spoken = []
+            finished = False
+            try:
+                while True:
+                    sentence = await sentences.get()
+                    if sentence is None:
+                        finished = True
+                        break
+                    if cancel.is_set():
+                        continue  # Drain so the producer can finish
+                    clip = await loop.run_in_executor(server.tts_pool, server.tts.synthesize, sentence)
+                    if cancel.is_set():
+                        continue
+                    await self.send("sentence", text=sentence)
+                    for header, payload in encode_audio(clip, getattr(server.tts, "sample_rate", None)):
+                        await self.send("audio", **header)
+                        await self.websocket.send(payload)
+                    spoken.append(sentence)
+            finally:
+                if not finished:
+                    # Client gone (or task cancelled): stop generating and free the worker
+                    cancel.set()
+                    while not sentences.empty():
+                        sentences.get_nowait()
+                    await asyncio.shield(producer)
+
+            await producer
+            teacher_response = " ".join(spoken)
+            if cancel.is_set():
+                # Keep only what was sent to the student
+                self.teacher.truncate_last_reply(teacher_response)
+
+            self.turns += 1
+            server.record_turn(time.perf_counter() - begin)
+            await self.send("turn", student=text, teacher=teacher_response,
+                            interrupted=cancel.is_set())
+        except Exception as e:
+            server.errors += 1
+            try:
+                await self.send("error", message=str(e))
+            except Exception:
+                pass  # Client already gone
+
+
+class SessionServer:
+    """
+    WebSocket server hosting many practice sessions on one machine
+
+    Shared: the Whisper model (behind SharedTranscriber), the TTS engine
+    and the Ollama server. Per session: an EnglishTeacher from
+    teacher_factory, an audio buffer and the connection.
+    """
+    def __init__(self, stt, tts, teacher_factory, host="127.0.0.1", port=8765,
+                 whisper_workers=2, max_sessions=20, vad_config=None, max_recording=60):
+        """
+        Args:
+            stt: SpeechToText (its model is shared by all sessions)
+            tts: TTS engine shared by all sessions (synthesize)
+            teacher_factory: Callable returning a new EnglishTeacher per session
+            host: Interface to listen on
+            port: Port to listen on
+            whisper_workers: Transcriptions running at the same time
+            max_sessions: Connections refused beyond this
+            vad_config: Endpointer settings for sessions in auto mode
+            max_recording: Longest answer kept per session, in seconds
+        """
+        if serve is None:
+            raise ImportError("websockets>=13 not installed. Install with: pip install websockets")
+
+        self.stt = stt
+        self.tts = tts
+        self.teacher_factory = teacher_factory
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.vad_config = vad_config or {}
+        self.max_recording = max_recording
+        self.sample_rate = stt.sample_rate
+
+        self.transcriber = SharedTranscriber(stt, workers=whisper_workers)
+        # Generation threads mostly wait on Ollama, so one per session
+        self.llm_pool = ThreadPoolExecutor(max_workers=max_sessions, thread_name_prefix="llm")
+        self.tts_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="tts")
+
+        self.sessions = {}
+        self.turns = 0
+        self.errors = 0
+        self.turn_seconds = 0.0
+        self.started = time.perf_counter()
+        self._ids = itertools.count(1)
+
+    def record_turn(self, seconds):
+        self.turns += 1
+        self.turn_seconds += seconds
+
+    def stats(self):
+        """
+        Server statistics
+
+        Returns:
+            Dict with sessions, turns, turns_per_second, average turn time,
+            queued transcriptions and errors
+        """
+        uptime = time.perf_counter() - self.started
+        return {
+            "sessions": len(self.sessions),
+            "turns": self.turns,
+            "turns_per_second": round(self.turns / uptime, 3) if uptime else 0.0,
+            "avg_turn_seconds": round(self.turn_seconds / self.turns, 2) if self.turns else None,
+            "transcriptions_pending": self.transcriber.pending,
+            "errors": self.errors,
+        }
+
+    def _process_request(self, connection, request):
+        """Plain HTTP: /status (anything else goes on to the WebSocket handshake)"""
+        if request.path == "/status":
+            return connection.respond(HTTPStatus.OK, json.dumps(self.stats()) + "\n")
+        return None
+
+    async def _handle(self, websocket):
+        if len(self.sessions) >= self.max_sessions:
+            await websocket.close(1013, "Server full, try again later")
+            return
+
+        session_id = next(self._ids)
+        session = Session(self, websocket, session_id)
+        self.sessions[session_id] = session
+        print(f"👋 Session {session_id} connected ({len(self.sessions)} active)")
+        try:
+            await session.run()
+        finally:
+            del self.sessions[session_id]
+            print(f"🚪 Session {session_id} left after {session.turns} turn(s)")
+
+    async def serve_forever(self):
+        """Run until cancelled"""
+        async with serve(self._handle, self.host, self.port,
+                         process_request=self._process_request, max_size=2 ** 22):
+            print(f"🌐 Listening on ws://{self.host}:{self.port} (status: http://{self.host}:{self.port}/status)")
+            await asyncio.get_running_loop().create_future()
@@ -0,0 +1,291 @@
+"""
+Session index
+SQLite index of every saved session, for reports across sessions
+"""
+
+import csv
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    file TEXT UNIQUE NOT NULL,
+    start_time TEXT,
+    end_time TEXT,
+    student_level TEXT,
+    turns INTEGER
+);
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER,
+    timestamp TEXT,
+    student TEXT,
+    teacher TEXT,
+    outcome TEXT
+);
+CREATE TABLE IF NOT EXISTS corrections (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    turn_id INTEGER NOT NULL REFERENCES turns(id) ON DELETE CASCADE,
+    timestamp TEXT,
+    original TEXT,
+    correction TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions(start_time);
+CREATE INDEX IF NOT EXISTS turns_session ON turns(session_id);
+CREATE INDEX IF NOT EXISTS turns_time ON turns(timestamp);
+CREATE INDEX IF NOT EXISTS corrections_text ON corrections(correction COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS corrections_time ON corrections(timestamp);
+"""
+
+# How the teacher opens each kind of reply (see prompts/teacher.txt)
+OUTCOMES = (
+    ("correction", re.compile(r"^\W*(quase|o certo é|falta)", re.IGNORECASE)),
+    ("correct", re.compile(r"^\W*(perfeito|muito bem|ótimo|isso)", re.IGNORECASE)),
+    ("unclear", re.compile(r"^\W*não entendi", re.IGNORECASE)),
+)
+QUOTED = re.compile(r"['\"‘“]([^'\"’”]+)['\"’”]")
+
+
+def classify_reply(teacher):
+    """
+    What the teacher did in a reply
+
+    Returns:
+        "correction", "correct", "unclear" or None
+    """
+    for outcome, pattern in OUTCOMES:
+        if pattern.search(teacher):
+            return outcome
+    return None
+
+
+def extract_correction(teacher):
+    """
+    The corrected sentence in a correction reply ("Quase! O certo é 'I am tired'")
+
+    Returns:
+        The longest quoted phrase, or None
+    """
+    quoted = QUOTED.findall(teacher)
+    return max(quoted, key=len).strip() if quoted else None
+
+
+class SessionIndex:
+    """
+    Embedded SQLite index of sessions, turns and corrections
+
+    Sessions are added as they are saved (and backfilled from old files),
+    so reports are indexed queries instead of parsing every file. The index
+    keeps sessions whose files were already removed by max_sessions.
+    """
+    def __init__(self, db_path="history/sessions.db"):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ---- loading ---------------------------------------------------------
+
+    def add_session(self, path, session_data=None):
+        """
+        Index one saved session (replaces it if already indexed)
+
+        Args:
+            path: session_*.json file
+            session_data: Parsed file contents (read from path if omitted)
+
+        Returns:
+            Session id
+        """
+        path = Path(path)
+        if session_data is None:
+            with open(path, encoding="utf-8") as f:
+                session_data = json.load(f)
+        conversation = session_data.get("conversation", [])
+
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE file = ?", (path.name,))
+            session_id = self.conn.execute(
+                "INSERT INTO sessions (file, start_time, end_time, student_level, turns) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path.name, session_data.get("start_time"), session_data.get("end_time"),
+                 session_data.get("student_level"), len(conversation))
+            ).lastrowid
+
+            for position, turn in enumerate(conversation):
+                teacher = turn.get("teacher", "")
+                outcome = classify_reply(teacher)
+                turn_id = self.conn.execute(
+                    "INSERT INTO turns (session_id, position, timestamp, student, teacher, outcome) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, position, turn.get("timestamp"), turn.get("student", ""), teacher, outcome)
+                ).lastrowid
+
+                correction = extract_correction(teacher) if outcome == "correction" else None
+                if correction:
+                    self.conn.execute(
+                        "INSERT INTO corrections (session_id, turn_id, timestamp, original, correction) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (session_id, turn_id, turn.get("timestamp"), turn.get("student", ""), correction)
+                    )
+        return session_id
+
+    def backfill(self, history_dir="history"):
+        """
+        Index session files not indexed yet
+
+        Returns:
+            Number of sessions added
+        """
+        known = {row["file"] for row in self.conn.execute("SELECT file FROM sessions")}
+        added = 0
+        with os.scandir(history_dir) as entries:
+            for entry in entries:
+                if (entry.name.startswith("session_") and entry.name.endswith(".json")
+                        and entry.name not in known):
+                    try:
+                        self.add_session(entry.path)
+                        added += 1
+                    except (ValueError, OSError) as e:
+                        print(f"⚠️  Skipping {entry.name}: {e}")
+        return added
+
+    # ---- queries ---------------------------------------------------------
+
+    def repeated_mistakes(self, since=None, limit=10, min_count=2):
+        """
+        Corrections the student needed more than once
+
+        Args:
+            since: ISO date/time; only corrections from then on
+            limit: Maximum rows
+            min_count: Minimum times corrected
+
+        Returns:
+            List of dicts: correction, count, last_seen, example (what the student said)
+        """
+        rows = self.conn.execute(
+            "SELECT correction, COUNT(*) AS count, MAX(timestamp) AS last_seen, "
+            "MAX(original) AS example FROM corrections "
+            "WHERE timestamp >= ? GROUP BY correction COLLATE NOCASE "
+            "HAVING COUNT(*) >= ? ORDER BY count DESC, last_seen DESC LIMIT ?",
+            (since or "", min_count, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def progress(self, since=None, period="week"):
+        """
+        Practice and accuracy per day, week or month
+
+        Args:
+            since: ISO date/time; only turns from then on
+            period: "day", "week" or "month"
+
+        Returns:
+            List of dicts: period, sessions, turns, correct, corrections, unclear, accuracy
+        """
+        formats = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+        rows = self.conn.execute(
+            f"SELECT strftime('{formats[period]}', timestamp) AS period, "
+            "COUNT(DISTINCT session_id) AS sessions, COUNT(*) AS turns, "
+            "COALESCE(SUM(outcome = 'correct'), 0) AS correct, "
+            "COALESCE(SUM(outcome = 'correction'), 0) AS corrections, "
+            "COALESCE(SUM(outcome = 'unclear'), 0) AS unclear "
+            "FROM turns WHERE timestamp >= ? GROUP BY period ORDER BY period",
+            (since or "",)
+        )
+        result = []
+        for row in rows:
+            row = dict(row)
+            graded = row["correct"] + row["corrections"]
+            row["accuracy"] = round(row["correct"] / graded, 3) if graded else None
+            result.append(row)
+        return result
+
+    def totals(self, since=None):
+        """
+        Returns:
+            Dict: sessions, turns, corrections, first and last session start
+        """
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS sessions, COALESCE(SUM(turns), 0) AS turns, "
+            "MIN(start_time) AS first, MAX(start_time) AS last FROM sessions WHERE start_time >= ?",
+            (since or "",)
+        ).fetchone()
+        totals = dict(row)
+        totals["corrections"] = self.conn.execute(
+            "SELECT COUNT(*) FROM corrections WHERE timestamp >= ?", (since or "",)
+        ).fetchone()[0]
+        return totals
+
+    def search(self, text, limit=20):
+        """
+        Turns where the student or teacher said something
+
+        Returns:
+            List of dicts: timestamp, student, teacher, outcome
+        """
+        rows = self.conn.execute(
+            "SELECT timestamp, student, teacher, outcome FROM turns "
+            "WHERE student LIKE ? OR teacher LIKE ? ORDER BY timestamp DESC LIMIT ?",
+            (f"%{text}%", f"%{text}%", limit)
+        )
+        return [dict(row) for row in rows]
+
+    # ---- export ----------------------------------------------------------
+
+    def export(self, path):
+        """
+        Export one row per turn for analytics
+
+        Writes Parquet when pyarrow is installed (columnar, typed), CSV otherwise.
+
+        Args:
+            path: Output file (.parquet or .csv)
+
+        Returns:
+            Path written
+        """
+        cursor = self.conn.execute(
+            "SELECT s.file, s.start_time AS session_start, s.student_level, t.position, "
+            "t.timestamp, t.student, t.teacher, t.outcome, c.correction "
+            "FROM turns t JOIN sessions s ON s.id = t.session_id "
+            "LEFT JOIN corrections c ON c.turn_id = t.id ORDER BY t.timestamp"
+        )
+        names = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+        path = Path(path)
+
+        if path.suffix == ".parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.table({name: [row[i] for row in rows] for i, name in enumerate(names)})
+                pq.write_table(table, path)
+                return path
+            except ImportError:
+                print("⚠️  pyarrow not installed (pip install pyarrow) - exporting CSV instead")
+                path = path.with_suffix(".csv")
+
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(rows)
+        return path
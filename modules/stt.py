@@ -4,15 +4,170 @@ Transcribes user's spoken English to text
 """
 
 import os
+import re
+import time
+import uuid
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
 import numpy as np
-import sounddevice as sd
 import soundfile as sf
-from faster_whisper import WhisperModel
 from pathlib import Path
 
+from .audio_buffer import RingBuffer
+from .audio_io import MicrophoneSource
+from .tracing import tracer
+from .vad import Endpointer
+
+
+# kind is "partial" or "final"; text is committed + tentative words
+TranscriptEvent = namedtuple("TranscriptEvent", ["kind", "text", "committed", "tentative"])
+
+
+def _normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class StreamingTranscriber:
+    """
+    Incremental Whisper decoding while audio is still being captured
+
+    Every `step` seconds the uncommitted tail of the audio is decoded again.
+    Words that two consecutive decodes agree on are committed and their
+    audio is dropped, so only the unstable tail is ever re-decoded.
+    """
+    def __init__(self, model, language=None, sample_rate=16000,
+                 step=0.5, max_window=15.0, on_event=None):
+        """
+        Args:
+            model: Loaded faster-whisper WhisperModel
+            language: Language code, or None to auto-detect
+            sample_rate: Sample rate of the fed audio
+            step: Seconds between decodes
+            max_window: Force-commit words once the tail grows past this many seconds
+            on_event: Callback receiving TranscriptEvent objects
+        """
+        self.model = model
+        self.language = language
+        self.sample_rate = sample_rate
+        self.step = step
+        self.max_window = max_window
+        self.on_event = on_event
+
+        self._lock = threading.Lock()
+        self._blocks = []
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._tail_start = 0.0  # Absolute time (s) of the first sample in _tail
+        self._committed = []  # (word, end_time) tuples
+        self._previous = []  # Last hypothesis after the committed words
+        self._stop = threading.Event()
+        self._thread = None
+
+    def feed(self, block):
+        """Add captured audio (called from the recording callback)"""
+        with self._lock:
+            self._blocks.append(block.reshape(-1))
+
+    def start(self):
+        """Start decoding in the background"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.step):
+            self.process()
+
+    def _take_new_audio(self):
+        with self._lock:
+            blocks, self._blocks = self._blocks, []
+        if blocks:
+            self._tail = np.concatenate([self._tail] + blocks)
+        return bool(blocks)
+
+    def _decode_tail(self):
+        """Decode the uncommitted tail and return (word, start, end) in absolute time"""
+        prompt = " ".join(word for word, _ in self._committed[-30:]) or None
+        segments, _ = self.model.transcribe(
+            self._tail,
+            language=self.language,
+            initial_prompt=prompt,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            vad_filter=True
+        )
+        words = []
+        for segment in segments:
+            for word in segment.words or []:
+                words.append((word.word.strip(),
+                              self._tail_start + word.start,
+                              self._tail_start + word.end))
+        return [w for w in words if w[0]]
+
+    def _commit(self, words):
+        if not words:
+            return
+        self._committed.extend((word, end) for word, _, end in words)
+        cut_time = words[-1][2]
+        cut = int((cut_time - self._tail_start) * self.sample_rate)
+        cut = max(0, min(cut, len(self._tail)))
+        self._tail = self._tail[cut:]
+        self._tail_start += cut / self.sample_rate
+
+    def process(self):
+        """Decode once and emit a partial event if there was new audio"""
+        if not self._take_new_audio() or len(self._tail) == 0:
+            return
+
+        hypothesis = self._decode_tail()
+
+        # Commit the longest prefix two consecutive hypotheses agree on
+        agreed = 0
+        for new, old in zip(hypothesis, self._previous):
+            if _normalize_word(new[0]) != _normalize_word(old[0]):
+                break
+            agreed += 1
+        stable = hypothesis[:agreed]
+
+        # Don't let the tail grow forever when decodes keep disagreeing
+        tail_seconds = len(self._tail) / self.sample_rate
+        if tail_seconds > self.max_window:
+            horizon = self._tail_start + tail_seconds - 2.0
+            stable = [w for w in hypothesis if w[2] <= horizon] or stable
+
+        self._commit(stable)
+        self._previous = hypothesis[len(stable):]
+        self._emit("partial", self._previous)
+
+    def finish(self):
+        """
+        Stop background decoding and decode whatever is left
+
+        Returns:
+            Final transcript text
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._take_new_audio()
+        if len(self._tail):
+            self._commit(self._decode_tail())
+        self._previous = []
+        return self._emit("final", []).text
+
+    def _emit(self, kind, tentative):
+        committed = " ".join(word for word, _ in self._committed)
+        pending = " ".join(word for word, _, _ in tentative)
+        event = TranscriptEvent(kind, f"{committed} {pending}".strip(), committed, pending)
+        if self.on_event:
+            self.on_event(event)
+        return event
+
 
 class SpeechToText:
-    def __init__(self, model_size="base", device="cpu", language="en"):
+    def __init__(self, model_size="base", device="cpu", language="en", debug_dump_dir=None,
+                 blocksize=1024, vad_config=None, latency=None, preroll=0.3,
+                 cpu_threads=0, num_workers=1, source=None):
         """
         Initialize Whisper STT
 
@@ -20,190 +175,429 @@ class SpeechToText:
             model_size: tiny, base, small, medium, large
             device: cpu or cuda
             language: en for English
+            debug_dump_dir: If set, every transcribed utterance is also saved here as WAV
+            blocksize: Samples per audio callback (smaller = lower latency)
+            vad_config: Endpointer settings for auto mode (see modules.vad.Endpointer)
+            latency: PortAudio latency hint ("low", "high" or seconds; None = default)
+            preroll: Seconds of audio from before each recording starts
+                (only with the session stream, see open_stream)
+            cpu_threads: CTranslate2 threads per worker (0 = default)
+            num_workers: Parallel transcriptions the model accepts from different threads
+            source: Where audio comes from (default: the microphone, see modules.audio_io)
         """
+        from faster_whisper import WhisperModel
+
         print(f"Loading Whisper model ({model_size})...")
-        self.model = WhisperModel(model_size, device=device, compute_type="int8")
+        self.model = WhisperModel(model_size, device=device, compute_type="int8",
+                                  cpu_threads=cpu_threads, num_workers=num_workers)
         self.language = language
         self.sample_rate = 16000
+        self.debug_dump_dir = debug_dump_dir
+        self.blocksize = blocksize
+        self.latency = latency
+        self.source = source or MicrophoneSource(latency)
+        self.preroll = preroll
+        self.overflows = 0
+        self.keep_recordings = False  # Keep a copy of the last recording (e.g. to archive it)
+        self.last_recording = None
+        self._buffer = None  # Preallocated capture buffer
+        self.vad_config = vad_config or {}
+        self.endpointer = Endpointer(self.sample_rate, **self.vad_config)
+
+        # Session stream (see open_stream)
+        self._stream = None
+        self.stream_buffer = None
+        self.device_latency = None
+
+    def _capture_buffer(self, seconds):
+        """Preallocated capture buffer, reused across recordings and grown only when needed"""
+        capacity = int(seconds * self.sample_rate)
+        if self._buffer is None or self._buffer.capacity < capacity:
+            self._buffer = RingBuffer(capacity)
+        self._buffer.reset()
+        return self._buffer
+
+    def _input_callback(self, buffer):
+        """
+        PortAudio callback: copy the block into the ring buffer, nothing else
 
-    def record_audio(self, duration=10, silence_threshold=0.003, max_silence=6.0):
+        No allocations, locks or prints happen on the audio thread.
         """
-        Record audio from microphone
+        def callback(indata, frames, time, status):
+            if status.input_overflow:
+                self.overflows += 1
+            buffer.write(indata)
+        return callback
+
+    def _open_input(self, buffer):
+        return self.source.open(self.sample_rate, self.blocksize, self._input_callback(buffer))
+
+    def open_stream(self, buffer_seconds=120):
+        """
+        Keep the microphone open for the whole session
+
+        Recordings then read from one continuous ring buffer instead of
+        opening the device every turn, so there is no open delay and each
+        recording starts `preroll` seconds in the past (no clipped onsets).
+        Recordings longer than the buffer keep only their most recent part.
+
+        Args:
+            buffer_seconds: Audio kept in the ring buffer
+
+        Returns:
+            Device latency in seconds: {"open": time until the first block
+            arrived, "input": latency reported by PortAudio}
+        """
+        if self._stream is not None:
+            return self.device_latency
+
+        self.stream_buffer = RingBuffer(int(buffer_seconds * self.sample_rate))
+        begin = time.perf_counter()
+        self._stream = self._open_input(self.stream_buffer)
+        self._stream.start()
+        while self.stream_buffer.written == 0 and time.perf_counter() - begin < 2.0:
+            time.sleep(0.002)
+
+        self.device_latency = {
+            "open": time.perf_counter() - begin,
+            "input": self._stream.latency,
+        }
+        return self.device_latency
+
+    def close_stream(self):
+        """Close the session stream (recordings open the device again)"""
+        if self._stream is None:
+            return
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+        self.stream_buffer = None
+
+    @contextmanager
+    def _recording(self, seconds, preroll=None, cue=True, start=None):
+        """
+        Audio source for one recording
+
+        Reads from the session stream when it is open - from `start` if
+        given, else `preroll` seconds back unless barge-in audio already
+        covers the onset - otherwise opens the device just for this recording.
+
+        Args:
+            cue: Tell the source an utterance is expected (file replay
+                starts the next file; EOFError when there is none)
+            start: Position on the session stream to start at (barge-in)
+
+        Yields:
+            (buffer, start): ring buffer and the position the recording starts at
+        """
+        self.overflows = 0
+        self.last_recording = None
+        if cue:
+            self.source.cue()
+        if self._stream is not None:
+            buffer = self.stream_buffer
+            if start is not None:
+                start = max(buffer.oldest, start)
+            elif preroll is None:
+                start = max(buffer.oldest, buffer.written - int(self.preroll * self.sample_rate))
+            else:
+                start = buffer.written
+            yield buffer, start
+            return
+
+        buffer = self._capture_buffer(seconds + 1)
+        with self._open_input(buffer):
+            yield buffer, 0
+
+    def _with_preroll(self, preroll, audio):
+        """Prepend barge-in audio to a recording"""
+        if preroll is None or len(preroll) == 0:
+            return audio
+        return np.concatenate((np.asarray(preroll, dtype=np.float32).reshape(-1), audio))
+
+    def calibrate(self, seconds=1.0):
+        """
+        Measure the ambient noise floor for endpointing (nobody should talk)
+
+        Returns:
+            Noise floor in dB
+        """
+        with self._recording(seconds + 0.5, cue=False) as (buffer, _):
+            begin = buffer.written
+            while buffer.written - begin < seconds * self.sample_rate:
+                time.sleep(0.05)
+            audio = buffer.read(begin, buffer.written)
+        return self.endpointer.calibrate(audio)
+
+    def record_audio(self, duration=10, silence_threshold=None, max_silence=None, on_block=None,
+                     preroll=None, start=None):
+        """
+        Record audio from microphone until the student stops talking
 
         Args:
             duration: Maximum recording time in seconds
-            silence_threshold: Volume threshold to detect silence (lower = more sensitive)
-            max_silence: Stop recording after this many seconds of silence
+            silence_threshold: Override the noise floor amplitude (if not calibrated)
+            max_silence: Override how many seconds of silence end the recording
+            on_block: Optional callback receiving each captured audio block
+            preroll: Audio already captured (e.g. by barge-in) to start the recording with
+            start: Position on the session stream where the student already
+                started talking (barge-in on the shared buffer)
 
         Returns:
-            numpy array with audio data
+            numpy array with audio data (a view into the capture buffer,
+            valid until the buffer is reused)
         """
-        print("🎤 Listening... (will stop after 6 seconds of silence)")
+        endpointer = self.endpointer
+        if silence_threshold is not None or max_silence is not None:
+            settings = dict(self.vad_config)
+            if silence_threshold is not None:
+                settings['silence_threshold'] = silence_threshold
+            if max_silence is not None:
+                settings['hangover'] = max_silence
+            endpointer = Endpointer(self.sample_rate, **settings)
+            if self.endpointer.calibrated:
+                endpointer.noise_floor_db = self.endpointer.noise_floor_db
+        endpointer.reset()
+
+        print(f"🎤 Listening... (will stop after {endpointer.hangover:g}s of silence)")
         print("💡 Take your time! Speak naturally and pause as needed")
 
-        recording = []
-        silence_counter = 0
-        has_speech = False  # Track if we've detected any speech
-        last_volume_print = 0
-        silence_samples = int(max_silence * self.sample_rate)
+        if start is not None:
+            endpointer.force_speech()  # The student is already talking
+        elif preroll is not None and len(preroll):
+            endpointer.force_speech()  # Barge-in pre-roll is speech already
+            if on_block:
+                on_block(preroll)
+
+        frame = endpointer.frame_size
+        was_speaking = endpointer.in_speech
+
+        with tracer.span("capture") as capture, self._recording(duration, preroll, start=start) as (buffer, start):
+            processed = fed = start
+            limit = start + int(duration * self.sample_rate)
+
+            # Record until duration or end of speech
+            while buffer.written < limit:
+                time.sleep(0.05)
+
+                # Endpointing runs here, on whole frames, outside the audio thread
+                written = min(buffer.written, limit)
+                if on_block and written > fed:
+                    on_block(buffer.read(fed, written))
+                    fed = written
+                usable = (written - processed) // frame * frame
+                if usable and endpointer.process(buffer.read(processed, processed + usable)):
+                    print(f"\n🔇 {endpointer.hangover:g}s of silence - stopping!")
+                    if endpointer.speech_end is not None:
+                        # From the last speech sample reaching the buffer to now
+                        now = time.perf_counter()
+                        waited = (buffer.written - start - endpointer.speech_end) / self.sample_rate
+                        tracer.record("endpoint", now - waited, now, hangover=endpointer.hangover)
+                    break
+                processed += usable
 
-        def callback(indata, frames, time, status):
-            nonlocal silence_counter, has_speech, last_volume_print
-            recording.append(indata.copy())
-
-            # Detect silence
-            volume = np.abs(indata).mean()
-
-            # Track if we've heard any speech (more lenient threshold)
-            if volume > silence_threshold * 3:  # Increased multiplier for speech detection
-                has_speech = True
-                silence_counter = 0
-                # Visual feedback every 0.5s
-                if len(recording) - last_volume_print > self.sample_rate // 4:
+                if endpointer.in_speech and not was_speaking:
                     print("🗣️", end=" ", flush=True)
-                    last_volume_print = len(recording)
-            elif volume < silence_threshold:
-                # Only count silence if we've already detected speech
-                if has_speech:
-                    silence_counter += frames
-                    # Show silence progress every second
-                    if silence_counter % self.sample_rate < frames:
-                        seconds_silent = silence_counter / self.sample_rate
-                        print(f"\n⏱️  Silent for {seconds_silent:.0f}s (will stop at 6s)", end="", flush=True)
-            else:
-                # In between - be more forgiving, don't reset immediately
-                if has_speech and volume > silence_threshold * 1.5:
-                    silence_counter = max(0, silence_counter - frames // 2)  # Decay slowly
-
-        with sd.InputStream(callback=callback, channels=1,
-                           samplerate=self.sample_rate, dtype='float32'):
-            # Record until duration or silence detected
-            while len(recording) < duration * self.sample_rate / 1024:
-                sd.sleep(100)
-                # Only stop on silence if we've heard speech first
-                if has_speech and silence_counter > silence_samples:
-                    print("\n\n🔇 6 seconds of silence detected - stopping!")
-                    break
+                    was_speaking = True
 
-        if not recording:
-            return np.array([])
+            end = min(buffer.written, limit)
+            capture.set(audio_seconds=round((end - start) / self.sample_rate, 2))
+
+        self._report_overflows()
+        if end <= start and preroll is None:
+            return np.array([], dtype=np.float32)
+
+        # Drop the trailing silence (keep a little tail for Whisper)
+        if endpointer.speech_end is not None:
+            end = min(end, start + endpointer.speech_end + int(0.3 * self.sample_rate))
 
-        audio = np.concatenate(recording, axis=0)
         print("✅ Recording complete")
-        return audio
+        return self._keep(self._with_preroll(preroll, buffer.read(start, end)))
+
+    def _report_overflows(self):
+        if self.overflows:
+            print(f"\n⚠️  Audio input overflowed {self.overflows} time(s) - some audio was lost")
 
     def transcribe(self, audio):
         """
         Transcribe audio to text using Whisper
 
+        The buffer is passed to faster-whisper directly, no temp file involved.
+
         Args:
-            audio: numpy array with audio data
+            audio: float32 numpy array, 16 kHz mono
 
         Returns:
             Transcribed text
         """
-        # Save temporary audio file
-        temp_path = Path("temp_audio/temp.wav")
-        temp_path.parent.mkdir(exist_ok=True)
-        sf.write(temp_path, audio, self.sample_rate)
+        # (N, 1) recordings become (N,) views - no copy for float32 input
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+
+        if self.debug_dump_dir:
+            self._dump_audio(audio)
 
         # Transcribe
         print("🔄 Transcribing...")
-        segments, info = self.model.transcribe(
-            str(temp_path),
-            language=self.language,
-            vad_filter=True  # Voice Activity Detection
-        )
+        with tracer.span("decode", audio_seconds=round(len(audio) / self.sample_rate, 2)):
+            segments, info = self.model.transcribe(
+                audio,
+                language=self.language,
+                vad_filter=True  # Voice Activity Detection
+            )
 
-        # Combine all segments
-        text = " ".join([segment.text for segment in segments])
-
-        # Cleanup
-        temp_path.unlink()
+            # Combine all segments (they are decoded lazily, here)
+            text = " ".join([segment.text for segment in segments])
 
         return text.strip()
 
-    def record_audio_manual(self, max_duration=60):
+    def warmup(self):
+        """
+        Run a dummy inference so the first real transcription doesn't pay
+        for kernel/JIT initialization
+        """
+        noise = np.random.default_rng(0).normal(0, 0.01, self.sample_rate).astype(np.float32)
+        segments, _ = self.model.transcribe(noise, language=self.language or "en", vad_filter=False)
+        list(segments)  # Segments are lazy - consume them to actually decode
+
+    def _dump_audio(self, audio):
+        """Save a copy of the utterance for debugging (unique name per call)"""
+        dump_dir = Path(self.debug_dump_dir)
+        dump_dir.mkdir(parents=True, exist_ok=True)
+        dump_path = dump_dir / f"utterance_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.wav"
+        sf.write(dump_path, audio, self.sample_rate)
+
+    def record_audio_manual(self, max_duration=60, on_block=None, preroll=None, start=None):
         """
         Record audio with MANUAL control - press Enter to stop
         NO automatic silence detection!
 
         Args:
             max_duration: Maximum recording time in seconds
+            on_block: Optional callback receiving each captured audio block
+            preroll: Audio already captured (e.g. by barge-in) to start the recording with
+            start: Position on the session stream where the student already
+                started talking (barge-in on the shared buffer)
 
         Returns:
-            numpy array with audio data
+            numpy array with audio data (a view into the capture buffer,
+            valid until the buffer is reused)
         """
-        import threading
-
         print("🎤 Recording started!")
         print("🔴 Press ENTER when you finish speaking to stop recording")
         print()
 
-        recording = []
-        is_recording = True
+        if on_block and preroll is not None and len(preroll):
+            on_block(preroll)
+
+        with tracer.span("capture") as capture, self._recording(max_duration, preroll, start=start) as (buffer, start):
+            stop_at = None
+            limit = buffer.written + int(max_duration * self.sample_rate)
+
+            def wait_for_enter():
+                nonlocal stop_at
+                input()  # Wait for Enter key
+                stop_at = buffer.written
+                print("\n✋ Stopping recording...")
+
+            # Start thread waiting for Enter key
+            enter_thread = threading.Thread(target=wait_for_enter, daemon=True)
+            enter_thread.start()
 
-        def callback(indata, frames, time, status):
-            if is_recording:
-                recording.append(indata.copy())
-                # Visual feedback
-                if len(recording) % (self.sample_rate // 2) == 0:
-                    elapsed = len(recording) / self.sample_rate * 1024
-                    print(f"🗣️  Recording... {elapsed:.0f}s", end="\r", flush=True)
-
-        def wait_for_enter():
-            nonlocal is_recording
-            input()  # Wait for Enter key
-            is_recording = False
-            print("\n✋ Stopping recording...")
-
-        # Start thread waiting for Enter key
-        enter_thread = threading.Thread(target=wait_for_enter, daemon=True)
-        enter_thread.start()
-
-        with sd.InputStream(callback=callback, channels=1,
-                           samplerate=self.sample_rate, dtype='float32'):
             # Record until Enter pressed or max duration
-            start_time = 0
-            while is_recording and start_time < max_duration:
-                sd.sleep(100)
-                start_time += 0.1
+            processed = start
+            last_print = start
+            while stop_at is None and buffer.written < limit:
+                time.sleep(0.1)
+
+                written = min(buffer.written, limit)
+                if on_block and written > processed:
+                    on_block(buffer.read(processed, written))
+                processed = written
 
-            if start_time >= max_duration:
+                # Visual feedback
+                if written - last_print >= self.sample_rate:
+                    last_print = written
+                    print(f"🗣️  Recording... {(written - start) / self.sample_rate:.0f}s", end="\r", flush=True)
+
+            if stop_at is None:
                 print(f"\n⏱️  Max duration ({max_duration}s) reached, stopping...")
+            end = min(buffer.written, limit) if stop_at is None else stop_at
+            capture.set(audio_seconds=round((end - start) / self.sample_rate, 2))
 
-        if not recording:
-            return np.array([])
+        if on_block and end > processed:
+            on_block(buffer.read(processed, end))
+
+        self._report_overflows()
+        audio = self._with_preroll(preroll, buffer.read(start, end))
+        if len(audio) == 0:
+            return np.array([], dtype=np.float32)
 
-        audio = np.concatenate(recording, axis=0)
         duration = len(audio) / self.sample_rate
         print(f"✅ Recorded {duration:.1f} seconds\n")
+        return self._keep(audio)
+
+    def _keep(self, audio):
+        """Remember the recording (a copy: the buffer it views gets reused)"""
+        self.last_recording = audio.copy() if self.keep_recordings else None
         return audio
 
-    def listen_and_transcribe(self, duration=10):
+    def listen_and_transcribe(self, duration=10, preroll=None, start=None):
         """
         Record audio and transcribe in one step
 
         Returns:
             Transcribed text
         """
-        audio = self.record_audio(duration=duration)
+        audio = self.record_audio(duration=duration, preroll=preroll, start=start)
         text = self.transcribe(audio)
         return text
 
-    def listen_and_transcribe_manual(self, max_duration=60):
+    def listen_and_transcribe_manual(self, max_duration=60, preroll=None, start=None):
         """
         Record audio with MANUAL control and transcribe
 
         Returns:
             Transcribed text
         """
-        audio = self.record_audio_manual(max_duration=max_duration)
+        audio = self.record_audio_manual(max_duration=max_duration, preroll=preroll, start=start)
         if len(audio) == 0:
             return ""
         text = self.transcribe(audio)
         return text
 
+    def listen_and_transcribe_streaming(self, max_duration=60, step=0.5, on_event=None, preroll=None,
+                                        start=None):
+        """
+        Record with MANUAL control while transcribing incrementally
+
+        Partial transcripts are emitted during capture, so the final text
+        is ready almost as soon as Enter is pressed.
+
+        Args:
+            max_duration: Maximum recording time in seconds
+            step: Seconds between incremental decodes
+            on_event: Callback receiving TranscriptEvent objects
+
+        Returns:
+            Transcribed text
+        """
+        transcriber = StreamingTranscriber(
+            self.model,
+            language=self.language,
+            sample_rate=self.sample_rate,
+            step=step,
+            on_event=on_event
+        )
+        transcriber.start()
+        try:
+            self.record_audio_manual(max_duration=max_duration, on_block=transcriber.feed,
+                                     preroll=preroll, start=start)
+        finally:
+            # Only the tail is left to decode once Enter is pressed
+            with tracer.span("decode", streaming=True):
+                text = transcriber.finish()
+        return text
+
 
 if __name__ == "__main__":
     # Test the STT module
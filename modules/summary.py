@@ -0,0 +1,191 @@
+"""
+Running session summary
+Updated in the background after every turn, so reading it is instant
+"""
+
+import json
+import queue
+import threading
+
+from .background import BackgroundGate
+
+
+class SessionSummary:
+    """
+    Structured summary of the session (topics, mistakes, strengths)
+
+    Each finished turn is folded into the summary by a background worker.
+    Updates only see the current summary plus the new turn, so their cost
+    stays constant however long the session is. The worker yields to live
+    turns through a BackgroundGate shared with the conversation context.
+    Turns that could not be summarized are still listed, verbatim.
+    """
+    FIELDS = ("topics", "mistakes", "strengths")
+
+    def __init__(self, model, keep_alive=None, max_items=8, max_tokens=200, gate=None):
+        """
+        Args:
+            model: Ollama model used for the updates
+            keep_alive: Ollama keep_alive for update requests (None = server default)
+            max_items: Maximum entries kept per field
+            max_tokens: num_predict limit for each update
+            gate: BackgroundGate paused during live turns (a private one if omitted)
+        """
+        self.model = model
+        self.keep_alive = keep_alive
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+
+        self.gate = gate or BackgroundGate()
+
+        self.data = {field: [] for field in self.FIELDS}
+        self.turns = 0
+        self.failed = []  # (student, teacher) turns whose update failed
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._last = None  # Last queued turn, for amend()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def update(self, student, teacher):
+        """Queue a finished turn to be folded into the summary"""
+        job = {"student": student, "teacher": teacher, "started": False, "amended": False, "failed": None}
+        with self._lock:
+            self._last = job
+        self._jobs.put(job)
+
+    def amend(self, teacher):
+        """
+        Replace the teacher's reply in the last turn (cut short by a barge-in)
+
+        If the turn hasn't been folded yet its text is just swapped;
+        otherwise the summary is corrected by another update.
+        """
+        with self._lock:
+            job = self._last
+            if job is None:
+                return
+            if not job["started"]:
+                job["teacher"] = teacher
+                return
+            if job["failed"] is not None:
+                # Listed verbatim instead of summarized: fix the listing
+                self.failed[job["failed"]] = (job["student"], teacher)
+                return
+            job = {"student": job["student"], "teacher": teacher, "started": False, "amended": True,
+                   "failed": None}
+            self._last = job
+        self._jobs.put(job)
+
+    @property
+    def pending(self):
+        """Turns not yet folded into the summary"""
+        return self._jobs.unfinished_tasks
+
+    def close(self):
+        """Stop the background worker once queued updates are done"""
+        self._jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+            try:
+                self.gate.wait()
+                with self._lock:
+                    job["started"] = True
+                self._fold(job["student"], job["teacher"], job["amended"])
+            except Exception as e:
+                print(f"⚠️  Session summary update failed: {e}")
+                if not job["amended"]:
+                    with self._lock:
+                        job["failed"] = len(self.failed)
+                        self.failed.append((job["student"], job["teacher"]))
+            finally:
+                self._jobs.task_done()
+
+    def _fold(self, student, teacher, amended=False):
+        with self._lock:
+            current = json.dumps(self.data, ensure_ascii=False)
+
+        if amended:
+            turn = (f"Correction to the last turn: the teacher was interrupted, so the student only heard "
+                    f"this part of the reply.\nStudent: {student}\nTeacher: {teacher}\n"
+                    "Drop anything that came only from the part the student didn't hear.")
+        else:
+            turn = f"New turn:\nStudent: {student}\nTeacher: {teacher}"
+        prompt = (
+            f"Current summary (JSON):\n{current}\n\n"
+            f"{turn}\n\n"
+            "Return the updated summary as JSON with the keys "
+            '"topics", "mistakes" and "strengths", each a list of short strings. '
+            f"Merge duplicates and keep at most {self.max_items} items per key."
+        )
+
+        extra = {} if self.keep_alive is None else {"keep_alive": self.keep_alive}
+        response = self.gate.chat(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You keep track of an English lesson. Answer only with JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            format="json",
+            options={"temperature": 0.2, "num_predict": self.max_tokens},
+            **extra
+        )
+
+        updated = json.loads(response['message']['content'])
+        with self._lock:
+            for field in self.FIELDS:
+                items = updated.get(field, self.data[field])
+                if isinstance(items, list):
+                    self.data[field] = [str(item) for item in items][:self.max_items]
+            if not amended:
+                self.turns += 1
+
+    def render(self):
+        """
+        Format the summary for display (never waits on the model)
+
+        Returns:
+            Summary text
+        """
+        with self._lock:
+            data = {field: list(items) for field, items in self.data.items()}
+            turns = self.turns
+            failed = list(self.failed)
+
+        titles = {
+            "topics": "📚 Topics",
+            "mistakes": "✏️  Mistakes to review",
+            "strengths": "⭐ Strengths",
+        }
+        lines = []
+        if turns or not failed:
+            for field in self.FIELDS:
+                lines.append(titles[field])
+                lines.extend(f"  • {item}" for item in data[field] or ["—"])
+                lines.append("")
+
+        if failed:
+            # The model couldn't summarize these: show what was said instead
+            lines.append("💬 Turns not summarized")
+            for student, teacher in failed:
+                lines.append(f"  👤 {student}")
+                lines.append(f"  🤖 {teacher}")
+            lines.append("")
+
+        lines.append(f"Turns summarized: {turns}")
+        if self.pending:
+            lines.append(f"({self.pending} recent turn(s) still being summarized)")
+        return "\n".join(lines)
+
+    def reset(self):
+        """Clear the summary (queued updates still apply)"""
+        with self._lock:
+            self.data = {field: [] for field in self.FIELDS}
+            self.turns = 0
+            self.failed = []
+            self._last = None
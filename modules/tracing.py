@@ -0,0 +1,129 @@
+"""
+Turn tracing
+Lightweight timing spans for every stage of a turn
+"""
+
+import time
+
+
+class Span:
+    """One timed stage (use as a context manager)"""
+    __slots__ = ("tracer", "name", "attrs", "start", "end")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.end = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.end = time.perf_counter()
+        self.tracer._spans.append(self)
+        return False
+
+    def set(self, **attrs):
+        """Attach details (e.g. token counts) to the span"""
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    """What span() returns while tracing is off: does nothing"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans for the current turn
+
+    Disabled, span() hands back a shared do-nothing object, so
+    instrumented code pays one attribute check. Enabled, a span costs two
+    clock reads and a list append (about a microsecond), far below 1% of
+    any stage it measures. Spans can be recorded from any thread.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._spans = []
+        self._turn_start = time.perf_counter()
+
+    def span(self, name, **attrs):
+        """
+        Time a block of code
+
+            with tracer.span("decode", audio_seconds=3.2) as span:
+                ...
+                span.set(words=12)
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attrs)
+
+    def record(self, name, start, end, **attrs):
+        """Add a span measured elsewhere (perf_counter timestamps)"""
+        if not self.enabled:
+            return
+        span = Span(self, name, attrs)
+        span.start = start
+        span.end = end
+        self._spans.append(span)
+
+    def start_turn(self):
+        """Forget earlier spans; times are now relative to this moment"""
+        self._spans = []
+        self._turn_start = time.perf_counter()
+
+    def end_turn(self):
+        """
+        Take the spans of the turn
+
+        Returns:
+            List of dicts: name, start (seconds into the turn), seconds, and
+            any attributes - in start order
+        """
+        spans, self._spans = self._spans, []
+        return [
+            {
+                "name": span.name,
+                "start": round(span.start - self._turn_start, 3),
+                "seconds": round(span.end - span.start, 3),
+                **span.attrs
+            }
+            for span in sorted(spans, key=lambda span: span.start)
+        ]
+
+
+def summarize(spans):
+    """
+    Total time per stage, in the order stages first appeared
+
+    Returns:
+        Dict name -> {"seconds", "count", plus the attributes of the last span}
+    """
+    summary = {}
+    for span in spans:
+        entry = summary.setdefault(span["name"], {"seconds": 0.0, "count": 0})
+        entry["seconds"] += span["seconds"]
+        entry["count"] += 1
+        entry.update({key: value for key, value in span.items()
+                      if key not in ("name", "start", "seconds") and value is not None})
+    return summary
+
+
+# Shared by all modules; main.py turns it on from settings.yaml
+tracer = Tracer()
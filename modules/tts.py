@@ -4,27 +4,128 @@ Makes the AI speak responses with natural voice
 """
 
 import subprocess
+import io
 import os
+import re
+import shutil
+import time
 from pathlib import Path
-import sounddevice as sd
 import soundfile as sf
 import tempfile
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .audio_io import SpeakerSink
+from .tracing import tracer
+
+
+def speak_stream(tts, chunks, on_chunk=None, stop_event=None):
+    """
+    Speak text chunks as soon as they are available
+
+    Chunks are pulled on a background thread, so the LLM keeps generating
+    the next sentence while the current one is synthesized and played.
+
+    Args:
+        tts: Any TTS engine with a speak(text) method
+        chunks: Iterable of text chunks (e.g. from llm.iter_sentences)
+        on_chunk: Optional callback called with each chunk before it is spoken
+        stop_event: Optional threading.Event; once set, no more chunks are
+            pulled (closing the chunk generator) or spoken
+
+    Returns:
+        The text that was spoken completely, joined with spaces
+    """
+    pending = queue.Queue()
+    done = object()
+    errors = []
+
+    def stopped():
+        return stop_event is not None and stop_event.is_set()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if stopped():
+                    break
+                pending.put(chunk)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+            pending.put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    spoken = []
+    while True:
+        chunk = pending.get()
+        if chunk is done or stopped():
+            break
+        if on_chunk:
+            on_chunk(chunk)
+        tts.speak(chunk)
+        if stopped():
+            break  # Interrupted mid-chunk: it wasn't fully heard
+        spoken.append(chunk)
+
+    producer.join()
+    if errors:
+        raise errors[0]
+
+    return " ".join(spoken)
 
 
 class TextToSpeech:
-    def __init__(self, voice="en_US-lessac-medium", speed=1.0):
+    # Where to look for <voice>.onnx when the voice is not a path
+    VOICE_DIRS = ["voices", "models", ".", "~/.local/share/piper", "~/.local/share/piper-voices"]
+
+    def __init__(self, voice="en_US-lessac-medium", speed=1.0, cache=None, sink=None):
         """
         Initialize TTS with Piper
 
+        The voice model is loaded once, in-process, when the piper-tts
+        package is installed. Otherwise the piper CLI is used per utterance.
+
         Args:
-            voice: Voice model to use
+            voice: Voice model name or path to the .onnx file
             speed: Speech speed multiplier
+            cache: Optional AudioCache shared between engines
+            sink: Where audio is played (default: the speakers, see modules.audio_io)
         """
         self.voice = voice
         self.speed = speed
+        self.cache = cache
+        self.sink = sink or SpeakerSink()
         self.enabled = True
+        self.piper_voice = None
+        self.sample_rate = 22050
+        self._stop_requested = threading.Event()
+
+        model_path = self._find_model(voice)
+
+        # Preferred: load the voice once with the piper library
+        try:
+            from piper import PiperVoice
+            if model_path is None:
+                raise FileNotFoundError(f"{voice}.onnx not found in {', '.join(self.VOICE_DIRS)}")
+            self.piper_voice = PiperVoice.load(str(model_path))
+            self.sample_rate = self.piper_voice.config.sample_rate
+            print(f"✅ TTS ready (voice: {voice}, in-process)")
+            return
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Could not load Piper voice in-process: {e}")
 
-        # Check if piper is installed
+        # Fallback: piper CLI, one process per utterance
+        if model_path is not None:
+            self.sample_rate = self._read_sample_rate(model_path)
         try:
             subprocess.run(["piper", "--version"],
                          capture_output=True, check=True)
@@ -33,10 +134,74 @@ class TextToSpeech:
             print("⚠️  Piper not found. TTS will use fallback.")
             self.enabled = False
 
+    def _find_model(self, voice):
+        """Resolve a voice name to its .onnx model path (None if not found)"""
+        candidate = Path(voice).expanduser()
+        if candidate.suffix == ".onnx" and candidate.exists():
+            return candidate
+        for directory in self.VOICE_DIRS:
+            path = Path(directory).expanduser() / f"{voice}.onnx"
+            if path.exists():
+                return path
+        return None
+
+    def _read_sample_rate(self, model_path):
+        """Read the sample rate from the voice's .onnx.json config"""
+        import json
+        config_path = Path(f"{model_path}.json")
+        try:
+            return json.loads(config_path.read_text())["audio"]["sample_rate"]
+        except (OSError, KeyError, ValueError):
+            return self.sample_rate
+
+    def _synthesize_chunks(self, text):
+        """
+        Synthesize text as a stream of raw 16-bit mono PCM chunks
+
+        Yields:
+            bytes of int16 samples at self.sample_rate
+        """
+        length_scale = 1.0 / self.speed if self.speed else 1.0
+
+        if self.piper_voice is not None:
+            if hasattr(self.piper_voice, "synthesize_stream_raw"):
+                # piper-tts 1.2
+                yield from self.piper_voice.synthesize_stream_raw(text, length_scale=length_scale)
+            else:
+                # piper-tts >= 1.3
+                from piper import SynthesisConfig
+                config = SynthesisConfig(length_scale=length_scale)
+                for chunk in self.piper_voice.synthesize(text, syn_config=config):
+                    yield chunk.audio_int16_bytes
+            return
+
+        command = ["piper", "--model", self.voice, "--output-raw"]
+        if self.speed != 1.0:
+            command += ["--length_scale", str(length_scale)]
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        process.stdin.write(text.encode())
+        process.stdin.close()
+        try:
+            while True:
+                chunk = process.stdout.read(4096)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            process.stdout.close()
+            process.wait()
+
     def speak(self, text):
         """
         Convert text to speech and play it
 
+        Audio chunks are written to the output device as soon as Piper produces them.
+
         Args:
             text: Text to speak
         """
@@ -45,34 +210,100 @@ class TextToSpeech:
             return
 
         try:
-            # Create temp directory
-            temp_dir = Path("temp_audio")
-            temp_dir.mkdir(exist_ok=True)
-            output_file = temp_dir / "response.wav"
-
-            # Generate speech with piper
-            process = subprocess.Popen(
-                ["piper", "--model", self.voice, "--output_file", str(output_file)],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            process.communicate(input=text.encode())
-
-            # Play audio
-            if output_file.exists():
-                data, samplerate = sf.read(output_file)
-                sd.play(data, samplerate * self.speed)
-                sd.wait()
-                output_file.unlink()  # Cleanup
-            else:
+            key = None
+            if self.cache:
+                key = self.cache.make_key("piper", self.voice, None, self.speed, text)
+                cached = self.cache.get(key)
+                if cached:
+                    self.play(cached)
+                    return
+
+            played = []
+            leftover = b""
+            self._stop_requested.clear()
+            # Streamed: synthesis is the wait for the first audio, playback the rest
+            start = time.perf_counter()
+            first_audio = None
+            # Write ~100 ms at a time so stop() cuts in mid-sentence, like play()
+            step = self.sample_rate // 10 * 2
+            with self.sink.open_stream(self.sample_rate) as stream:
+                try:
+                    for chunk in self._synthesize_chunks(text):
+                        # Only write whole samples; carry an odd byte to the next chunk
+                        data = leftover + chunk
+                        whole = len(data) - len(data) % 2
+                        leftover = data[whole:]
+                        if whole and first_audio is None:
+                            first_audio = time.perf_counter()
+                        for offset in range(0, whole, step):
+                            if self._stop_requested.is_set():
+                                stream.abort()
+                                return
+                            piece = data[offset:min(offset + step, whole)]
+                            stream.write(piece)
+                            played.append(piece)
+                finally:
+                    if first_audio is not None:
+                        tracer.record("synthesis", start, first_audio, streamed=True)
+                        tracer.record("playback", first_audio, time.perf_counter(), streamed=True)
+
+            if not played:
                 print("⚠️  Failed to generate speech")
+            elif key:
+                self.cache.put(key, b"".join(played))
 
         except Exception as e:
             print(f"⚠️  TTS error: {e}")
             print(f"📝 Text: {text}")
 
+    def synthesize(self, text):
+        """
+        Synthesize text without playing it
+
+        Returns:
+            Raw int16 PCM bytes at self.sample_rate (None if disabled)
+        """
+        if not self.enabled:
+            return None
+
+        key = None
+        if self.cache:
+            key = self.cache.make_key("piper", self.voice, None, self.speed, text)
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+
+        with tracer.span("synthesis"):
+            data = b"".join(self._synthesize_chunks(text))
+        data = data[:len(data) - len(data) % 2]
+        if key and data:
+            self.cache.put(key, data)
+        return data
+
+    def play(self, audio):
+        """
+        Play audio returned by synthesize() (blocks until done or stop())
+
+        Args:
+            audio: Raw int16 PCM bytes
+        """
+        if not audio:
+            return
+
+        self._stop_requested.clear()
+        # Write ~100 ms at a time so stop() takes effect quickly
+        step = self.sample_rate // 10 * 2
+        with tracer.span("playback"), self.sink.open_stream(self.sample_rate) as stream:
+            for start in range(0, len(audio), step):
+                if self._stop_requested.is_set():
+                    stream.abort()
+                    break
+                stream.write(audio[start:start + step])
+
+    def stop(self):
+        """Stop playback started by play()"""
+        self._stop_requested.set()
+
     def speak_async(self, text):
         """
         Speak without blocking (background)
@@ -80,7 +311,6 @@ class TextToSpeech:
         Args:
             text: Text to speak
         """
-        import threading
         thread = threading.Thread(target=self.speak, args=(text,))
         thread.start()
 
@@ -92,21 +322,49 @@ class TextToSpeech:
 class SimpleTTS:
     """
     Fallback TTS using system commands (espeak/say)
+
+    macOS say can only speak through the speakers, so it is not used with
+    other sinks.
     """
-    def __init__(self):
+    def __init__(self, cache=None, sink=None):
         self.enabled = True
+        self.cache = cache
+        self.sink = sink or SpeakerSink()
 
         # Check available TTS
         if os.system("which espeak > /dev/null 2>&1") == 0:
             self.command = "espeak"
+            # Use espeak-ng if available (better quality)
+            if os.system("which espeak-ng > /dev/null 2>&1") == 0:
+                # espeak-ng with better settings for more natural voice
+                self.espeak_args = ["espeak-ng", "-v", "en-us", "-s", "160", "-p", "50"]
+            else:
+                # Regular espeak with improved settings
+                self.espeak_args = ["espeak", "-v", "en-us+f3", "-s", "160", "-p", "50"]
             print("✅ TTS ready (using espeak)")
-        elif os.system("which say > /dev/null 2>&1") == 0:
+        elif self.sink.external and os.system("which say > /dev/null 2>&1") == 0:
             self.command = "say"
             print("✅ TTS ready (using macOS say)")
         else:
             self.command = None
             print("⚠️  No TTS available")
 
+    def _espeak_wav(self, text):
+        """Synthesize with espeak and return WAV bytes (cached)"""
+        key = None
+        if self.cache:
+            key = self.cache.make_key("espeak", " ".join(self.espeak_args), None, None, text)
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+
+        with tracer.span("synthesis"):
+            result = subprocess.run(self.espeak_args + ["--stdout", text],
+                                    capture_output=True, check=True)
+        if key:
+            self.cache.put(key, result.stdout)
+        return result.stdout
+
     def speak(self, text):
         """Speak using system TTS"""
         if not self.enabled or not self.command:
@@ -114,23 +372,49 @@ class SimpleTTS:
             return
 
         try:
-            # Clean text to avoid command injection and quote issues
-            clean_text = text.replace('"', '\\"').replace("'", "\\'")
-
             if self.command == "espeak":
-                # Use espeak-ng if available (better quality)
-                if os.system("which espeak-ng > /dev/null 2>&1") == 0:
-                    # espeak-ng with better settings for more natural voice
-                    os.system(f'espeak-ng -v en-us -s 160 -p 50 "{clean_text}" 2>/dev/null')
-                else:
-                    # Regular espeak with improved settings
-                    os.system(f'espeak -v en-us+f3 -s 160 -p 50 "{clean_text}" 2>/dev/null')
+                data, samplerate = sf.read(io.BytesIO(self._espeak_wav(text)), dtype='float32')
+                with tracer.span("playback"):
+                    self.sink.play(data, samplerate)
             elif self.command == "say":
-                os.system(f'say "{clean_text}"')
+                # Clean text to avoid command injection and quote issues
+                clean_text = text.replace('"', '\\"').replace("'", "\\'")
+                with tracer.span("playback", synthesis_included=True):
+                    os.system(f'say "{clean_text}"')
         except Exception as e:
             print(f"⚠️  TTS error: {e}")
             print(f"📝 Text: {text}")
 
+    def synthesize(self, text):
+        """
+        Synthesize text without playing it
+
+        Returns:
+            (samples, samplerate) for espeak, the text itself for macOS say
+            (which can only speak directly), None if disabled
+        """
+        if not self.enabled or not self.command:
+            return None
+        if self.command == "espeak":
+            return sf.read(io.BytesIO(self._espeak_wav(text)), dtype='float32')
+        return text
+
+    def play(self, audio):
+        """Play audio returned by synthesize() (blocks until done or stop())"""
+        if audio is None:
+            return
+        with tracer.span("playback"):
+            if isinstance(audio, tuple):
+                samples, samplerate = audio
+                self.sink.play(samples, samplerate)
+            else:
+                subprocess.run(["say", audio])
+
+    def stop(self):
+        """Stop playback started by play()"""
+        if self.command == "espeak":
+            self.sink.stop()
+
     def set_enabled(self, enabled):
         """Enable or disable TTS"""
         self.enabled = enabled
@@ -142,10 +426,44 @@ class GoogleTTS:
     Much more natural voice than espeak
     Supports bilingual (Portuguese + English)
     """
-    def __init__(self, lang='en', slow=False):
+    def __init__(self, lang='en', slow=False, cache=None, workers=3, synthesizer=None, sink=None):
+        """
+        Args:
+            lang: Default language
+            slow: Slower speech
+            cache: Optional AudioCache shared between engines
+            workers: Segments synthesized concurrently while earlier ones play
+            synthesizer: Optional callable (text, lang, slow) -> MP3 bytes used
+                instead of gTTS (e.g. a local stand-in for testing)
+            sink: Where audio is played (default: the speakers, see modules.audio_io)
+        """
         self.enabled = True
         self.lang = lang
         self.slow = slow
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.synthesizer = synthesizer
+        self.sink = sink or SpeakerSink()
+        self._stop_requested = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gtts")
+
+        # libsndfile >= 1.1 decodes MP3, so gTTS output never touches disk
+        version = tuple(int(part) for part in re.findall(r"\d+", sf.__libsndfile_version__)[:2])
+        self.decode_in_memory = version >= (1, 1)
+
+        # External player only needed when in-memory decoding isn't available
+        self.player = None
+        for command in (["mpg123", "-q"],
+                        ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"],
+                        ["mpv", "--really-quiet"]):
+            if shutil.which(command[0]):
+                self.player = command
+                break
+
+        if synthesizer is not None:
+            self.gTTS = None
+            print("✅ TTS ready (using custom Google TTS synthesizer)")
+            return
 
         try:
             from gtts import gTTS
@@ -161,8 +479,6 @@ class GoogleTTS:
         Split text with quotes into segments: Portuguese outside, English inside quotes
         Returns list of (text, language) tuples
         """
-        import re
-
         segments = []
         # Pattern to find text in single or double quotes
         pattern = r"['\"]([^'\"]+)['\"]"
@@ -202,51 +518,185 @@ class GoogleTTS:
 
         return segments
 
+    def _synthesize_segment(self, segment_text, lang):
+        """Synthesize one language segment and return MP3 bytes (cached)"""
+        key = None
+        if self.cache:
+            key = self.cache.make_key("gtts", None, lang, self.slow, segment_text)
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+
+        if self.synthesizer is not None:
+            data = self.synthesizer(segment_text, lang, self.slow)
+        else:
+            buffer = io.BytesIO()
+            tts = self.gTTS(text=segment_text, lang=lang, slow=self.slow)
+            tts.write_to_fp(buffer)
+            data = buffer.getvalue()
+
+        if key:
+            self.cache.put(key, data)
+        return data
+
+    def _prepare_segment(self, segment_text, lang):
+        """
+        Synthesize and decode one segment (runs on the worker pool)
+
+        Returns:
+            (samples, samplerate) when decoded in memory, otherwise the MP3 bytes
+        """
+        with tracer.span("synthesis", lang=lang):
+            data = self._synthesize_segment(segment_text, lang)
+            if self.decode_in_memory:
+                try:
+                    return sf.read(io.BytesIO(data), dtype='float32')
+                except Exception:
+                    pass  # Fall back to the external player for this segment
+            return data
+
+    def _play_segment(self, audio):
+        """Play a prepared segment through the sink, or an external player for raw MP3"""
+        with tracer.span("playback"):
+            self._play_prepared(audio)
+
+    def _play_prepared(self, audio):
+        if isinstance(audio, tuple):
+            samples, samplerate = audio
+            self.sink.play(samples, samplerate)
+            return
+
+        if not self.sink.external:
+            print("⚠️  MP3 can't be decoded in memory (libsndfile < 1.1) - segment skipped")
+            return
+        if not self.player:
+            print("⚠️  No audio player found")
+            return
+
+        # Create temporary file
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
+            fp.write(audio)
+            temp_file = fp.name
+
+        try:
+            subprocess.run(self.player + [temp_file], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+        finally:
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
+
     def speak(self, text):
         """Convert text to speech with bilingual support (PT outside quotes, EN inside)"""
-        if not self.enabled or not self.gTTS:
+        if not self.enabled or not (self.gTTS or self.synthesizer):
             print(f"🔊 [Would say: {text}]")
             return
 
+        pending = deque()
         try:
             # Split text into language segments
-            segments = self._split_mixed_text(text)
-
-            # Generate and play each segment
-            for segment_text, lang in segments:
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                    temp_file = fp.name
-
-                # Generate speech with correct language
-                tts = self.gTTS(text=segment_text, lang=lang, slow=self.slow)
-                tts.save(temp_file)
-
-                # Play audio
-                if os.system("which mpg123 > /dev/null 2>&1") == 0:
-                    os.system(f"mpg123 -q {temp_file}")
-                elif os.system("which ffplay > /dev/null 2>&1") == 0:
-                    os.system(f"ffplay -nodisp -autoexit -loglevel quiet {temp_file}")
-                elif os.system("which mpv > /dev/null 2>&1") == 0:
-                    os.system(f"mpv --really-quiet {temp_file}")
-                else:
-                    print("⚠️  No audio player found")
-
-                # Cleanup
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
+            segments = iter(self._split_mixed_text(text))
+
+            def submit_next():
+                segment = next(segments, None)
+                if segment is not None:
+                    pending.append(self._pool.submit(self._prepare_segment, *segment))
+
+            # Synthesize ahead on the pool, play strictly in order
+            self._stop_requested.clear()
+            for _ in range(self.workers):
+                submit_next()
+
+            while pending and not self._stop_requested.is_set():
+                audio = pending.popleft().result()
+                submit_next()
+                self._play_segment(audio)
+
+            for future in pending:
+                future.cancel()
 
         except Exception as e:
+            for future in pending:
+                future.cancel()
             print(f"⚠️  TTS error: {e}")
             print(f"📝 Text: {text}")
 
+    def synthesize(self, text):
+        """
+        Synthesize all segments of text (in parallel) without playing them
+
+        Returns:
+            List of prepared segments for play(), None if disabled
+        """
+        if not self.enabled or not (self.gTTS or self.synthesizer):
+            return None
+        futures = [self._pool.submit(self._prepare_segment, *segment)
+                   for segment in self._split_mixed_text(text)]
+        return [future.result() for future in futures]
+
+    def play(self, audio):
+        """Play segments returned by synthesize() (blocks until done or stop())"""
+        self._stop_requested.clear()
+        for segment in audio or []:
+            if self._stop_requested.is_set():
+                break
+            self._play_segment(segment)
+
+    def stop(self):
+        """Stop playback started by play()"""
+        self._stop_requested.set()
+        self.sink.stop()
+
     def set_enabled(self, enabled):
         """Enable or disable TTS"""
         self.enabled = enabled
 
 
+def create_tts(tts_config, cache=None, sink=None):
+    """
+    Pick the best available engine (Priority: GoogleTTS > Piper > SimpleTTS)
+
+    Later engines are only probed if the earlier ones are unavailable.
+
+    Args:
+        tts_config: The tts section of settings.yaml
+        cache: Optional AudioCache shared by whichever engine is chosen
+        sink: Where audio is played (default: the speakers)
+
+    Returns:
+        TTS engine
+    """
+    tts = None
+
+    # Try GoogleTTS first (best quality)
+    try:
+        tts = GoogleTTS(lang='en', slow=False, cache=cache, workers=tts_config.get('workers', 3),
+                        sink=sink)
+        if not tts.enabled:
+            tts = None
+    except Exception as e:
+        print(f"GoogleTTS not available: {e}")
+
+    # Try Piper if GoogleTTS failed
+    if tts is None:
+        try:
+            tts = TextToSpeech(voice=tts_config['voice'], speed=tts_config['speed'], cache=cache,
+                               sink=sink)
+            if not tts.enabled:
+                tts = None
+        except Exception as e:
+            print(f"Piper not available: {e}")
+
+    # Fallback to SimpleTTS (espeak)
+    if tts is None:
+        print("Using espeak fallback (basic quality)")
+        tts = SimpleTTS(cache=cache, sink=sink)
+
+    tts.set_enabled(tts_config['enabled'])
+    return tts
+
+
 if __name__ == "__main__":
     # Test TTS
     print("\n" + "="*50)
@@ -0,0 +1,181 @@
+"""
+Audio cache for TTS engines
+Stores synthesized audio so repeated phrases play without re-synthesis
+"""
+
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+
+def normalize_text(text):
+    """
+    Normalize text so trivially different spellings share a cache entry
+
+    Only Unicode form and whitespace: case is kept, since "US" and "us"
+    or "IT" and "it" are spoken differently.
+    """
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+class AudioCache:
+    """
+    Two-tier cache of synthesized audio
+
+    An in-memory LRU holds the most recent entries; a size-bounded directory
+    on disk keeps them across sessions. Values are opaque bytes (each engine
+    decides the encoding), keys come from make_key().
+    """
+    def __init__(self, cache_dir="cache/tts", memory_items=64, disk_max_mb=200, enabled=True):
+        """
+        Args:
+            cache_dir: Directory for the on-disk tier (None = memory only)
+            memory_items: Maximum number of entries kept in memory
+            disk_max_mb: Maximum size of the on-disk tier in megabytes
+            enabled: If False, every lookup misses and nothing is stored
+        """
+        self.enabled = enabled
+        self.memory_items = memory_items
+        self.disk_max_bytes = int(disk_max_mb * 1024 * 1024)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.enabled and self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.bin"))
+
+    @staticmethod
+    def make_key(engine, voice=None, lang=None, speed=None, text=""):
+        """
+        Build a content-addressed key for a synthesized phrase
+
+        Args:
+            engine: Engine name (gtts, piper, espeak)
+            voice: Voice name or engine-specific voice settings
+            lang: Language code
+            speed: Speed setting
+            text: Text to speak (normalized before hashing)
+
+        Returns:
+            Hex digest string
+        """
+        payload = json.dumps([engine, voice, lang, speed, normalize_text(text)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key):
+        return self.cache_dir / f"{key}.bin"
+
+    def get(self, key):
+        """
+        Look up cached audio
+
+        Returns:
+            Cached bytes, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return data
+
+        data = None
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)  # Mark as recently used for disk eviction
+            except OSError:
+                data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        """Store synthesized audio in both tiers"""
+        if not self.enabled or not data:
+            return
+
+        with self._lock:
+            self._remember(key, data)
+
+        if not self.cache_dir or len(data) > self.disk_max_bytes:
+            return
+
+        path = self._disk_path(key)
+        if path.exists():
+            return
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._disk_bytes += len(data)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits (lock held)"""
+        files = []
+        for path in self.cache_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def stats(self):
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
@@ -0,0 +1,147 @@
+"""
+Voice activity detection and endpointing
+Decides when the student started and stopped talking
+"""
+
+import numpy as np
+
+
+def frame_features(audio, frame_size):
+    """
+    Energy (dB) and zero-crossing rate of consecutive frames, vectorized
+
+    Args:
+        audio: float32 samples (a trailing partial frame is ignored)
+        frame_size: Samples per frame
+
+    Returns:
+        (energy_db, zcr) arrays, one value per frame
+    """
+    frames = len(audio) // frame_size
+    if frames == 0:
+        return np.zeros(0), np.zeros(0)
+    x = audio[:frames * frame_size].reshape(frames, frame_size)
+    energy_db = 10 * np.log10(np.mean(x * x, axis=1) + 1e-10)
+    signs = np.signbit(x)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_size
+    return energy_db, zcr
+
+
+class Endpointer:
+    """
+    Energy + zero-crossing endpointing with hysteresis and hangover
+
+    Speech starts after `min_speech` seconds of frames `start_margin_db`
+    above the noise floor. Once started, frames only need to stay
+    `stop_margin_db` above the floor (hysteresis) - or look like unvoiced
+    consonants (high zero-crossing rate, some energy) - to count as speech.
+    The utterance ends after `hangover` seconds without speech.
+
+    The noise floor comes from calibrate() and keeps adapting slowly while
+    nobody is talking.
+    """
+    def __init__(self, sample_rate=16000, frame_ms=20, silence_threshold=0.003,
+                 start_margin_db=12.0, stop_margin_db=6.0, min_speech=0.15, hangover=0.8,
+                 fricative_zcr=0.25, floor_adapt=0.05):
+        """
+        Args:
+            sample_rate: Audio sample rate
+            frame_ms: Analysis frame length in milliseconds
+            silence_threshold: Amplitude used as noise floor until calibrated
+            start_margin_db: dB above the floor needed to start speech
+            stop_margin_db: dB above the floor needed to stay in speech
+            min_speech: Seconds of speech needed before an utterance starts
+            hangover: Seconds of silence that end the utterance
+            fricative_zcr: Zero-crossing rate above which quiet frames still count as speech
+            floor_adapt: How fast the floor follows the background (0-1 per frame)
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.start_margin_db = start_margin_db
+        self.stop_margin_db = stop_margin_db
+        self.min_speech_frames = max(1, int(min_speech * 1000 / frame_ms))
+        self.hangover_frames = max(1, int(hangover * 1000 / frame_ms))
+        self.hangover = hangover
+        self.fricative_zcr = fricative_zcr
+        self.floor_adapt = floor_adapt
+
+        self.noise_floor_db = 20 * np.log10(max(silence_threshold, 1e-5))
+        self.calibrated = False
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance (the noise floor is kept)"""
+        self.in_speech = False
+        self.ended = False
+        self.speech_start = None  # Sample position where speech started
+        self.speech_end = None  # Sample position where speech ended
+        self._position = 0
+        self._start_run = 0
+        self._silence_run = 0
+
+    def calibrate(self, audio):
+        """
+        Set the noise floor from ambient audio (nobody talking)
+
+        Args:
+            audio: A second or so of background noise
+        """
+        energy_db, _ = frame_features(np.asarray(audio, dtype=np.float32).reshape(-1), self.frame_size)
+        if len(energy_db):
+            self.noise_floor_db = float(np.median(energy_db))
+            self.calibrated = True
+        return self.noise_floor_db
+
+    def force_speech(self):
+        """Treat the utterance as already started (e.g. after a barge-in)"""
+        self.in_speech = True
+        self.speech_start = self._position
+
+    def process(self, audio):
+        """
+        Feed audio (any length; a partial trailing frame is dropped)
+
+        Args:
+            audio: float32 samples
+
+        Returns:
+            True once the end of the utterance has been detected
+        """
+        energy_db, zcr = frame_features(audio, self.frame_size)
+        start_level = self.noise_floor_db + self.start_margin_db
+        stop_level = self.noise_floor_db + self.stop_margin_db
+
+        for energy, crossings in zip(energy_db, zcr):
+            if self.ended:
+                break
+
+            if not self.in_speech:
+                if energy > start_level:
+                    self._start_run += 1
+                    if self._start_run >= self.min_speech_frames:
+                        self.in_speech = True
+                        self.speech_start = self._position - (self._start_run - 1) * self.frame_size
+                else:
+                    self._start_run = 0
+                    # Follow slow changes in the background
+                    self.noise_floor_db += self.floor_adapt * (energy - self.noise_floor_db)
+                    start_level = self.noise_floor_db + self.start_margin_db
+                    stop_level = self.noise_floor_db + self.stop_margin_db
+            else:
+                fricative = crossings > self.fricative_zcr and energy > self.noise_floor_db + 3
+                if energy > stop_level or fricative:
+                    self._silence_run = 0
+                else:
+                    self._silence_run += 1
+                    if self._silence_run >= self.hangover_frames:
+                        self.ended = True
+                        self.speech_end = self._position - (self._silence_run - 1) * self.frame_size
+
+            self._position += self.frame_size
+
+        return self.ended
+
+    @property
+    def silence_seconds(self):
+        """Current run of silence inside the utterance"""
+        return self._silence_run * self.frame_size / self.sample_rate
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Progress report
+Cross-session statistics from the session index (history/sessions.db)
+
+    python report.py                       # last 30 days
+    python report.py --days 365 --period month
+    python report.py --backfill            # index sessions saved before the index existed
+    python report.py --export turns.parquet
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from modules.session_index import SessionIndex
+
+
+console = Console()
+
+
+def main():
+    """Entry point"""
+    parser = argparse.ArgumentParser(description="Cross-session progress report")
+    parser.add_argument("--config", default="config/settings.yaml")
+    parser.add_argument("--days", type=int, default=30, help="Report on the last N days (0 = everything)")
+    parser.add_argument("--period", choices=("day", "week", "month"), default="week")
+    parser.add_argument("--backfill", action="store_true", help="Index session files not indexed yet")
+    parser.add_argument("--search", help="Show turns containing this text")
+    parser.add_argument("--export", help="Write one row per turn to a .parquet or .csv file")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    index = SessionIndex(config['history'].get('index_path', 'history/sessions.db'))
+
+    if args.backfill:
+        console.print(f"[green]📥 Indexed {index.backfill()} session(s)[/green]")
+
+    if args.export:
+        console.print(f"[green]📤 Exported to {index.export(args.export)}[/green]")
+        return
+
+    if args.search:
+        table = Table(title=f"🔎 \"{args.search}\"")
+        for column in ("When", "Student", "Teacher"):
+            table.add_column(column)
+        for turn in index.search(args.search):
+            table.add_row(turn["timestamp"][:16], turn["student"], turn["teacher"])
+        console.print(table)
+        return
+
+    since = (datetime.now() - timedelta(days=args.days)).isoformat() if args.days else None
+    totals = index.totals(since)
+    if not totals["sessions"]:
+        console.print("[yellow]No sessions indexed yet (try --backfill)[/yellow]")
+        return
+
+    console.print(f"\n[bold]📊 {totals['sessions']} sessions, {totals['turns']} turns, "
+                  f"{totals['corrections']} corrections[/bold] "
+                  f"[dim]({totals['first'][:10]} → {totals['last'][:10]})[/dim]\n")
+
+    table = Table(title=f"📈 Progress per {args.period}")
+    for column in ("Period", "Sessions", "Turns", "Correct", "Corrected", "Accuracy"):
+        table.add_column(column, justify="right" if column != "Period" else "left")
+    for row in index.progress(since, args.period):
+        accuracy = f"{row['accuracy']:.0%}" if row["accuracy"] is not None else "—"
+        table.add_row(row["period"], str(row["sessions"]), str(row["turns"]),
+                      str(row["correct"]), str(row["corrections"]), accuracy)
+    console.print(table)
+
+    table = Table(title="✏️  Mistakes you repeat")
+    for column in ("Correct form", "Times", "Last seen", "You said"):
+        table.add_column(column)
+    for row in index.repeated_mistakes(since):
+        table.add_row(row["correction"], str(row["count"]), row["last_seen"][:10], row["example"])
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+English Training Server
+Hosts many practice sessions on one machine (e.g. a lab), sharing the
+Whisper model, the TTS engine and Ollama
+
+    python server.py            # then run client.py on each seat
+"""
+
+import asyncio
+import os
+
+import yaml
+from rich.console import Console
+
+from modules.stt import SpeechToText
+from modules.llm import EnglishTeacher
+from modules.tts import create_tts
+from modules.tts_cache import AudioCache
+from modules.response_cache import ResponseCache
+from modules.server import SessionServer
+
+
+console = Console()
+
+
+def main():
+    """Entry point"""
+    with open("config/settings.yaml") as f:
+        config = yaml.safe_load(f)
+
+    server_config = config.get('server', {})
+    stt_config = config['stt']
+    llm_config = config['llm']
+    tts_config = config['tts']
+    audio_config = config['audio']
+
+    console.print("[yellow]Loading shared models...[/yellow]")
+    whisper_workers = server_config.get('whisper_workers', 2)
+    stt = SpeechToText(
+        model_size=stt_config['model'],
+        device=stt_config['device'],
+        language=stt_config['language'],
+        cpu_threads=max(1, (os.cpu_count() or 1) // whisper_workers),
+        num_workers=whisper_workers
+    )
+
+    cache_config = tts_config.get('cache', {})
+    tts = create_tts(tts_config, cache=AudioCache(
+        cache_dir=cache_config.get('dir', 'cache/tts'),
+        memory_items=cache_config.get('memory_items', 64),
+        disk_max_mb=cache_config.get('disk_max_mb', 200),
+        enabled=cache_config.get('enabled', True)
+    ))
+
+    # One reply cache for every seat: greetings and drills repeat across students
+    reply_cache_config = llm_config.get('response_cache', {})
+    response_cache = None
+    if reply_cache_config.get('enabled', False):
+        response_cache = ResponseCache(
+            max_items=reply_cache_config.get('max_items', 256),
+            ttl=reply_cache_config.get('ttl', 3600),
+            similarity=reply_cache_config.get('similarity', 0.92),
+            embed_model=reply_cache_config.get('embed_model'),
+            embed_timeout=reply_cache_config.get('embed_timeout', 0.15)
+        )
+
+    def new_teacher():
+        return EnglishTeacher(
+            model=llm_config['model'],
+            temperature=llm_config['temperature'],
+            context_turns=llm_config.get('context_turns', 6),
+            context_tokens=llm_config.get('context_tokens', 1500),
+            keep_alive=llm_config.get('keep_alive'),
+            response_cache=response_cache
+        )
+
+    if llm_config.get('warmup', True):
+        # Load the model into Ollama once for everybody
+        warmup_teacher = new_teacher()
+        warmup_teacher.warmup()
+        warmup_teacher.close()
+
+    vad_config = {
+        'silence_threshold': audio_config.get('silence_threshold', 0.003),
+        'hangover': audio_config.get('max_silence_duration', 0.8),
+    }
+    vad_config.update(audio_config.get('endpoint', {}))
+
+    server = SessionServer(
+        stt,
+        tts,
+        new_teacher,
+        host=server_config.get('host', '127.0.0.1'),
+        port=server_config.get('port', 8765),
+        whisper_workers=whisper_workers,
+        max_sessions=server_config.get('max_sessions', 20),
+        vad_config=vad_config,
+        max_recording=audio_config['max_recording_time']
+    )
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]Server stopped[/yellow] {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
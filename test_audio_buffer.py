@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Ring buffer test - absolute positions, wrap-around and overwritten audio
+Run: python test_audio_buffer.py (or pytest test_audio_buffer.py)
+"""
+
+import numpy as np
+
+from modules.audio_buffer import RingBuffer
+
+
+def ramp(start, stop):
+    return np.arange(start, stop, dtype=np.float32)
+
+
+def test_read_that_wraps():
+    buffer = RingBuffer(10)
+    buffer.write(ramp(0, 7))
+    buffer.write(ramp(7, 14))  # Second block wraps around the end
+
+    assert buffer.written == 14
+    assert buffer.oldest == 4
+    assert np.array_equal(buffer.read(4, 14), ramp(4, 14))
+    assert np.array_equal(buffer.read(8, 12), ramp(8, 12))
+    assert np.array_equal(buffer.read(), ramp(4, 14))
+
+
+def test_read_older_than_oldest():
+    buffer = RingBuffer(10)
+    buffer.write(ramp(0, 14))
+
+    # Overwritten samples are skipped, not returned as stale data
+    assert np.array_equal(buffer.read(0, 6), ramp(4, 6))
+    assert len(buffer.read(0, 3)) == 0
+    # Reads past what was written stop at `written`
+    assert np.array_equal(buffer.read(12, 20), ramp(12, 14))
+
+
+def test_block_larger_than_capacity():
+    buffer = RingBuffer(10)
+    buffer.write(ramp(0, 3))
+    buffer.write(ramp(3, 28).reshape(-1, 1))  # (N, 1) like a sounddevice block
+
+    assert buffer.written == 28
+    assert np.array_equal(buffer.read(), ramp(18, 28))
+
+
+def test_reset():
+    buffer = RingBuffer(10)
+    buffer.write(ramp(0, 5))
+    buffer.reset()
+    buffer.write(ramp(100, 103))
+
+    assert buffer.written == 3
+    assert np.array_equal(buffer.read(), ramp(100, 103))
+
+
+if __name__ == "__main__":
+    for test in (test_read_that_wraps, test_read_older_than_oldest, test_block_larger_than_capacity, test_reset):
+        test()
+        print(f"✅ {test.__name__}")
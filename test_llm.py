@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Sentence splitting test - what reaches TTS, chunk by chunk, without Ollama
+Run: python test_llm.py (or pytest test_llm.py)
+"""
+
+from modules.llm import iter_sentences
+
+
+def split(text):
+    """Sentences from a reply streamed one character at a time, like Ollama tokens"""
+    return list(iter_sentences(iter(text)))
+
+
+def test_stray_apostrophes_dont_merge_sentences():
+    assert split("The students' book is here. Next sentence here. And another one.") == [
+        "The students' book is here.", "Next sentence here.", "And another one.",
+    ]
+    assert split("Muito bem! 'cause that is right. Another sentence. Last one.") == [
+        "Muito bem!", "'cause that is right.", "Another sentence.", "Last one.",
+    ]
+
+
+def test_contractions():
+    assert split("I don't know. You're right! It's fine, isn't it? We'll see.") == [
+        "I don't know.", "You're right!", "It's fine, isn't it?", "We'll see.",
+    ]
+
+
+def test_quoted_correction_stays_whole():
+    assert split("Quase! O certo é 'I went.' Tente de novo. Muito bem!") == [
+        "Quase! O certo é 'I went.'", "Tente de novo.", "Muito bem!",
+    ]
+    assert split('She said "I am tired. Very tired." Why was she tired?') == [
+        'She said "I am tired. Very tired."', "Why was she tired?",
+    ]
+
+
+def test_whole_reply_in_one_token():
+    assert list(iter_sentences(["The students' book is here. Next sentence here. And another one."])) == [
+        "The students' book is here.", "Next sentence here.", "And another one.",
+    ]
+
+
+if __name__ == "__main__":
+    for test in (test_stray_apostrophes_dont_merge_sentences, test_contractions,
+                 test_quoted_correction_stays_whole, test_whole_reply_in_one_token):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Response cache test - what counts as "the same utterance in the same context"
+Run: python test_response_cache.py (or pytest test_response_cache.py)
+"""
+
+from modules.response_cache import ResponseCache, normalize_utterance
+
+
+PROMPT = "You are a friendly English teacher."
+HISTORY = ["Hi! What did you do yesterday?", "I went to the park."]
+
+
+def context(prompt=PROMPT, history=HISTORY, model="llama3"):
+    return [model, prompt] + history
+
+
+def test_normalize_utterance():
+    assert normalize_utterance("Um, HELLO!!   there") == "hello there"
+    assert normalize_utterance("I don’t understand.") == normalize_utterance("uh I don't understand")
+    assert normalize_utterance("I went") != normalize_utterance("I want")
+
+
+def test_trivially_different_takes_share_a_reply():
+    cache = ResponseCache()
+    cache.store("Can you repeat?", context(), "Sure! What did you do yesterday?")
+
+    assert cache.lookup("um, can you REPEAT", context()) == ("Sure! What did you do yesterday?", 1.0)
+
+
+def test_different_system_prompts_are_kept_apart():
+    cache = ResponseCache()
+    cache.store("Hello", context(), "Hi there!")
+
+    assert ResponseCache.fingerprint(context()) != ResponseCache.fingerprint(context(prompt="You are strict."))
+    assert cache.lookup("Hello", context(prompt="You are a strict English teacher.")) == (None, None)
+    assert cache.lookup("Hello", context(model="phi3:mini")) == (None, None)
+
+
+def test_different_histories_are_kept_apart():
+    cache = ResponseCache()
+    cache.store("Can you repeat?", context(), "Sure! What did you do yesterday?")
+
+    other = ["Hi! Where do you work?", "I work at a bank."]
+    assert ResponseCache.fingerprint(context()) != ResponseCache.fingerprint(context(history=other))
+    assert cache.lookup("Can you repeat?", context(history=other)) == (None, None)
+    assert cache.lookup("Can you repeat?", context(history=[])) == (None, None)
+
+
+def test_disabled_cache_never_hits():
+    cache = ResponseCache(enabled=False)
+    cache.store("Hello", context(), "Hi there!")
+
+    assert cache.lookup("Hello", context()) == (None, None)
+
+
+if __name__ == "__main__":
+    for test in (test_normalize_utterance, test_trivially_different_takes_share_a_reply,
+                 test_different_system_prompts_are_kept_apart, test_different_histories_are_kept_apart,
+                 test_disabled_cache_never_hits):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Session index test - progress report without a microphone or Ollama
+Run: python test_session_index.py (or pytest test_session_index.py)
+"""
+
+import tempfile
+from pathlib import Path
+
+from modules.session_index import SessionIndex
+
+
+def make_index(directory, conversation):
+    index = SessionIndex(Path(directory) / "sessions.db")
+    index.add_session(Path(directory) / "session_20250106_100000.json", {
+        "start_time": "2025-01-06T10:00:00",
+        "end_time": "2025-01-06T10:05:00",
+        "student_level": "beginner",
+        "conversation": conversation,
+    })
+    return index
+
+
+def test_progress_without_classified_turns():
+    """A period where no reply is a correction, praise or "didn't understand" """
+    with tempfile.TemporaryDirectory() as directory:
+        index = make_index(directory, [
+            {"timestamp": "2025-01-06T10:01:00", "student": "Hi", "teacher": "Hello! How are you today?"},
+        ])
+        try:
+            rows = index.progress()
+        finally:
+            index.close()
+
+    assert len(rows) == 1
+    assert rows[0]["turns"] == 1
+    assert (rows[0]["correct"], rows[0]["corrections"], rows[0]["unclear"]) == (0, 0, 0)
+    assert rows[0]["accuracy"] is None
+
+
+def test_progress_accuracy():
+    with tempfile.TemporaryDirectory() as directory:
+        index = make_index(directory, [
+            {"timestamp": "2025-01-06T10:01:00", "student": "I am tired",
+             "teacher": "Perfeito! Why are you tired?"},
+            {"timestamp": "2025-01-06T10:02:00", "student": "I go to work yesterday",
+             "teacher": "Quase! O certo é 'I went to work yesterday'."},
+            {"timestamp": "2025-01-06T10:03:00", "student": "Yes", "teacher": "Tell me more!"},
+        ])
+        try:
+            rows = index.progress()
+        finally:
+            index.close()
+
+    assert rows[0]["turns"] == 3
+    assert (rows[0]["correct"], rows[0]["corrections"]) == (1, 1)
+    assert rows[0]["accuracy"] == 0.5
+
+
+if __name__ == "__main__":
+    for test in (test_progress_without_classified_turns, test_progress_accuracy):
+        test()
+        print(f"✅ {test.__name__}")
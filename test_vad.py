@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Endpointer test - calibration, hangover and where speech starts and ends
+Run: python test_vad.py (or pytest test_vad.py)
+"""
+
+import numpy as np
+
+from modules.vad import Endpointer
+
+
+SAMPLE_RATE = 16000
+rng = np.random.default_rng(0)
+
+
+def room(seconds, level=0.001):
+    """Background noise"""
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * level).astype(np.float32)
+
+
+def voice(seconds, level=0.1):
+    """A low hum: loud, few zero crossings"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 200 * t) * level).astype(np.float32)
+
+
+def calibrated_endpointer():
+    endpointer = Endpointer(SAMPLE_RATE, hangover=0.8, min_speech=0.1)
+    endpointer.calibrate(room(1.0))
+    return endpointer
+
+
+def test_calibration():
+    endpointer = Endpointer(SAMPLE_RATE)
+    floor = endpointer.calibrate(room(1.0, level=0.001))
+
+    assert endpointer.calibrated
+    assert abs(floor - (-60)) < 2  # 0.001 RMS is -60 dB
+
+
+def test_pause_shorter_than_hangover_keeps_the_utterance():
+    endpointer = calibrated_endpointer()
+    audio = np.concatenate((room(0.5), voice(0.5), room(0.3), voice(0.5), room(1.5)))
+
+    assert endpointer.process(audio)
+    assert endpointer.speech_start == int(0.5 * SAMPLE_RATE)
+    # Ends after the second stretch of speech, not at the short pause
+    assert endpointer.speech_end == int(1.8 * SAMPLE_RATE)
+
+
+def test_ends_only_after_the_hangover():
+    endpointer = calibrated_endpointer()
+
+    assert not endpointer.process(np.concatenate((room(0.2), voice(0.5), room(0.6))))
+    assert endpointer.in_speech
+    assert endpointer.process(room(0.4))
+    assert endpointer.speech_end == int(0.7 * SAMPLE_RATE)
+
+
+def test_silence_never_starts_speech():
+    endpointer = calibrated_endpointer()
+
+    assert not endpointer.process(room(3.0))
+    assert not endpointer.in_speech
+    assert endpointer.speech_start is None
+
+
+if __name__ == "__main__":
+    for test in (test_calibration, test_pause_shorter_than_hangover_keeps_the_utterance,
+                 test_ends_only_after_the_hangover, test_silence_never_starts_speech):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Batch transcription
+Transcribe a directory (or manifest) of recordings into a JSONL file
+
+    python transcribe_batch.py homework/ -o transcripts.jsonl
+    python transcribe_batch.py manifest.txt -o transcripts.jsonl --workers 8
+"""
+
+import argparse
+
+import yaml
+from rich.console import Console
+
+from modules.batch import BatchTranscriber, collect_files
+
+
+console = Console()
+
+
+def main():
+    """Entry point"""
+    parser = argparse.ArgumentParser(description="Transcribe recorded answers in batch")
+    parser.add_argument("source", help="Directory of audio files, or a .txt/.jsonl manifest")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl", help="JSONL output file")
+    parser.add_argument("--config", default="config/settings.yaml")
+    parser.add_argument("--model", help="Whisper model (default: stt.model from the config)")
+    parser.add_argument("--language", help="Language code (default: stt.language from the config)")
+    parser.add_argument("--workers", type=int, help="Files transcribed in parallel")
+    parser.add_argument("--batch-size", type=int, help="Segments decoded together per file")
+    parser.add_argument("--no-resume", action="store_true", help="Redo files already in the output")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    stt_config = config['stt']
+    batch_config = stt_config.get('batch', {})
+
+    files = collect_files(args.source)
+    if not files:
+        console.print(f"[yellow]No audio files found in {args.source}[/yellow]")
+        return
+
+    transcriber = BatchTranscriber(
+        model_size=args.model or stt_config['model'],
+        device=stt_config['device'],
+        language=args.language or stt_config.get('language'),
+        workers=args.workers or batch_config.get('workers'),
+        batch_size=args.batch_size or batch_config.get('batch_size', 8),
+        cpu_threads=batch_config.get('cpu_threads')
+    )
+    console.print(f"[cyan]📂 {len(files)} files, {transcriber.workers} workers × "
+                  f"{transcriber.cpu_threads} threads[/cyan]")
+
+    def show(record):
+        if "error" in record:
+            console.print(f"[red]❌ {record['path']}: {record['error']}[/red]")
+        else:
+            console.print(f"[green]✅[/green] {record['path']} "
+                          f"[dim]({record['duration']:.1f}s audio in {record['seconds']:.1f}s)[/dim]")
+
+    try:
+        stats = transcriber.run(files, args.output, resume=not args.no_resume, on_result=show)
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]Stopped - run again to resume from {args.output}[/yellow]")
+        return
+
+    console.print(f"\n[bold]{stats['files']} transcribed[/bold], {stats['skipped']} already done, "
+                  f"{stats['errors']} errors")
+    console.print(f"⏱️  {stats['audio_seconds'] / 3600:.2f} h of audio in {stats['wall_seconds']:.0f}s "
+                  f"({stats['files_per_hour']:.0f} files/hour)")
+
+
+if __name__ == "__main__":
+    main()